@@ -0,0 +1,84 @@
+"""
+Concurrency load test for the async request path.
+
+Fires bursts of concurrent requests at the read endpoints through an
+in-process ASGI transport and reports throughput, latency and the number of
+threads alive during the burst. The sync routes were capped by the 40-thread
+AnyIO pool. The async routes keep hundreds of requests in flight on
+DB_THREADS ORM threads.
+
+    DJANGO_SETTINGS_MODULE=creator_backend.settings \\
+        python benchmarks/async_concurrency.py --levels 10 50 200 500 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from fastapi_app.main import app
+from fastapi_app.async_db import DB_THREADS
+from creator_app.models import CreatorProfile
+
+
+async def run_level(client, paths, concurrency, total):
+    latencies = []
+    peak_threads = threading.active_count()
+    queue = iter(range(total))
+
+    async def worker():
+        nonlocal peak_threads
+        for _ in queue:
+            path = random.choice(paths)
+            start = time.perf_counter()
+            res = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            peak_threads = max(peak_threads, threading.active_count())
+            if res.status_code >= 500:
+                raise RuntimeError(f"{path} -> {res.status_code}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "threads": peak_threads,
+    }
+
+
+async def main(levels, total):
+    user_ids = [uid async for uid in CreatorProfile.objects.values_list("user_id", flat=True)[:500]]
+    if not user_ids:
+        sys.exit("No creator profiles found; seed the database first.")
+
+    paths = [f"/creator/get/{uid}" for uid in user_ids] + ["/creator/search?min_followers=1000"]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run_level(client, paths, 1, 20)   # warm up connections and imports
+
+        print(f"DB_THREADS={DB_THREADS}")
+        print(f"{'conc':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'threads':>8}")
+        for level in levels:
+            r = await run_level(client, paths, level, total)
+            print(f"{r['concurrency']:>6} {r['rps']:>10.1f} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {r['threads']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50, 100, 200, 500])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.levels, args.requests))
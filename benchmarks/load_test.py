@@ -0,0 +1,520 @@
+"""
+Scripted load test across the API routers.
+
+Drives a weighted mix of scenarios through httpx.AsyncClient on an
+in-process ASGI transport, against whatever database DJANGO_SETTINGS_MODULE
+points at (seed it with benchmarks/seed_data.py first). For each endpoint
+it reports throughput and p50/p95/p99 latency, and writes the results to
+JSON. Passing an earlier file with --compare fails the run on p95
+regressions.
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings_sqlite \\
+        python benchmarks/load_test.py --requests 5000 --concurrency 50 \\
+            --output benchmarks/results/baseline.json
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings_sqlite \\
+        python benchmarks/load_test.py --compare benchmarks/results/baseline.json
+
+Routes that need a token get one minted for the acting user. /media serves
+scratch files written for the run, signed when MEDIA_SIGNED_URLS is on.
+
+Rate limiting is stripped from the app unless --keep-rate-limits is given,
+and the SQL profiler is off unless SQL_PROFILER=1. Endpoints that return
+whole tables (/creator/list, /collaborator/list, /message/users) run at a
+low weight; drop them on large datasets with --exclude.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("SQL_PROFILER", "0")
+
+import httpx  # noqa: E402
+
+import fastapi_app.django_setup  # noqa: E402
+
+from django.db import connection  # noqa: E402
+
+from django.conf import settings  # noqa: E402
+
+from creator_app.models import (  # noqa: E402
+    ChangeLog, CollaboratorProfile, Conversation, ConversationParticipant, CreatorProfile, UserData,
+)
+from fastapi_app.main import app  # noqa: E402
+from fastapi_app.media import media_url  # noqa: E402
+from fastapi_app.ratelimit import RateLimitMiddleware  # noqa: E402
+from fastapi_app.security import create_access_token, create_refresh_token  # noqa: E402
+
+SAMPLE_SIZE = 2000
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+SEARCH_TERMS = ["a", "fashion", "travel", "tech", "video", "design", "music", "Chennai"]
+NICHES = ["fashion", "beauty", "travel", "food", "fitness", "tech", "gaming", "music"]
+SKILLS = ["video editing", "photography", "graphic design", "copywriting", "animation"]
+CITIES = ["Chennai", "Mumbai", "Bengaluru", "Delhi", "Pune", "Kochi"]
+
+
+# ================================
+# SCENARIOS
+# ================================
+# Each scenario returns (method, url, request kwargs) for one request.
+def auth(user_id, role="creator"):
+    return {"Authorization": f"Bearer {create_access_token(user_id, role)}"}
+
+
+def creator_search(rng, data):
+    params = rng.choice([
+        {"search": rng.choice(SEARCH_TERMS)},
+        {"niche": rng.choice(NICHES)},
+        {"min_followers": rng.choice([1000, 10000, 100000])},
+        {"location": rng.choice(CITIES), "experience_level": "expert"},
+        {"platforms": ["instagram", "youtube"]},
+    ])
+    return "GET", "/creator/search", {"params": params}
+
+
+def creator_get(rng, data):
+    return "GET", f"/creator/get/{rng.choice(data['creators'])}", {}
+
+
+def creator_list(rng, data):
+    return "GET", "/creator/list", {}
+
+
+def creator_edit(rng, data):
+    user_id = rng.choice(data["creators"])
+    return "PUT", f"/creator/edit/{user_id}", {
+        "params": {"location": rng.choice(CITIES)}, "headers": auth(user_id),
+    }
+
+
+def creator_patch(rng, data):
+    user_id = rng.choice(data["creators"])
+    return "PATCH", f"/creator/edit/{user_id}", {"json": {"location": rng.choice(CITIES)}, "headers": auth(user_id)}
+
+
+def collaborator_search(rng, data):
+    params = rng.choice([
+        {"search": rng.choice(SEARCH_TERMS)},
+        {"skill_category": rng.choice(SKILLS)},
+        {"min_price": 500, "max_price": 5000},
+        {"location": rng.choice(CITIES), "language": "English"},
+    ])
+    return "GET", "/collaborator/search", {"params": params}
+
+
+def collaborator_get(rng, data):
+    return "GET", f"/collaborator/get/{rng.choice(data['collaborators'])}", {}
+
+
+def collaborator_list(rng, data):
+    return "GET", "/collaborator/list", {}
+
+
+def collaborator_edit(rng, data):
+    user_id = rng.choice(data["collaborators"])
+    return "PUT", f"/collaborator/edit/{user_id}", {
+        "params": {"availability": rng.choice(["full-time", "weekends"])},
+        "headers": auth(user_id, "collaborator"),
+    }
+
+
+def collaborator_patch(rng, data):
+    user_id = rng.choice(data["collaborators"])
+    return "PATCH", f"/collaborator/edit/{user_id}", {
+        "json": {"availability": rng.choice(["full-time", "weekends"])},
+        "headers": auth(user_id, "collaborator"),
+    }
+
+
+def profile_get(rng, data):
+    return "GET", f"/profile/get/{rng.choice(data['users'])}", {}
+
+
+def profile_edit(rng, data):
+    user_id = rng.choice(data["users"])
+    return "PUT", f"/profile/edit/{user_id}", {
+        "data": {"city": rng.choice(CITIES)}, "headers": auth(user_id),
+    }
+
+
+def profile_patch(rng, data):
+    user_id = rng.choice(data["users"])
+    return "PATCH", f"/profile/edit/{user_id}", {"json": {"city": rng.choice(CITIES)}, "headers": auth(user_id)}
+
+
+def profile_batch(rng, data):
+    # A chat list or search page resolving the cards it shows.
+    return "POST", "/profile/batch", {"json": {"ids": rng.sample(data["users"], min(20, len(data["users"])))}}
+
+
+def message_conversation(rng, data):
+    _, a, b = rng.choice(data["conversations"])
+    return "GET", f"/message/conversation/{a}/{b}", {"headers": auth(a)}
+
+
+def message_send(rng, data):
+    _, a, b = rng.choice(data["conversations"])
+    return "POST", "/message/send", {
+        "data": {"sender_id": a, "receiver_id": b, "content": "load test ping"}, "headers": auth(a),
+    }
+
+
+def message_seen(rng, data):
+    conversation_id, a, _ = rng.choice(data["conversations"])
+    return "POST", f"/message/seen/{conversation_id}/{a}", {"headers": auth(a)}
+
+
+def message_typing(rng, data):
+    _, a, b = rng.choice(data["conversations"])
+    return "POST", "/message/typing", {
+        "json": {"user_id": a, "chat_with": b, "is_typing": True}, "headers": auth(a),
+    }
+
+
+def message_users(rng, data):
+    user_id = rng.choice(data["users"])
+    return "GET", "/message/users", {"params": {"current_user_id": user_id}, "headers": auth(user_id)}
+
+
+def message_sync(rng, data):
+    # A device catching up from scratch: capped at SYNC_MAX_MESSAGES per page.
+    _, a, _ = rng.choice(data["conversations"])
+    return "GET", "/message/sync", {"params": {"user_id": a}, "headers": auth(a)}
+
+
+def group_list(rng, data):
+    _, user_id = rng.choice(data["groups"])
+    return "GET", "/group/list", {"params": {"user_id": user_id}, "headers": auth(user_id)}
+
+
+def group_messages(rng, data):
+    group_id, user_id = rng.choice(data["groups"])
+    return "GET", f"/group/{group_id}/messages", {"params": {"user_id": user_id}, "headers": auth(user_id)}
+
+
+def group_send(rng, data):
+    group_id, user_id = rng.choice(data["groups"])
+    return "POST", f"/group/{group_id}/send", {
+        "data": {"sender_id": user_id, "content": "load test ping"}, "headers": auth(user_id),
+    }
+
+
+def group_receipt(rng, data):
+    # Clamped to the group's last_seq, so any value is valid.
+    group_id, user_id = rng.choice(data["groups"])
+    return "POST", f"/group/{group_id}/receipt", {
+        "json": {"user_id": user_id, "read_seq": rng.randrange(1, 1000)}, "headers": auth(user_id),
+    }
+
+
+def home(rng, data):
+    user_id = rng.choice(data["users"])
+    return "GET", f"/home/{user_id}", {"headers": auth(user_id)}
+
+
+def stats_creators(rng, data):
+    return "GET", "/stats/creators", {}
+
+
+def stats_collaborators(rng, data):
+    return "GET", "/stats/collaborators", {}
+
+
+def stats_messages(rng, data):
+    return "GET", "/stats/messages", {}
+
+
+def changes_tail(rng, data):
+    # A consumer tailing the log from a recent cursor.
+    return "GET", "/changes", {
+        "params": {"after": max(0, data["last_change"] - rng.randrange(1000))},
+        "headers": {"x-changes-key": os.getenv("CHANGES_API_KEY", "")},
+    }
+
+
+def media_get(rng, data):
+    return "GET", media_url(rng.choice(data["media"])), {}
+
+
+def auth_login(rng, data):
+    return "POST", "/auth/login", {"params": {"email": rng.choice(data["emails"]), "password": "benchmark"}}
+
+
+def auth_refresh(rng, data):
+    user_id, password_hash = rng.choice(data["refresh"])
+    return "POST", "/auth/refresh", {"params": {"refresh_token": create_refresh_token(user_id, password_hash)}}
+
+
+def import_status(rng, data):
+    return "GET", f"/import/{rng.randrange(10**6)}", {"headers": {"x-import-key": os.getenv("BULK_IMPORT_API_KEY", "")}}
+
+
+# name -> (scenario, weight, expected statuses)
+SCENARIOS = {
+    "GET /creator/search": (creator_search, 10, {200}),
+    "GET /creator/get/{user_id}": (creator_get, 15, {200}),
+    "GET /creator/list": (creator_list, 1, {200}),
+    "PUT /creator/edit/{user_id}": (creator_edit, 3, {200}),
+    "PATCH /creator/edit/{user_id}": (creator_patch, 2, {200}),
+    "GET /collaborator/search": (collaborator_search, 8, {200}),
+    "GET /collaborator/get/{user_id}": (collaborator_get, 10, {200}),
+    "GET /collaborator/list": (collaborator_list, 1, {200}),
+    "PUT /collaborator/edit/{user_id}": (collaborator_edit, 2, {200}),
+    "PATCH /collaborator/edit/{user_id}": (collaborator_patch, 2, {200}),
+    "GET /profile/get/{user_id}": (profile_get, 10, {200}),
+    "PUT /profile/edit/{user_id}": (profile_edit, 2, {200}),
+    "PATCH /profile/edit/{user_id}": (profile_patch, 2, {200}),
+    "POST /profile/batch": (profile_batch, 5, {200}),
+    "GET /message/conversation/{a}/{b}": (message_conversation, 10, {200}),
+    "POST /message/send": (message_send, 5, {200}),
+    "POST /message/seen/{conversation_id}/{user_id}": (message_seen, 3, {202}),
+    "POST /message/typing": (message_typing, 3, {200}),
+    "GET /message/users": (message_users, 1, {200}),
+    "GET /message/sync": (message_sync, 5, {200}),
+    "GET /group/list": (group_list, 3, {200}),
+    "GET /group/{conversation_id}/messages": (group_messages, 5, {200}),
+    "POST /group/{conversation_id}/send": (group_send, 3, {200}),
+    "POST /group/{conversation_id}/receipt": (group_receipt, 2, {200}),
+    "GET /home/{user_id}": (home, 8, {200}),
+    "GET /stats/creators": (stats_creators, 1, {200}),
+    "GET /stats/collaborators": (stats_collaborators, 1, {200}),
+    "GET /stats/messages": (stats_messages, 1, {200}),
+    "GET /changes": (changes_tail, 2, {200}),
+    "GET /media/{name}": (media_get, 5, {200}),
+    "POST /auth/login": (auth_login, 1, {200}),
+    "POST /auth/refresh": (auth_refresh, 2, {200}),
+    # Bulk import runs offline; only its status lookup is on the request path.
+    "GET /import/{import_id}": (import_status, 1, {404}),
+}
+
+
+# ================================
+# HARNESS
+# ================================
+def load_sample(seed):
+    rng = random.Random(seed)
+
+    def sample(model, field):
+        ids = list(model.objects.order_by(field).values_list(field, flat=True)[:SAMPLE_SIZE * 5])
+        return rng.sample(ids, min(SAMPLE_SIZE, len(ids)))
+
+    users = sample(UserData, "id")
+    data = {
+        "users": users,
+        "creators": sample(CreatorProfile, "user_id"),
+        "collaborators": sample(CollaboratorProfile, "user_id"),
+        "conversations": list(Conversation.objects.filter(is_group=False).order_by("id").values_list("id", "user1_id", "user2_id")[:SAMPLE_SIZE]),
+    }
+    accounts = list(UserData.objects.filter(id__in=users[:200]).values_list("id", "email", "password"))
+    data["emails"] = [email for _, email, _ in accounts if email]
+    data["refresh"] = [(user_id, password) for user_id, _, password in accounts if password]
+
+    missing = [name for name, values in data.items() if not values]
+    if missing:
+        sys.exit(f"No {', '.join(missing)} in the database; run benchmarks/seed_data.py first.")
+
+    # Optional: databases seeded before groups were added have none.
+    data["groups"] = list(
+        ConversationParticipant.objects.order_by("conversation_id", "user_id").values_list("conversation_id", "user_id")[:SAMPLE_SIZE]
+    )
+    data["last_change"] = ChangeLog.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    return data
+
+
+def media_fixtures(root):
+    """Public and private files of a few typical sizes under a scratch MEDIA_ROOT."""
+    names = []
+    for folder in ("avatars", "message_files"):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+        for kb in (8, 64, 512):
+            name = f"{folder}/load-{kb}k.bin"
+            with open(os.path.join(root, name), "wb") as f:
+                f.write(os.urandom(kb * 1024))
+            names.append(name)
+    return names
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+async def run(scenarios, data, total, concurrency, seed):
+    rng = random.Random(seed)
+    names = list(scenarios)
+    plan = rng.choices(names, weights=[scenarios[name][1] for name in names], k=total)
+    # Pre-build every request so scenario code stays out of the timed section.
+    requests = [(name, *scenarios[name][0](rng, data)) for name in plan]
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    samples = {}
+    queue = iter(requests)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+
+        async def worker():
+            for name, method, url, kwargs in queue:
+                start = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                latencies[name].append(time.perf_counter() - start)
+                if response.status_code not in scenarios[name][2]:
+                    errors[name] += 1
+                    samples.setdefault(name, f"{response.status_code} {response.text[:200]}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    endpoints = {name: summarize(latencies[name], errors[name], elapsed) for name in sorted(latencies)}
+    overall = summarize([x for values in latencies.values() for x in values], sum(errors.values()), elapsed)
+    return endpoints, overall, samples
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(endpoints, overall):
+    print(f"\n{'endpoint':<48} {'reqs':>6} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, row in [*endpoints.items(), ("TOTAL", overall)]:
+        print(f"{name:<48} {row['requests']:>6} {row['errors']:>5} {row['rps']:>8.1f} "
+              f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}")
+
+
+def compare(endpoints, baseline_path, max_regression):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["endpoints"]
+
+    regressions = []
+    print(f"\n{'endpoint':<48} {'base p95':>9} {'p95':>9} {'change':>8}")
+    for name, row in endpoints.items():
+        before = baseline.get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = row["p95_ms"] / before["p95_ms"] - 1
+        flag = "  REGRESSION" if change > max_regression else ""
+        print(f"{name:<48} {before['p95_ms']:>9.2f} {row['p95_ms']:>9.2f} {change:>+7.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", metavar="ENDPOINT", help="run only these scenarios")
+    parser.add_argument("--exclude", nargs="+", metavar="ENDPOINT", default=[], help="skip these scenarios")
+    parser.add_argument("--keep-rate-limits", action="store_true")
+    parser.add_argument("--output", help="results JSON (default benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    parser.add_argument("--max-regression", type=float, default=0.15, help="allowed p95 increase, as a fraction")
+    args = parser.parse_args()
+
+    if not args.keep_rate_limits:
+        # The middleware stack is built on first request, so this must happen before any traffic.
+        app.user_middleware = [m for m in app.user_middleware if m.cls is not RateLimitMiddleware]
+
+    scenarios = {
+        name: spec for name, spec in SCENARIOS.items()
+        if (not args.only or name in args.only) and name not in args.exclude
+    }
+    if not os.getenv("BULK_IMPORT_API_KEY"):
+        scenarios.pop("GET /import/{import_id}", None)
+    if not os.getenv("CHANGES_API_KEY"):
+        scenarios.pop("GET /changes", None)
+    if not scenarios:
+        sys.exit("No scenarios selected.")
+
+    data = load_sample(args.seed)
+    if not data["groups"]:
+        print("no groups in the database; skipping the /group scenarios")
+        scenarios = {name: spec for name, spec in scenarios.items() if " /group/" not in name}
+    # The seed stores file names only; serve real bytes from a scratch root.
+    media_root = tempfile.TemporaryDirectory()
+    settings.MEDIA_ROOT = media_root.name
+    data["media"] = media_fixtures(media_root.name)
+    if args.warmup:
+        asyncio.run(run(scenarios, data, args.warmup, min(args.concurrency, 10), args.seed + 1))
+
+    endpoints, overall, samples = asyncio.run(run(scenarios, data, args.requests, args.concurrency, args.seed))
+    print_table(endpoints, overall)
+    for name, sample in samples.items():
+        print(f"  unexpected response from {name}: {sample}")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dataset": {
+                "users": UserData.objects.count(),
+                "creators": CreatorProfile.objects.count(),
+                "collaborators": CollaboratorProfile.objects.count(),
+                "conversations": Conversation.objects.count(),
+            },
+        },
+        "overall": overall,
+        "endpoints": endpoints,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        regressions = compare(endpoints, args.compare, args.max_regression)
+        if regressions:
+            sys.exit(f"p95 regressed by more than {args.max_regression:.0%} on {len(regressions)} endpoint(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-request overhead of MetricsMiddleware.
+
+Drives a no-op ASGI app directly, with and without the middleware, and
+reports the difference per request. The scope carries a matched route, as
+it would after routing, so the figure covers the normal path: the
+send wrapper, timing, the in-progress gauge and the histogram update.
+
+    DJANGO_SETTINGS_MODULE=creator_backend.settings \\
+        python benchmarks/metrics_overhead.py --requests 200000 --budget-us 20
+
+Exits non-zero if the overhead exceeds --budget-us.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastapi_app.django_setup  # noqa: E402
+
+from starlette.routing import Route  # noqa: E402
+
+from fastapi_app.metrics import MetricsMiddleware, MetricsRegistry  # noqa: E402
+
+ROUTES = [Route(f"/bench/{i}/{{item_id}}", lambda request: None) for i in range(20)]
+
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+async def endpoint(scope, receive, send):
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def drive(app, n):
+    scopes = [
+        {"type": "http", "method": "GET", "path": f"/bench/{i % 20}/{i}", "route": ROUTES[i % 20]}
+        for i in range(1000)
+    ]
+    start = time.perf_counter()
+    for i in range(n):
+        await app(scopes[i % 1000], receive, send)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--budget-us", type=float, default=None)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    wrapped = MetricsMiddleware(endpoint, registry=registry)
+
+    # Warm up both paths, then measure.
+    asyncio.run(drive(endpoint, 10_000))
+    asyncio.run(drive(wrapped, 10_000))
+    bare = asyncio.run(drive(endpoint, args.requests))
+    instrumented = asyncio.run(drive(wrapped, args.requests))
+
+    overhead_us = (instrumented - bare) / args.requests * 1e6
+    print(f"{args.requests} requests")
+    print(f"bare          {bare / args.requests * 1e6:>8.2f} us/request")
+    print(f"instrumented  {instrumented / args.requests * 1e6:>8.2f} us/request")
+    print(f"overhead      {overhead_us:>8.2f} us/request")
+    print(f"render        {len(registry.render())} bytes for {len(registry.latency)} series")
+
+    if args.budget_us is not None and overhead_us > args.budget_us:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Query-plan regression check for the hot endpoints.
+
+Sends one request per case through the app in process, captures every SQL
+shape it runs (fastapi_app.sql_profiler), and EXPLAINs each one on the
+connection that ran it. The run fails when a query full-scans a table the
+case does not explicitly allow. Typical causes are a dropped index or a new
+filter with no index behind it.
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings_sqlite python benchmarks/seed_data.py --migrate
+    DJANGO_SETTINGS_MODULE=benchmarks.settings_sqlite python benchmarks/query_plans.py
+    python benchmarks/query_plans.py --output benchmarks/results/plans-mysql.json   # real settings
+
+Supports SQLite, MySQL and PostgreSQL plans. On SQLite the `__iexact`
+search filters run as LIKE and are served by the COLLATE NOCASE indexes of
+migration 0014. Run on a seeded database without fresh ANALYZE stats, or
+the planner may prefer scanning tables it knows are tiny. The test suite
+runs every case on a small seed (fastapi_app/tests/test_query_plans.py).
+
+Adding a filter or endpoint? Add a case here. If a full scan is on purpose,
+e.g. whole-table listings or leading-wildcard `icontains`, list the table in
+`allow_scan` with the reason.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("SQL_PROFILER", "0")
+os.environ.setdefault("CHANGES_API_KEY", "query-plans")
+
+import fastapi_app.django_setup  # noqa: E402
+
+from django.db import connections  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from creator_app import jobs  # noqa: E402
+from creator_app.models import (  # noqa: E402
+    CollaboratorProfile, Conversation, ConversationParticipant, CreatorProfile, UserData,
+)
+from fastapi_app.main import app  # noqa: E402
+from fastapi_app.ratelimit import RateLimitMiddleware  # noqa: E402
+from fastapi_app.routes import changes  # noqa: E402
+from fastapi_app.security import create_access_token  # noqa: E402
+from fastapi_app.sql_profiler import profile_requests  # noqa: E402
+
+CREATOR = "creator_app_creatorprofile"
+COLLABORATOR = "creator_app_collaboratorprofile"
+USERDATA = "creator_app_userdata"
+
+# Statements worth explaining; INSERTs and transaction control have no plan to speak of.
+EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+@dataclass
+class Case:
+    name: str
+    # (method, url, request kwargs) built from sample ids, or a callable run directly.
+    request: object
+    allow_scan: set = field(default_factory=set)
+
+
+def auth(user_id, role="creator"):
+    return {"Authorization": f"Bearer {create_access_token(user_id, role)}"}
+
+
+def build_cases(ids):
+    creator, collaborator, user = ids["creator"], ids["collaborator"], ids["user"]
+    conversation_id, a, b = ids["conversation"]
+    cases = [
+        Case("creator search by niche", ("GET", "/creator/search", {"params": {"niche": "fashion"}})),
+        Case("creator search by type + followers",
+             ("GET", "/creator/search", {"params": {"creator_type": "influencer", "min_followers": 100000}})),
+        Case("creator search by followers", ("GET", "/creator/search", {"params": {"min_followers": 1000000}})),
+        # Leading-wildcard LIKE: no B-tree index can serve it.
+        Case("creator search text", ("GET", "/creator/search", {"params": {"search": "fashion"}}), {CREATOR}),
+        Case("creator get", ("GET", f"/creator/get/{creator}", {})),
+        Case("creator patch", ("PATCH", f"/creator/edit/{creator}", {
+            "json": {"location": "Chennai"}, "headers": auth(creator)})),
+        Case("collaborator search by skill + price",
+             ("GET", "/collaborator/search", {"params": {"skill_category": "photography", "max_price": 5000}})),
+        Case("collaborator search by price",
+             ("GET", "/collaborator/search", {"params": {"min_price": 90000}})),
+        Case("collaborator get", ("GET", f"/collaborator/get/{collaborator}", {})),
+        Case("profile get", ("GET", f"/profile/get/{user}", {})),
+        Case("profile batch", ("POST", "/profile/batch", {"json": {"ids": [user, creator, collaborator]}})),
+        Case("message conversation", ("GET", f"/message/conversation/{a}/{b}", {"headers": auth(a)})),
+        Case("message send", ("POST", "/message/send", {
+            "data": {"sender_id": a, "receiver_id": b, "content": "plan check"}, "headers": auth(a)})),
+        Case("message sync", ("GET", "/message/sync", {
+            "params": {"user_id": a, "since": f"{conversation_id}:1"}, "headers": auth(a)})),
+        Case("message seen", ("POST", f"/message/seen/{conversation_id}/{a}", {"headers": auth(a)})),
+        # The inbox lists every user by design; its per-user queries must still be indexed.
+        Case("message users", ("GET", "/message/users", {"params": {"current_user_id": a}, "headers": auth(a)}), {USERDATA}),
+        Case("changes feed", ("GET", "/changes", {
+            "params": {"after": 0, "entity": ["creator", "collaborator"]},
+            "headers": {"X-Changes-Key": changes.CHANGES_API_KEY or ""}})),
+        # Creators get the newest collaborators: a primary-key walk cut off by LIMIT.
+        Case("home", ("GET", f"/home/{a}", {"headers": auth(a)}), {COLLABORATOR}),
+        Case("group list", ("GET", "/group/list", {"params": {"user_id": a}, "headers": auth(a)})),
+        Case("job claim", lambda: jobs.claim("query-plans", queues=("query-plans",))),
+    ]
+    if ids["group"]:
+        group_id, member = ids["group"]
+        cases += [
+            Case("group messages", ("GET", f"/group/{group_id}/messages", {
+                "params": {"user_id": member}, "headers": auth(member)})),
+            Case("group send", ("POST", f"/group/{group_id}/send", {
+                "data": {"sender_id": member, "content": "plan check"}, "headers": auth(member)})),
+            Case("group receipt", ("POST", f"/group/{group_id}/receipt", {
+                "json": {"user_id": member, "read_seq": 1}, "headers": auth(member)})),
+        ]
+    return cases
+
+
+# ================================
+# EXPLAIN
+# ================================
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def explain(alias, sql, params):
+    """Returns (plan lines, tables read with a full scan)."""
+    connection = connections[alias]
+    vendor = connection.vendor
+    prefix = "EXPLAIN QUERY PLAN " if vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+
+    if vendor == "sqlite":
+        lines = [row[columns.index("detail")] for row in rows]
+        scans = {m.group(1) for m in map(_SQLITE_SCAN.match, lines) if m}
+    elif vendor == "mysql":
+        records = [dict(zip(columns, row)) for row in rows]
+        lines = [
+            f"{r['table']}: type={r['type']} key={r['key']} rows={r['rows']} {r.get('Extra') or ''}".strip()
+            for r in records
+        ]
+        scans = {r["table"] for r in records if r["type"] == "ALL"}
+    else:
+        lines = [row[0] for row in rows]
+        scans = {m.group(1) for line in lines for m in [_POSTGRES_SCAN.search(line)] if m}
+    return lines, scans
+
+
+def sample_ids():
+    conversation = Conversation.objects.filter(is_group=False).values_list("id", "user1_id", "user2_id").first()
+    ids = {
+        "creator": CreatorProfile.objects.values_list("user_id", flat=True).first(),
+        "collaborator": CollaboratorProfile.objects.values_list("user_id", flat=True).first(),
+        "user": UserData.objects.values_list("id", flat=True).first(),
+        "conversation": conversation,
+    }
+    missing = [name for name, value in ids.items() if value is None]
+    if missing:
+        raise SystemExit(f"No {', '.join(missing)} rows; seed the database first (benchmarks/seed_data.py).")
+    # Optional: databases seeded before groups were added have none.
+    ids["group"] = ConversationParticipant.objects.values_list("conversation_id", "user_id").first()
+    return ids
+
+
+def unexpected_scans(case, results):
+    """Captured queries that full-scan a table the case does not allow."""
+    return [r for r in results if set(r["full_scans"]) - case.allow_scan]
+
+
+def run_case(client, case):
+    with profile_requests() as profiles:
+        if callable(case.request):
+            case.request()
+            status = None
+        else:
+            method, url, kwargs = case.request
+            status = client.request(method, url, **kwargs).status_code
+
+    results = []
+    for profile in profiles:
+        for shape, (sql, params, alias) in profile.samples.items():
+            if not EXPLAINABLE.match(sql):
+                continue
+            lines, scans = explain(alias, sql, params)
+            results.append({"sql": shape, "plan": lines, "full_scans": sorted(scans)})
+    return status, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", action="append", help="only run cases whose name contains this (repeatable)")
+    parser.add_argument("--output", help="write every captured plan to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="print plans for passing queries too")
+    args = parser.parse_args()
+
+    # Plans are what matter here; rate limits would only get in the way.
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not RateLimitMiddleware]
+    client = TestClient(app)
+
+    vendor = connections["default"].vendor
+    cases = build_cases(sample_ids())
+    if args.case:
+        cases = [c for c in cases if any(part in c.name for part in args.case)]
+
+    failures = 0
+    report = {"vendor": vendor, "cases": {}}
+    for case in cases:
+        status, results = run_case(client, case)
+        report["cases"][case.name] = {"status": status, "queries": results}
+
+        bad = unexpected_scans(case, results)
+        flag = "FAIL" if bad else "ok"
+        failures += flag == "FAIL"
+        print(f"[{flag:>4}] {case.name} ({len(results)} queries{f', HTTP {status}' if status else ''})")
+        for result in results if args.verbose else bad:
+            print(f"       {result['sql'][:160]}")
+            for line in result["plan"]:
+                print(f"         {line}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"plans written to {args.output}")
+
+    if failures:
+        print(f"{failures} case(s) full-scan an unindexed table")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Synthetic dataset generator for benchmarks and load tests.
+
+Creates users, creator and collaborator profiles, conversations, messages
+and group chats with bulk_create. Values follow skewed, roughly realistic distributions:
+- log-normal follower counts and prices
+- Zipf-weighted niches, cities and chat activity, so a few users and
+  conversations carry most of the messages
+- a single timeline, so message ids and created_at agree
+
+Output is deterministic for a given --seed.
+
+    # small (default): 2k users, 3k profiles, 50k messages, 200 groups
+    DJANGO_SETTINGS_MODULE=benchmarks.settings_sqlite \\
+        python benchmarks/seed_data.py --migrate --reset
+
+    # large: 100k users, 200k profiles, 10M messages, 10k groups
+    DJANGO_SETTINGS_MODULE=creator_backend.settings \\
+        python benchmarks/seed_data.py --preset large --reset
+
+Every seeded user has the password "benchmark". --reset flushes the whole
+database, so point it at a benchmark database only.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastapi_app.django_setup  # noqa: E402
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from creator_app.models import (  # noqa: E402
+    CollaboratorProfile, Conversation, ConversationParticipant, CreatorProfile, Message, UserData,
+)
+
+PASSWORD = "benchmark"
+EMAIL_DOMAIN = "bench.example.com"
+
+PRESETS = {
+    "small": {"users": 2_000, "creators": 1_500, "collaborators": 1_500, "conversations": 4_000, "messages": 50_000,
+              "groups": 200},
+    "medium": {"users": 20_000, "creators": 15_000, "collaborators": 15_000, "conversations": 40_000,
+               "messages": 1_000_000, "groups": 2_000},
+    "large": {"users": 100_000, "creators": 100_000, "collaborators": 100_000, "conversations": 300_000,
+              "messages": 10_000_000, "groups": 10_000},
+}
+
+FIRST_NAMES = ["Aarav", "Diya", "Vivaan", "Ananya", "Arjun", "Isha", "Kabir", "Meera", "Rohan", "Saanvi",
+               "Liam", "Emma", "Noah", "Olivia", "Mateo", "Sofia", "Yuki", "Chen", "Amara", "Omar"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Khan", "Nair", "Singh", "Das", "Smith", "Garcia",
+              "Kim", "Nguyen", "Okafor", "Rossi", "Silva", "Muller", "Tanaka", "Haddad", "Cohen", "Novak"]
+CITIES = [("Chennai", "Tamil Nadu"), ("Mumbai", "Maharashtra"), ("Bengaluru", "Karnataka"), ("Delhi", "Delhi"),
+          ("Hyderabad", "Telangana"), ("Kolkata", "West Bengal"), ("Pune", "Maharashtra"), ("Kochi", "Kerala"),
+          ("Jaipur", "Rajasthan"), ("Ahmedabad", "Gujarat"), ("Coimbatore", "Tamil Nadu"), ("Goa", "Goa")]
+NICHES = ["fashion", "beauty", "travel", "food", "fitness", "tech", "gaming", "music", "comedy", "finance",
+          "education", "parenting", "pets", "photography", "art", "sports"]
+CREATOR_TYPES = ["influencer", "youtuber", "blogger", "podcaster", "streamer", "artist"]
+EXPERIENCE = ["beginner", "intermediate", "expert"]
+PLATFORMS = ["instagram", "youtube", "tiktok", "twitter", "linkedin", "twitch", "facebook"]
+COLLAB_TYPES = ["paid", "barter", "affiliate", "long-term"]
+PROJECT_TYPES = ["reels", "shorts", "long-form", "stories", "live", "blog"]
+SKILLS = ["video editing", "photography", "graphic design", "copywriting", "music production", "animation",
+          "voice over", "thumbnail design", "social media management", "color grading"]
+LANGUAGES = ["English", "Hindi", "Tamil", "Telugu", "Malayalam", "Kannada", "Bengali", "Marathi"]
+PRICING_UNITS = ["per hour", "per project", "per video", "per post"]
+AVAILABILITY = ["full-time", "part-time", "weekends", "freelance"]
+WORDS = ("hey hi thanks sure sounds good when can we talk about the brief budget deadline draft "
+         "shoot edit upload schedule call tomorrow today next week love it perfect great idea "
+         "send me the link details contract invoice payment revision final cut thumbnail").split()
+IMAGE_EXTS = ["jpg", "png", "webp"]
+FILE_EXTS = ["pdf", "docx", "mp4"]
+
+
+def zipf_weights(n, s=1.1):
+    return list(itertools.accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep our created_at/updated_at instead of auto_now(_add) stamping now()."""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Generator:
+
+    def __init__(self, seed, batch_size):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.now = timezone.now().replace(microsecond=0)
+        self.password = make_password(PASSWORD)
+        self.last_seq = Counter()
+
+    def log(self, label, count, start):
+        elapsed = time.perf_counter() - start
+        print(f"{label:<15} {count:>11,} rows {elapsed:>8.1f}s {count / max(elapsed, 1e-9):>10,.0f} rows/s")
+
+    def past(self, days):
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def bulk(self, model, rows):
+        total = 0
+        for chunk in chunked(rows, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(chunk, batch_size=self.batch_size)
+            total += len(chunk)
+        return total
+
+    # ------------------------------
+    # Users and profiles
+    # ------------------------------
+    def users(self, n):
+        rng = self.rng
+        city_weights = zipf_weights(len(CITIES))
+        for i in range(1, n + 1):
+            city, state = rng.choices(CITIES, cum_weights=city_weights)[0]
+            created = self.past(365)
+            # ~10% online in the last minute, the rest spread over the past month.
+            if rng.random() < 0.1:
+                last_active = self.now - timedelta(seconds=rng.uniform(0, 60))
+            else:
+                last_active = self.past(30)
+            yield UserData(
+                email=f"user{i}@{EMAIL_DOMAIN}",
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                phone_number=f"9{rng.randrange(10**8, 10**9)}",
+                location=city,
+                provider="email",
+                password=self.password,
+                created_at=created,
+                updated_at=created,
+                address=f"{rng.randint(1, 400)} {rng.choice(LAST_NAMES)} Street",
+                city=city,
+                state=state,
+                last_active=last_active,
+            )
+
+    def creators(self, user_ids):
+        rng = self.rng
+        niche_weights = zipf_weights(len(NICHES))
+        city_weights = zipf_weights(len(CITIES))
+        for user_id in user_ids:
+            created = self.past(300)
+            yield CreatorProfile(
+                user_id=user_id,
+                creator_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(NICHES).title()}",
+                creator_type=rng.choice(CREATOR_TYPES),
+                experience_level=rng.choices(EXPERIENCE, weights=[5, 3, 1])[0],
+                primary_niche=rng.choices(NICHES, cum_weights=niche_weights)[0],
+                secondary_niche=rng.choice(NICHES) if rng.random() < 0.6 else None,
+                platforms=",".join(rng.sample(PLATFORMS, rng.choices([1, 2, 3], weights=[5, 3, 1])[0])),
+                followers=int(rng.lognormvariate(8.5, 1.8)),
+                portfolio_category=rng.choice(PROJECT_TYPES),
+                portfolio_link=f"https://portfolio.{EMAIL_DOMAIN}/{user_id}" if rng.random() < 0.5 else None,
+                collaboration_type=rng.choice(COLLAB_TYPES),
+                project_type=rng.choice(PROJECT_TYPES),
+                location=rng.choices(CITIES, cum_weights=city_weights)[0][0],
+                created_at=created,
+                updated_at=created,
+            )
+
+    def collaborators(self, user_ids):
+        rng = self.rng
+        skill_weights = zipf_weights(len(SKILLS))
+        city_weights = zipf_weights(len(CITIES))
+        for user_id in user_ids:
+            created = self.past(300)
+            yield CollaboratorProfile(
+                user_id=user_id,
+                name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                language=rng.choice(LANGUAGES),
+                skill_category=rng.choices(SKILLS, cum_weights=skill_weights)[0],
+                experience=rng.choices(EXPERIENCE, weights=[4, 4, 2])[0],
+                pricing_amount=round(rng.lognormvariate(7, 0.9), 2),
+                pricing_unit=rng.choice(PRICING_UNITS),
+                availability=rng.choice(AVAILABILITY),
+                timing="10:00-18:00",
+                social_link=f"https://social.{EMAIL_DOMAIN}/{user_id}" if rng.random() < 0.4 else None,
+                portfolio_link=f"https://portfolio.{EMAIL_DOMAIN}/{user_id}" if rng.random() < 0.6 else None,
+                badges="verified" if rng.random() < 0.1 else None,
+                skills_rating=rng.randint(1, 5),
+                about="Available for collaborations.",
+                location=rng.choices(CITIES, cum_weights=city_weights)[0][0],
+                created_at=created,
+                updated_at=created,
+            )
+
+    # ------------------------------
+    # Conversations and messages
+    # ------------------------------
+    def conversation_pairs(self, user_ids, n):
+        # Popular users talk to many people: pick both ends by Zipf rank.
+        rng = self.rng
+        weights = zipf_weights(len(user_ids), s=0.9)
+        ranked = user_ids[:]
+        rng.shuffle(ranked)
+
+        pairs = set()
+        attempts = 0
+        while len(pairs) < n and attempts < n * 20:
+            attempts += 1
+            a, b = rng.choices(ranked, cum_weights=weights, k=2)
+            if a == b or (b, a) in pairs:
+                continue
+            pairs.add((a, b))
+        return sorted(pairs)
+
+    def next_seq(self, conversation_id):
+        self.last_seq[conversation_id] += 1
+        return self.last_seq[conversation_id]
+
+    def messages(self, conversations, n):
+        rng = self.rng
+        weights = zipf_weights(len(conversations), s=1.0)
+        ordered = conversations[:]
+        rng.shuffle(ordered)
+
+        start = self.now - timedelta(days=180)
+        step = timedelta(days=180) / max(n, 1)
+        seen_until = n * 0.97   # everything but the newest ~3% has been read
+
+        for i, (conversation_id, user1_id, user2_id) in enumerate(rng.choices(ordered, cum_weights=weights, k=n)):
+            created = start + step * i
+            attachment = None
+            message_type = "text"
+            if rng.random() < 0.04:
+                if rng.random() < 0.7:
+                    attachment = f"message_files/{i}.{rng.choice(IMAGE_EXTS)}"
+                    message_type = "image"
+                else:
+                    attachment = f"message_files/{i}.{rng.choice(FILE_EXTS)}"
+                    message_type = "file"
+            yield Message(
+                conversation_id=conversation_id,
+                sender_id=user1_id if rng.random() < 0.5 else user2_id,
+                content=" ".join(rng.choices(WORDS, k=int(rng.lognormvariate(1.8, 0.7)) + 1)),
+                is_seen=i < seen_until,
+                created_at=created,
+                seq=self.next_seq(conversation_id),
+                file=attachment,
+                message_type=message_type,
+            )
+
+    def group_members(self, user_ids, group_ids):
+        # Small teams, drawn by the same Zipf rank as the 1:1 chats; the first is the owner.
+        rng = self.rng
+        weights = zipf_weights(len(user_ids), s=0.9)
+        for group_id in group_ids:
+            members = set()
+            size = rng.randint(3, 12)
+            while len(members) < size:
+                members.update(rng.choices(user_ids, cum_weights=weights, k=size - len(members)))
+            joined = self.past(90)
+            for i, user_id in enumerate(sorted(members, key=lambda _: rng.random())):
+                yield ConversationParticipant(
+                    conversation_id=group_id,
+                    user_id=user_id,
+                    role=ConversationParticipant.OWNER if i == 0 else ConversationParticipant.MEMBER,
+                    joined_at=joined,
+                )
+
+
+def seed(counts, seed_value, batch_size):
+    gen = Generator(seed_value, batch_size)
+
+    with explicit_timestamps(UserData, CreatorProfile, CollaboratorProfile, Conversation, Message, ConversationParticipant):
+        start = time.perf_counter()
+        created = gen.bulk(UserData, gen.users(counts["users"]))
+        gen.log("users", created, start)
+
+        user_ids = list(
+            UserData.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").order_by("id").values_list("id", flat=True)
+        )
+
+        start = time.perf_counter()
+        creator_ids = gen.rng.sample(user_ids, min(counts["creators"], len(user_ids)))
+        created = gen.bulk(CreatorProfile, gen.creators(sorted(creator_ids)))
+        UserData.objects.filter(id__in=creator_ids).update(role="creator")
+        gen.log("creators", created, start)
+
+        start = time.perf_counter()
+        collaborator_ids = gen.rng.sample(user_ids, min(counts["collaborators"], len(user_ids)))
+        created = gen.bulk(CollaboratorProfile, gen.collaborators(sorted(collaborator_ids)))
+        gen.log("collaborators", created, start)
+
+        start = time.perf_counter()
+        pairs = gen.conversation_pairs(user_ids, counts["conversations"])
+        created = gen.bulk(Conversation, (
+            Conversation(user1_id=a, user2_id=b, created_at=gen.past(180)) for a, b in pairs
+        ))
+        gen.log("conversations", created, start)
+
+        conversations = list(
+            Conversation.objects.filter(is_group=False).order_by("id").values_list("id", "user1_id", "user2_id")
+        )
+        gen.last_seq.update(dict(Conversation.objects.filter(last_seq__gt=0).values_list("id", "last_seq")))
+        start = time.perf_counter()
+        created = gen.bulk(Message, gen.messages(conversations, counts["messages"]))
+        Conversation.objects.bulk_update(
+            [Conversation(id=conversation_id, last_seq=seq) for conversation_id, seq in gen.last_seq.items()],
+            ["last_seq"], batch_size=gen.batch_size,
+        )
+        gen.log("messages", created, start)
+
+        # Groups start without history; load tests fill them through /group/{id}/send.
+        start = time.perf_counter()
+        created = gen.bulk(Conversation, (
+            Conversation(is_group=True, title=f"{gen.rng.choice(NICHES).title()} team", created_at=gen.past(90))
+            for _ in range(counts["groups"])
+        ))
+        group_ids = list(
+            Conversation.objects.filter(is_group=True, participants__isnull=True).order_by("id").values_list("id", flat=True)
+        )
+        members = gen.bulk(ConversationParticipant, gen.group_members(user_ids, group_ids))
+        gen.log("groups", created, start)
+        gen.log("group members", members, start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    for name in PRESETS["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"override the preset's {name} count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--migrate", action="store_true", help="run migrations first")
+    parser.add_argument("--reset", action="store_true", help="flush ALL data in the target database first")
+    args = parser.parse_args()
+
+    counts = {name: getattr(args, name) or value for name, value in PRESETS[args.preset].items()}
+
+    if args.migrate:
+        call_command("migrate", verbosity=0)
+    if args.reset:
+        call_command("flush", interactive=False, verbosity=0)
+
+    print(f"seeding {', '.join(f'{k}={v:,}' for k, v in counts.items())} (seed {args.seed})")
+    seed(counts, args.seed, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
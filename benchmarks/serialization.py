@@ -0,0 +1,132 @@
+"""
+Serialization benchmark for large list/search responses.
+
+Compares, for the same /creator/search payload:
+
+    instances   model instances -> dicts -> jsonable_encoder -> json.dumps
+                (the previous path: select_related + plain dict return)
+    validated   values() rows -> response_model validation -> orjson
+                (what FastAPI does when a route returns rows with a response_model)
+    rows        values() rows -> orjson
+                (the current path: json_rows() skips re-validation)
+
+Rows are synthetic and built in memory, so only object construction and
+encoding are measured, not the database.
+
+    DJANGO_SETTINGS_MODULE=creator_backend.settings \\
+        python benchmarks/serialization.py --rows 5000 --repeat 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fastapi_app.django_setup  # noqa: E402
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from creator_app.models import CreatorProfile, UserData  # noqa: E402
+from fastapi_app.responses import ORJSONResponse  # noqa: E402
+from fastapi_app.routes.creator import SEARCH_FIELDS  # noqa: E402
+from fastapi_app.schemas import CreatorSearchItem  # noqa: E402
+
+
+def make_rows(n):
+    return [
+        {
+            "user_id": i,
+            "creator_name": f"Creator {i}",
+            "creator_type": "influencer",
+            "primary_niche": "travel",
+            "location": "Chennai",
+            "followers": 1000 + i,
+            "platforms": "instagram,youtube",
+            "experience_level": "intermediate",
+            "collaboration_type": "paid",
+            "project_type": "reels",
+            "email": f"creator{i}@example.com",
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def make_instances(rows):
+    # What the ORM hands back for select_related("user"): a profile plus its user.
+    profiles = []
+    for row in rows:
+        user = UserData(id=row["user_id"], email=row["email"])
+        profile = CreatorProfile(**{k: row[k] for k in SEARCH_FIELDS if k != "user_id"})
+        profile.user = user
+        profiles.append(profile)
+    return profiles
+
+
+def instances(profiles, _adapter):
+    payload = [
+        {
+            "user_id": p.user.id,
+            "email": p.user.email,
+            "creator_name": p.creator_name,
+            "creator_type": p.creator_type,
+            "primary_niche": p.primary_niche,
+            "location": p.location,
+            "followers": p.followers,
+            "platforms": p.platforms,
+            "experience_level": p.experience_level,
+            "collaboration_type": p.collaboration_type,
+            "project_type": p.project_type,
+        }
+        for p in profiles
+    ]
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def validated(rows, adapter):
+    return ORJSONResponse(None).render(adapter.dump_python(adapter.validate_python(rows), mode="json"))
+
+
+def plain_rows(rows, _adapter):
+    return ORJSONResponse(None).render(rows)
+
+
+def measure(func, data, adapter, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(data, adapter)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    profiles = make_instances(rows)
+    adapter = TypeAdapter(list[CreatorSearchItem])
+
+    cases = [
+        ("instances", instances, profiles),
+        ("validated", validated, rows),
+        ("rows", plain_rows, rows),
+    ]
+
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    print(f"{'path':<10} {'ms':>9} {'bytes':>10} {'speedup':>8}")
+    baseline = None
+    for name, func, data in cases:
+        ms, size = measure(func, data, adapter, args.repeat)
+        baseline = baseline or ms
+        print(f"{name:<10} {ms:>9.2f} {size:>10} {baseline / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
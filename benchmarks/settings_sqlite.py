@@ -0,0 +1,36 @@
+"""
+Project settings with a local SQLite database, for benchmark runs without MySQL.
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings_sqlite python benchmarks/seed_data.py --migrate
+
+Set BENCH_SQLITE_REPLICA_PATH to add a `replica` alias backed by a second file.
+"""
+import os
+
+from creator_backend.settings import *  # noqa: F401,F403
+from creator_backend.settings import BASE_DIR
+
+DEBUG = False
+
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "benchmark-jwt-secret")
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("BENCH_SQLITE_PATH", str(BASE_DIR / "benchmarks" / "bench.sqlite3")),
+        "OPTIONS": {
+            # WAL lets the DB lanes read while a write is in flight.
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            "timeout": 30,
+        },
+    }
+}
+
+# Optional second file standing in for a read replica. Nothing replicates
+# into it, so it shows exactly which reads were routed there.
+if os.getenv("BENCH_SQLITE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("BENCH_SQLITE_REPLICA_PATH"),
+        "TEST": {"MIRROR": "default"},
+    }
@@ -0,0 +1,84 @@
+"""
+Worker boot benchmark based on `python -X importtime`.
+
+Imports the ASGI app in fresh interpreters and reports the median wall-clock
+boot time, the slowest top-level imports, and any modules that should stay
+deferred until first use but were loaded at boot anyway.
+
+    DJANGO_SETTINGS_MODULE=creator_backend.settings \\
+        python benchmarks/startup_importtime.py --runs 5 --budget-ms 900
+
+Exits non-zero if the median exceeds --budget-ms or a deferred module leaks in.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGET = "fastapi_app.main"
+
+# Modules our code defers until first use; importing them at boot is a regression.
+DEFERRED = ("requests", "jwt", "jinja2", "PIL")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def boot(target):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))},
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode:
+        sys.exit(proc.stderr[-2000:])
+
+    modules = {}
+    for match in LINE.finditer(proc.stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us), len(indent))
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--target", default=TARGET)
+    args = parser.parse_args()
+
+    timings, modules = [], {}
+    for _ in range(args.runs):
+        elapsed, modules = boot(args.target)
+        timings.append(elapsed * 1000)
+
+    median = statistics.median(timings)
+    print(f"boot {args.target}: median {median:.1f} ms, min {min(timings):.1f} ms over {args.runs} runs")
+
+    top_level = sorted(
+        ((cum, name) for name, (_, cum, indent) in modules.items() if indent <= 3),
+        reverse=True,
+    )
+    print(f"\n{'cumulative ms':>14}  module")
+    for cum, name in top_level[:args.top]:
+        print(f"{cum / 1000:>14.1f}  {name}")
+
+    leaked = [name for name in DEFERRED if name in modules]
+    if leaked:
+        print(f"\nDeferred modules imported at boot: {', '.join(leaked)}")
+
+    if leaked or (args.budget_ms is not None and median > args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
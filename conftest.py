@@ -0,0 +1,24 @@
+"""
+Runs the Django test cases under pytest as well as `manage.py test`: same
+settings, and one set of test databases for the whole session.
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "creator_backend.settings_test")
+
+import fastapi_app.django_setup  # noqa: E402,F401
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_test_databases():
+    from django.test.utils import (
+        setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
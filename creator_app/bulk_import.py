@@ -0,0 +1,291 @@
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+import orjson
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection, transaction
+
+from creator_app import change_log, stats
+from creator_app.models import CollaboratorProfile, CreatorProfile, UserData
+
+CHUNK_SIZE = 1000
+
+# Columns copied onto UserData; "password" and "role" are handled separately.
+USER_FIELDS = ("email", "first_name", "last_name", "phone_number", "address", "city", "state")
+
+PROFILE_MODELS = {
+    "creator": CreatorProfile,
+    "collaborator": CollaboratorProfile,
+}
+
+# Rollup keys (creator_app/stats.py) each profile model counts towards.
+STAT_KEYS = {
+    CreatorProfile: (stats.CREATOR_FIELDS, stats.creator_keys),
+    CollaboratorProfile: (stats.COLLABORATOR_FIELDS, stats.collaborator_keys),
+}
+
+REPORT_COLUMNS = ("line", "email", "error")
+
+
+def profile_fields(model):
+    return [
+        f.name for f in model._meta.concrete_fields
+        if f.name not in ("id", "user", "created_at", "updated_at")
+    ]
+
+
+# ================================
+# READERS
+# ================================
+def iter_rows(fileobj, fmt: str):
+    """Yield (line_number, row_dict) from a binary CSV or NDJSON stream."""
+    if fmt == "csv":
+        reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(fileobj, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                row = {"__error__": f"Invalid JSON: {exc}"}
+            yield line_no, row if isinstance(row, dict) else {"__error__": "Expected a JSON object"}
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def detect_format(filename: str | None):
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value == "" else value
+
+
+# ================================
+# IMPORTER
+# ================================
+@dataclass
+class ImportResult:
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list, repr=False)
+
+    def as_dict(self):
+        return {"total": self.total, "created": self.created, "updated": self.updated, "failed": self.failed}
+
+
+class ProfileImporter:
+    """
+    Streams rows into UserData plus the matching role profile.
+
+    Each chunk is validated with the models' own field rules and checked for
+    existing emails in a single query. Passwords are hashed across a process
+    pool. The chunk is then written with bulk_create inside one transaction.
+    mode="insert" rejects emails that already exist. mode="upsert" updates
+    them in place. Failed rows go to `report` (a csv.writer) when one is
+    given, otherwise to `result.errors`. `on_chunk` is called after every
+    chunk, e.g. to heartbeat the job running the import.
+
+    Profile counts go to the stats rollups like the save routes do, and
+    are flushed when the run ends.
+    """
+
+    def __init__(
+        self, mode: str = "insert", chunk_size: int = CHUNK_SIZE, workers: int | None = None, report=None,
+        on_chunk=None,
+    ):
+        if mode not in ("insert", "upsert"):
+            raise ValueError("mode must be 'insert' or 'upsert'")
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.report = report
+        self.on_chunk = on_chunk
+        self.result = ImportResult()
+        self._seen_emails = set()
+        self._pool = None
+
+    def run(self, rows):
+        ctx = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx) as pool:
+                self._pool = pool
+                for chunk in _chunks(rows, self.chunk_size):
+                    self._import_chunk(chunk)
+                    if self.on_chunk is not None:
+                        self.on_chunk()
+        finally:
+            self._pool = None
+            # Worker processes and the CLI have no periodic flusher.
+            stats.flush()
+        return self.result
+
+    # ------------------------------
+    # Per-chunk pipeline
+    # ------------------------------
+    def _import_chunk(self, chunk):
+        self.result.total += len(chunk)
+
+        valid = [item for item in (self._validate(line, row) for line, row in chunk) if item]
+        if not valid:
+            return
+
+        emails = [user.email for _, user, _, _ in valid]
+        existing = set(UserData.objects.filter(email__in=emails).values_list("email", flat=True))
+
+        if self.mode == "insert":
+            for item in [v for v in valid if v[1].email in existing]:
+                self._fail(item[0], item[1].email, "Email already exists")
+            valid = [v for v in valid if v[1].email not in existing]
+            if not valid:
+                return
+
+        self._hash_passwords(valid)
+
+        try:
+            with transaction.atomic():
+                old_keys, new_keys = self._write(valid)
+        except DatabaseError as exc:
+            for line, user, _, _ in valid:
+                self._fail(line, user.email, f"Database error: {exc}")
+            return
+        stats.track(old_keys, new_keys)
+
+        updated = sum(1 for _, user, _, _ in valid if user.email in existing)
+        self.result.updated += updated
+        self.result.created += len(valid) - updated
+
+    def _validate(self, line, row):
+        if "__error__" in row:
+            self._fail(line, None, row["__error__"])
+            return None
+
+        row = {k.strip(): _clean(v) for k, v in row.items() if k}
+        email = row.get("email")
+        role = (row.get("role") or "").lower()
+
+        if not email:
+            self._fail(line, None, "email is required")
+            return None
+        if email in self._seen_emails:
+            self._fail(line, email, "Duplicate email in upload")
+            return None
+        if role not in PROFILE_MODELS:
+            self._fail(line, email, "role must be 'creator' or 'collaborator'")
+            return None
+
+        model = PROFILE_MODELS[role]
+        user = UserData(role=role, **{name: row.get(name) for name in USER_FIELDS})
+        profile = model(**{name: row.get(name) for name in profile_fields(model)})
+
+        try:
+            user.full_clean(exclude=["password", "profile_pic"], validate_unique=False, validate_constraints=False)
+            profile.full_clean(exclude=["user"], validate_unique=False, validate_constraints=False)
+        except ValidationError as exc:
+            errors = "; ".join(f"{k}: {' '.join(v)}" for k, v in exc.message_dict.items())
+            self._fail(line, email, errors)
+            return None
+
+        self._seen_emails.add(email)
+        return line, user, profile, row.get("password")
+
+    def _hash_passwords(self, valid):
+        todo = [(user, raw) for _, user, _, raw in valid if raw]
+        if not todo:
+            return
+        chunksize = max(1, len(todo) // (self.workers * 4))
+        hashed = self._pool.map(make_password, [raw for _, raw in todo], chunksize=chunksize)
+        for (user, _), value in zip(todo, hashed):
+            user.password = value
+
+    def _write(self, valid):
+        users = [user for _, user, _, _ in valid]
+
+        if self.mode == "insert":
+            UserData.objects.bulk_create(users, batch_size=self.chunk_size)
+        else:
+            # Rows without a password must not blank the stored hash on update.
+            with_pw = [u for u in users if u.password]
+            without_pw = [u for u in users if not u.password]
+            fields = [name for name in USER_FIELDS if name != "email"] + ["role", "updated_at"]
+            self._upsert(UserData, with_pw, ["email"], fields + ["password"])
+            self._upsert(UserData, without_pw, ["email"], fields)
+
+        # bulk_create does not return primary keys on MySQL, so map them back by email.
+        ids = dict(UserData.objects.filter(email__in=[u.email for u in users]).values_list("email", "id"))
+
+        by_model = {}
+        for _, user, profile, _ in valid:
+            profile.user_id = ids[user.email]
+            by_model.setdefault(type(profile), []).append(profile)
+
+        old_keys, new_keys = [], []
+        for model, profiles in by_model.items():
+            fields, keys = STAT_KEYS[model]
+            new_keys += [key for p in profiles for key in keys(stats.stat_row(p, fields))]
+            if self.mode == "insert":
+                model.objects.bulk_create(profiles, batch_size=self.chunk_size)
+            else:
+                replaced = model.objects.filter(user_id__in=[p.user_id for p in profiles]).values(*fields)
+                old_keys += [key for row in replaced for key in keys(row)]
+                self._upsert(model, profiles, ["user"], profile_fields(model) + ["updated_at"])
+
+        # Same transaction as the chunk, so feed consumers see exactly what landed.
+        change_log.record(
+            *(change_log.upsert(change_log.USER, user_id) for user_id in ids.values()),
+            *(change_log.upsert(change_log.ENTITIES[model], p.user_id) for model, profiles in by_model.items() for p in profiles),
+        )
+        return old_keys, new_keys
+
+    def _upsert(self, model, objs, unique_fields, update_fields):
+        if not objs:
+            return
+        # MySQL's ON DUPLICATE KEY UPDATE cannot name a conflict target.
+        if not connection.features.supports_update_conflicts_with_target:
+            unique_fields = None
+        model.objects.bulk_create(
+            objs,
+            batch_size=self.chunk_size,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+
+    def _fail(self, line, email, error):
+        self.result.failed += 1
+        if self.report is not None:
+            self.report.writerow([line, email or "", error])
+        else:
+            self.result.errors.append({"line": line, "email": email, "error": error})
+
+
+def import_profiles(fileobj, fmt: str, report_path=None, **options):
+    """Run a full import from a binary stream, writing failures to report_path as CSV."""
+    if report_path is None:
+        return ProfileImporter(**options).run(iter_rows(fileobj, fmt))
+
+    with open(report_path, "w", newline="", encoding="utf-8") as report_file:
+        writer = csv.writer(report_file)
+        writer.writerow(REPORT_COLUMNS)
+        return ProfileImporter(report=writer, **options).run(iter_rows(fileobj, fmt))
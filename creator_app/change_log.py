@@ -0,0 +1,118 @@
+"""
+Change feed for profile data.
+
+Every write to a UserData, CreatorProfile or CollaboratorProfile row through
+the API appends a ChangeLog entry in the same transaction:
+
+    await change_log.awrite(lambda: profile.save(update_fields=[...]), change_log.upsert(change_log.CREATOR, user_id))
+
+Consumers (search indexes, the app's offline directory, analytics) tail
+GET /changes?after=<last id> and re-read the rows named there instead of
+rescanning whole tables. Entries only name the row. The current values are
+read from the normal endpoints, so a consumer that skips ahead never
+applies stale data.
+
+compact() runs nightly. For each row it keeps only the newest entry, so the
+log stays about the size of the tables. Tombstones (deletes) are dropped
+after CHANGE_LOG_TOMBSTONE_DAYS. A consumer further behind than that must
+rescan once.
+"""
+import logging
+import os
+from datetime import datetime, time as dt_time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from creator_app.models import ChangeLog, CollaboratorProfile, CreatorProfile, UserData
+
+logger = logging.getLogger(__name__)
+
+# Superseded entries younger than this stay, so live tails see every write.
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", 7))
+CHANGE_LOG_TOMBSTONE_DAYS = int(os.getenv("CHANGE_LOG_TOMBSTONE_DAYS", 30))
+# Hour (UTC) of the nightly compaction.
+CHANGE_LOG_COMPACT_HOUR = int(os.getenv("CHANGE_LOG_COMPACT_HOUR", 4))
+COMPACT_BATCH = 5000
+
+USER = "user"
+CREATOR = "creator"
+COLLABORATOR = "collaborator"
+ENTITIES = {UserData: USER, CreatorProfile: CREATOR, CollaboratorProfile: COLLABORATOR}
+
+
+def upsert(entity, object_id):
+    return (entity, object_id, ChangeLog.UPSERT)
+
+
+def delete(entity, object_id):
+    return (entity, object_id, ChangeLog.DELETE)
+
+
+# ================================
+# WRITES
+# ================================
+def record(*entries):
+    """Append entries; call inside the transaction that made the change."""
+    ChangeLog.objects.bulk_create([ChangeLog(entity=e, object_id=i, op=op) for e, i, op in entries])
+
+
+def write(func, *entries):
+    """
+    Run `func` and append `entries` in one transaction; returns func's result.
+    A result of 0 (an UPDATE / DELETE that matched nothing) appends nothing.
+    """
+    with transaction.atomic():
+        result = func()
+        if result != 0:
+            record(*entries)
+    return result
+
+
+async def awrite(func, *entries):
+    return await sync_to_async(write)(func, *entries)
+
+
+def create(obj, entity):
+    """INSERT a new `obj` and log it; for rows whose id only exists after the insert."""
+    with transaction.atomic():
+        obj.save(force_insert=True)
+        record(upsert(entity, obj.pk))
+    return obj
+
+
+async def acreate(obj, entity):
+    return await sync_to_async(create)(obj, entity)
+
+
+# ================================
+# COMPACTION
+# ================================
+def compact(now=None):
+    """Drop superseded entries and old tombstones; returns entries removed."""
+    now = now or timezone.now()
+    newer = ChangeLog.objects.filter(entity=OuterRef("entity"), object_id=OuterRef("object_id"), id__gt=OuterRef("id"))
+    superseded = ChangeLog.objects.filter(created_at__lt=now - timedelta(days=CHANGE_LOG_RETENTION_DAYS)).filter(
+        Exists(newer)
+    )
+    tombstones = ChangeLog.objects.filter(
+        op=ChangeLog.DELETE, created_at__lt=now - timedelta(days=CHANGE_LOG_TOMBSTONE_DAYS),
+    )
+
+    removed = 0
+    for queryset in (superseded, tombstones):
+        # Ids first, then small deletes: MySQL cannot DELETE with a subquery
+        # on the same table, and short statements keep lock times short.
+        while ids := list(queryset.values_list("id", flat=True)[:COMPACT_BATCH]):
+            removed += ChangeLog.objects.filter(id__in=ids).delete()[0]
+    if removed:
+        logger.info("Change log compaction removed %d entries", removed)
+    return removed
+
+
+def next_compact_at(now=None):
+    now = now or timezone.now()
+    run_at = datetime.combine(now.date(), dt_time(CHANGE_LOG_COMPACT_HOUR), tzinfo=now.tzinfo)
+    return run_at if run_at > now else run_at + timedelta(days=1)
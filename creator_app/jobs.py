@@ -0,0 +1,313 @@
+"""
+Durable, DB-backed background jobs.
+
+Jobs live in the `jobs` table. Workers (`manage.py runworker`) claim due jobs
+in priority order with SELECT ... FOR UPDATE SKIP LOCKED where the backend
+supports it (MySQL 8, PostgreSQL). On SQLite they fall back to an optimistic
+conditional UPDATE. Either way a job is claimed by exactly one worker. A
+failing job is retried with exponential backoff until max_attempts, then
+marked failed. A job whose worker died mid-run is requeued after
+JOB_LOCK_TIMEOUT. Finished jobs are purged after JOB_RETENTION_DAYS by the
+nightly purge_jobs task.
+
+    from creator_app.jobs import task
+
+    @task(priority=10)
+    def send_email(subject, message, recipient_list):
+        ...
+
+    await send_email.aenqueue(subject=..., message=..., recipient_list=[...])
+    send_email.enqueue(delay=60, subject=...)          # scheduled
+
+Task functions take JSON-serializable keyword arguments; what they return
+(also JSON-serializable) is kept on the job as `result`. Long tasks call
+heartbeat() now and then so their job isn't taken for a dead worker's.
+Modules that define tasks are listed in JOB_TASK_MODULES so workers can
+find them.
+"""
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+from contextlib import nullcontext
+from contextvars import ContextVar
+from datetime import datetime, time as dt_time, timedelta
+from importlib import import_module
+
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from creator_app.models import Job
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by workers so their @task functions are registered.
+JOB_TASK_MODULES = ["creator_app.tasks"]
+
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", 600))
+JOB_RETRY_BASE = float(os.getenv("JOB_RETRY_BASE", 10))
+JOB_RETRY_MAX = float(os.getenv("JOB_RETRY_MAX", 3600))
+# Done and failed jobs are kept this long (for results and debugging), then purged.
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", 14))
+# Hour (UTC) of the nightly purge.
+JOB_PURGE_HOUR = int(os.getenv("JOB_PURGE_HOUR", 3))
+PURGE_BATCH = 5000
+
+TASKS = {}
+
+# The job run_job() is working on, for heartbeat().
+_current_job = ContextVar("current_job", default=None)
+
+
+# ================================
+# TASK REGISTRY / ENQUEUE
+# ================================
+class Task:
+
+    def __init__(self, func, name, queue, priority, max_attempts):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def _job(self, kwargs, options):
+        return _new_job(
+            self.name,
+            kwargs,
+            queue=options.get("queue", self.queue),
+            priority=options.get("priority", self.priority),
+            max_attempts=options.get("max_attempts", self.max_attempts),
+            run_at=options.get("run_at"),
+            delay=options.get("delay"),
+        )
+
+    def enqueue(self, *, queue=None, priority=None, run_at=None, delay=None, max_attempts=None, **kwargs):
+        options = _options(queue=queue, priority=priority, run_at=run_at, delay=delay, max_attempts=max_attempts)
+        job = self._job(kwargs, options)
+        job.save()
+        return job
+
+    async def aenqueue(self, *, queue=None, priority=None, run_at=None, delay=None, max_attempts=None, **kwargs):
+        options = _options(queue=queue, priority=priority, run_at=run_at, delay=delay, max_attempts=max_attempts)
+        job = self._job(kwargs, options)
+        await job.asave()
+        return job
+
+
+def task(func=None, *, name=None, queue="default", priority=0, max_attempts=5):
+    """Register `func` as a job task; adds .enqueue() / .aenqueue()."""
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        TASKS[task_name] = Task(func, task_name, queue, priority, max_attempts)
+        return TASKS[task_name]
+
+    return register(func) if func is not None else register
+
+
+def _options(**options):
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _new_job(task_name, payload, *, queue="default", priority=0, max_attempts=5, run_at=None, delay=None):
+    if run_at is None:
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+    return Job(
+        task=task_name,
+        payload=payload or {},
+        queue=queue,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=run_at,
+    )
+
+
+def enqueue(task_name, payload=None, **options):
+    """Enqueue by name, e.g. from code that can't import the task module."""
+    job = _new_job(task_name, payload, **options)
+    job.save()
+    return job
+
+
+async def aenqueue(task_name, payload=None, **options):
+    job = _new_job(task_name, payload, **options)
+    await job.asave()
+    return job
+
+
+# ================================
+# CLAIM / RUN
+# ================================
+def claim(worker_id, queues=("default",), limit=1):
+    """Lock up to `limit` due jobs for this worker and mark them running."""
+    now = timezone.now()
+    due = (
+        Job.objects.filter(status=Job.QUEUED, queue__in=queues, run_at__lte=now)
+        .order_by("-priority", "run_at", "id")
+    )
+
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    # Without SKIP LOCKED (SQLite) the conditional UPDATE alone is the claim; a
+    # read-then-write transaction there would only add lock-upgrade failures.
+    with transaction.atomic() if skip_locked else nullcontext():
+        if skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        candidates = list(due.values_list("id", flat=True)[:limit])
+
+        claimed = []
+        for job_id in candidates:
+            # Conditional update: the claim itself on SQLite, a no-op safety check elsewhere.
+            if Job.objects.filter(id=job_id, status=Job.QUEUED).update(
+                status=Job.RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            ):
+                claimed.append(job_id)
+
+    return list(Job.objects.filter(id__in=claimed).order_by("-priority", "run_at", "id"))
+
+
+def retry_delay(attempts):
+    return min(JOB_RETRY_MAX, JOB_RETRY_BASE * 2 ** (attempts - 1))
+
+
+def run_job(job):
+    task_obj = TASKS.get(job.task)
+    now = timezone.now()
+    token = _current_job.set(job)
+    try:
+        if task_obj is None:
+            raise LookupError(f"Unknown task {job.task!r}; is its module in JOB_TASK_MODULES?")
+        result = task_obj.func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            status, run_at = Job.QUEUED, now + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning("Job %s (%s) failed, attempt %s/%s; retrying", job.id, job.task, job.attempts, job.max_attempts)
+        else:
+            status, run_at = Job.FAILED, job.run_at
+            logger.error("Job %s (%s) failed permanently:\n%s", job.id, job.task, error)
+        _finish(job, status=status, run_at=run_at, last_error=error)
+        return False
+    finally:
+        _current_job.reset(token)
+
+    return _finish(job, status=Job.DONE, result=result, last_error=None)
+
+
+def _finish(job, **fields):
+    # Only while the job is still ours: if requeue_stale() took it for a dead
+    # worker's, another worker may hold it now and its outcome wins.
+    if Job.objects.filter(id=job.id, status=Job.RUNNING, locked_by=job.locked_by).update(
+        locked_by=None, locked_at=None, updated_at=timezone.now(), **fields,
+    ):
+        return True
+    logger.warning("Job %s (%s) lost its lock while running; outcome dropped", job.id, job.task)
+    return False
+
+
+def heartbeat():
+    """Called from inside a long task: renews its lock so requeue_stale() leaves it alone."""
+    job = _current_job.get()
+    if job is not None:
+        Job.objects.filter(id=job.id, locked_by=job.locked_by).update(locked_at=timezone.now())
+
+
+def requeue_stale(timeout=JOB_LOCK_TIMEOUT):
+    """
+    Put back running jobs claimed more than `timeout` seconds ago; their
+    worker is assumed dead. Tasks must finish well within JOB_LOCK_TIMEOUT.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=timeout))
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, last_error="Worker lost while running the final attempt",
+        locked_by=None, locked_at=None, updated_at=now,
+    )
+    return stale.update(status=Job.QUEUED, locked_by=None, locked_at=None, updated_at=now)
+
+
+def purge_finished(now=None, days=JOB_RETENTION_DAYS):
+    """Delete done and failed jobs last updated more than `days` ago; returns jobs removed."""
+    now = now or timezone.now()
+    finished = Job.objects.filter(status__in=(Job.DONE, Job.FAILED), updated_at__lt=now - timedelta(days=days))
+    removed = 0
+    # Small batches keep each DELETE's locks short next to claiming workers.
+    while ids := list(finished.values_list("id", flat=True)[:PURGE_BATCH]):
+        removed += Job.objects.filter(id__in=ids).delete()[0]
+    if removed:
+        logger.info("Purged %d finished jobs", removed)
+    return removed
+
+
+def next_purge_at(now=None):
+    now = now or timezone.now()
+    run_at = datetime.combine(now.date(), dt_time(JOB_PURGE_HOUR), tzinfo=now.tzinfo)
+    return run_at if run_at > now else run_at + timedelta(days=1)
+
+
+def load_task_modules(modules=JOB_TASK_MODULES):
+    for module in modules:
+        import_module(module)
+
+
+# ================================
+# WORKER LOOP
+# ================================
+class Worker:
+
+    def __init__(self, queues=("default",), poll_interval=JOB_POLL_INTERVAL, batch=1, name=None):
+        self.queues = tuple(queues)
+        self.poll_interval = poll_interval
+        self.batch = batch
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+        self.processed = 0
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def install_signal_handlers(self):
+        # Finish the current job, then exit.
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def run(self, burst=False, max_jobs=None):
+        """Process jobs until stopped; with `burst`, exit once the queues are empty."""
+        load_task_modules()
+        last_sweep = 0.0
+        while not self.stopping:
+            if time.monotonic() - last_sweep > JOB_LOCK_TIMEOUT / 2:
+                requeue_stale()
+                last_sweep = time.monotonic()
+
+            close_old_connections()
+            try:
+                jobs = claim(self.name, self.queues, self.batch)
+            except DatabaseError:
+                # DB restarting or locked; back off and keep the worker alive.
+                logger.exception("Claiming jobs failed")
+                time.sleep(self.poll_interval)
+                continue
+            if not jobs:
+                if burst:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+
+            for job in jobs:
+                run_job(job)
+                self.processed += 1
+                if max_jobs is not None and self.processed >= max_jobs:
+                    return self.processed
+        close_old_connections()
+        return self.processed
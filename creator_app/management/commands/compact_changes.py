@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from creator_app import change_log
+from creator_app.tasks import schedule_compact_changes
+
+
+class Command(BaseCommand):
+    help = "Drop superseded change-log entries and old tombstones (creator_app/change_log.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedule", action="store_true",
+            help="Instead of compacting now, queue the nightly compact_changes job for runworker",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            schedule_compact_changes()
+            self.stdout.write(f"Nightly change-log compaction queued for {change_log.next_compact_at():%Y-%m-%d %H:%M} UTC")
+            return
+
+        removed = change_log.compact()
+        self.stdout.write(self.style.SUCCESS(f"Change log compacted; {removed} entries removed"))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from creator_app.bulk_import import CHUNK_SIZE, detect_format, import_profiles
+
+
+class Command(BaseCommand):
+    help = "Bulk import users with their creator/collaborator profiles from CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file to import")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+        parser.add_argument("--mode", choices=["insert", "upsert"], default="insert")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--workers", type=int, default=None, help="Password hashing processes")
+        parser.add_argument("--report", default=None, help="Where to write the per-row error CSV")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        report = options["report"] or f"{path}.errors.csv"
+
+        try:
+            with open(path, "rb") as f:
+                result = import_profiles(
+                    f,
+                    fmt,
+                    report_path=report,
+                    mode=options["mode"],
+                    chunk_size=options["chunk_size"],
+                    workers=options["workers"],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.total} rows: {result.created} created, "
+            f"{result.updated} updated, {result.failed} failed"
+        ))
+        if result.failed:
+            self.stdout.write(f"Error report: {report}")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from creator_app import jobs
+from creator_app.tasks import schedule_purge_jobs
+
+
+class Command(BaseCommand):
+    help = "Delete done and failed jobs older than JOB_RETENTION_DAYS (creator_app/jobs.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedule", action="store_true",
+            help="Instead of purging now, queue the nightly purge_jobs job for runworker",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            schedule_purge_jobs()
+            self.stdout.write(f"Nightly job purge queued for {jobs.next_purge_at():%Y-%m-%d %H:%M} UTC")
+            return
+
+        removed = jobs.purge_finished()
+        self.stdout.write(self.style.SUCCESS(f"Job table purged; {removed} finished jobs removed"))
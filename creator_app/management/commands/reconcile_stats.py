@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from creator_app import stats
+from creator_app.tasks import schedule_reconcile_stats
+
+
+class Command(BaseCommand):
+    help = "Recount the stats rollups from the source tables (creator_app/stats.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedule", action="store_true",
+            help="Instead of recounting now, queue the nightly reconcile_stats job for runworker",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            schedule_reconcile_stats()
+            self.stdout.write(f"Nightly stats reconciliation queued for {stats.next_reconcile_at():%Y-%m-%d %H:%M} UTC")
+            return
+
+        changed = stats.reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Stats reconciled; {changed} rollup rows corrected"))
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+
+def _worker_process(queues, poll_interval, batch, burst):
+    # Spawned interpreters start clean; DJANGO_SETTINGS_MODULE comes from the parent env.
+    import django
+    django.setup()
+
+    from creator_app.jobs import Worker
+
+    worker = Worker(queues=queues, poll_interval=poll_interval, batch=batch)
+    worker.install_signal_handlers()
+    worker.run(burst=burst)
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (creator_app/jobs.py)."
+
+    def add_arguments(self, parser):
+        # Imported here: spawned workers import this module before django.setup().
+        from creator_app.jobs import JOB_POLL_INTERVAL
+
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--queues", nargs="+", default=["default"])
+        parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL)
+        parser.add_argument("--batch", type=int, default=1, help="Jobs claimed per round trip")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queues are empty")
+
+    def handle(self, *args, **options):
+        ctx = multiprocessing.get_context("spawn")
+        worker_args = (options["queues"], options["poll_interval"], options["batch"], options["burst"])
+        stopping = False
+
+        def start():
+            proc = ctx.Process(target=_worker_process, args=worker_args, daemon=False)
+            proc.start()
+            return proc
+
+        def stop(*_):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        procs = [start() for _ in range(options["processes"])]
+        self.stdout.write(
+            f"Started {len(procs)} worker(s) on queues {', '.join(options['queues'])}: "
+            f"{', '.join(str(p.pid) for p in procs)}"
+        )
+
+        while not stopping and any(p.is_alive() for p in procs):
+            time.sleep(1)
+            if options["burst"]:
+                continue
+            # Replace workers that crashed; a worker only exits on its own after a signal.
+            for i, proc in enumerate(procs):
+                if not proc.is_alive() and not stopping:
+                    self.stderr.write(f"Worker {proc.pid} exited with {proc.exitcode}; restarting")
+                    procs[i] = start()
+
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()     # SIGTERM: finish the current job, then exit
+        for proc in procs:
+            proc.join()
+        self.stdout.write("Workers stopped")
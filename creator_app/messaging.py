@@ -0,0 +1,103 @@
+"""
+Message writes that keep per-conversation sequence numbers.
+
+Every insert or state change in a conversation bumps `Conversation.last_seq`
+and stamps the touched messages with the new value, in one transaction. The
+row lock on the conversation orders concurrent writers, so `seq` only ever
+grows. A client that remembers the highest seq it has seen per conversation
+can ask for `seq > since` (GET /message/sync) and gets exactly what changed.
+
+Write messages through these helpers. Rows written any other way keep
+seq 0, and syncs never return them.
+
+Group conversations keep read state per member as watermarks on the same
+seq (ConversationParticipant.delivered_seq / read_seq). Their messages are
+never rewritten for receipts, so in a group every message keeps its own seq.
+"""
+import os
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from creator_app.models import Conversation, ConversationParticipant, Message
+
+GROUP_MAX_MEMBERS = int(os.getenv("GROUP_MAX_MEMBERS", 500))
+# Watermark value meaning "everything so far"; clamped to the conversation's last_seq.
+LATEST = 2 ** 63 - 1
+
+
+class GroupFull(Exception):
+    pass
+
+
+def next_seq(conversation_id):
+    """Reserve the conversation's next seq; call inside transaction.atomic()."""
+    Conversation.objects.filter(id=conversation_id).update(last_seq=F("last_seq") + 1)
+    return Conversation.objects.filter(id=conversation_id).values_list("last_seq", flat=True).get()
+
+
+def create_message(conversation, **fields):
+    with transaction.atomic():
+        return Message.objects.create(conversation=conversation, seq=next_seq(conversation.id), **fields)
+
+
+def mark_seen(conversation_id, user_id):
+    """Mark the other side's messages seen; one seq covers the whole batch of receipts."""
+    if Conversation.objects.filter(id=conversation_id, is_group=True).exists():
+        return advance_watermarks(conversation_id, user_id, read_seq=LATEST)
+    unseen = Message.objects.filter(conversation_id=conversation_id, is_seen=False).exclude(sender_id=user_id)
+    if not unseen.exists():
+        return 0
+    with transaction.atomic():
+        seq = next_seq(conversation_id)
+        return unseen.update(is_seen=True, seen_at=timezone.now(), seq=seq)
+
+
+# ================================
+# GROUPS
+# ================================
+def create_group(owner_id, title, member_ids):
+    member_ids = set(member_ids) - {owner_id}
+    if len(member_ids) + 1 > GROUP_MAX_MEMBERS:
+        raise GroupFull
+    with transaction.atomic():
+        group = Conversation.objects.create(is_group=True, title=title)
+        ConversationParticipant.objects.bulk_create(
+            [ConversationParticipant(conversation=group, user_id=owner_id, role=ConversationParticipant.OWNER)]
+            + [ConversationParticipant(conversation=group, user_id=user_id) for user_id in sorted(member_ids)]
+        )
+    return group
+
+
+def add_members(conversation_id, user_ids):
+    """Add members (existing ones are skipped); they start caught up, with no backlog of unread."""
+    with transaction.atomic():
+        last_seq = Conversation.objects.select_for_update().values_list("last_seq", flat=True).get(id=conversation_id)
+        members = ConversationParticipant.objects.filter(conversation_id=conversation_id)
+        new_ids = set(user_ids) - set(members.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+        if members.count() + len(new_ids) > GROUP_MAX_MEMBERS:
+            raise GroupFull
+        ConversationParticipant.objects.bulk_create([
+            ConversationParticipant(
+                conversation_id=conversation_id, user_id=user_id, delivered_seq=last_seq, read_seq=last_seq,
+            )
+            for user_id in sorted(new_ids)
+        ])
+    return len(new_ids)
+
+
+def advance_watermarks(conversation_id, user_id, delivered_seq=0, read_seq=0):
+    """
+    Move a member's watermarks forward, never back and never past the
+    conversation's last_seq. Reading implies delivery. Returns rows updated
+    (0 if the user is not a member).
+    """
+    last_seq = Conversation.objects.values_list("last_seq", flat=True).get(id=conversation_id)
+    read_seq = min(read_seq, last_seq)
+    delivered_seq = max(min(delivered_seq, last_seq), read_seq)
+    return ConversationParticipant.objects.filter(conversation_id=conversation_id, user_id=user_id).update(
+        delivered_seq=Greatest(F("delivered_seq"), delivered_seq),
+        read_seq=Greatest(F("read_seq"), read_seq),
+    )
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0005_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collaboratorprofile',
+            index=models.Index(fields=['skill_category', 'pricing_amount'], name='collab_skill_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collaboratorprofile',
+            index=models.Index(fields=['pricing_amount'], name='collab_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collaboratorprofile',
+            index=models.Index(fields=['experience'], name='collab_experience_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collaboratorprofile',
+            index=models.Index(fields=['availability'], name='collab_availability_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['primary_niche', 'followers'], name='creator_niche_followers_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['creator_type', 'followers'], name='creator_type_followers_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['experience_level'], name='creator_experience_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['collaboration_type'], name='creator_collab_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofile',
+            index=models.Index(fields=['followers'], name='creator_followers_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0006_profile_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at'], name='message_convo_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userdata',
+            index=models.Index(fields=['last_active'], name='userdata_last_active_idx'),
+        ),
+    ]
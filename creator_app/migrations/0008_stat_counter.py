@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0007_message_activity_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=64)),
+                ('key', models.CharField(max_length=191)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'stat_counters',
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='stat_counter_metric_key_uniq')],
+            },
+        ),
+    ]
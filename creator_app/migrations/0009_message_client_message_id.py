@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0008_stat_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='client_message_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='message',
+            constraint=models.UniqueConstraint(fields=('sender', 'client_message_id'), name='message_sender_client_id_uniq'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:47
+
+from django.db import migrations, models
+
+
+BACKFILL_BATCH = 1000
+
+
+def number_existing_messages(apps, schema_editor):
+    # Existing history is numbered 1, 2, ... per conversation in send order,
+    # so a client syncing from 0 pages through it like any other backlog.
+    Conversation = apps.get_model('creator_app', 'Conversation')
+    Message = apps.get_model('creator_app', 'Message')
+    last_seq = {}
+    batch = []
+    rows = Message.objects.order_by('conversation_id', 'created_at', 'id').values_list('id', 'conversation_id')
+    for message_id, conversation_id in rows.iterator(chunk_size=BACKFILL_BATCH):
+        last_seq[conversation_id] = last_seq.get(conversation_id, 0) + 1
+        batch.append(Message(id=message_id, seq=last_seq[conversation_id]))
+        if len(batch) == BACKFILL_BATCH:
+            Message.objects.bulk_update(batch, ['seq'])
+            batch = []
+    Message.objects.bulk_update(batch, ['seq'])
+    Conversation.objects.bulk_update(
+        [Conversation(id=conversation_id, last_seq=seq) for conversation_id, seq in last_seq.items()],
+        ['last_seq'], batch_size=BACKFILL_BATCH,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0009_message_client_message_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'seq'], name='message_convo_seq_idx'),
+        ),
+        migrations.RunPython(number_existing_messages, migrations.RunPython.noop),
+    ]
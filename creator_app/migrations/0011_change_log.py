@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0010_message_seq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('op', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], default='upsert', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'change_log',
+                'indexes': [models.Index(fields=['entity', 'object_id', 'id'], name='change_log_entity_object_idx'), models.Index(fields=['created_at'], name='change_log_created_idx')],
+            },
+        ),
+    ]
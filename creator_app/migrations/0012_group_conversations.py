@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0011_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='is_group',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='title',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='conversation',
+            name='user1',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='convo_user1', to='creator_app.userdata'),
+        ),
+        migrations.AlterField(
+            model_name='conversation',
+            name='user2',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='convo_user2', to='creator_app.userdata'),
+        ),
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('owner', 'Owner'), ('member', 'Member')], default='member', max_length=10)),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_seq', models.PositiveBigIntegerField(default=0)),
+                ('read_seq', models.PositiveBigIntegerField(default=0)),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='creator_app.conversation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_memberships', to='creator_app.userdata')),
+            ],
+            options={
+                'db_table': 'conversation_participants',
+                'indexes': [models.Index(fields=['user', 'conversation'], name='participant_user_convo_idx')],
+                'constraints': [models.UniqueConstraint(fields=('conversation', 'user'), name='participant_conversation_user_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0012_group_conversations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
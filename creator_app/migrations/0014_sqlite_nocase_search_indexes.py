@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# SQLite runs the search routes' __iexact filters as LIKE, and LIKE can only
+# use an index declared COLLATE NOCASE. MySQL's default collation is already
+# case-insensitive, so the model indexes serve these filters there.
+NOCASE_INDEXES = [
+    ('creator_niche_followers_nocase', 'creator_app_creatorprofile', 'primary_niche COLLATE NOCASE, followers'),
+    ('creator_type_followers_nocase', 'creator_app_creatorprofile', 'creator_type COLLATE NOCASE, followers'),
+    ('creator_experience_nocase', 'creator_app_creatorprofile', 'experience_level COLLATE NOCASE'),
+    ('creator_collab_type_nocase', 'creator_app_creatorprofile', 'collaboration_type COLLATE NOCASE'),
+    ('collab_skill_price_nocase', 'creator_app_collaboratorprofile', 'skill_category COLLATE NOCASE, pricing_amount'),
+    ('collab_experience_nocase', 'creator_app_collaboratorprofile', 'experience COLLATE NOCASE'),
+    ('collab_availability_nocase', 'creator_app_collaboratorprofile', 'availability COLLATE NOCASE'),
+]
+
+
+def create_nocase_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name, table, columns in NOCASE_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({columns})')
+
+
+def drop_nocase_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name, _, _ in NOCASE_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0013_job_result'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_nocase_indexes, drop_nocase_indexes),
+    ]
@@ -32,6 +32,17 @@ class CreatorProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Equality filters of /creator/search, paired with the followers range.
+        # icontains filters can't use a B-tree index and aren't covered.
+        indexes = [
+            models.Index(fields=["primary_niche", "followers"], name="creator_niche_followers_idx"),
+            models.Index(fields=["creator_type", "followers"], name="creator_type_followers_idx"),
+            models.Index(fields=["experience_level"], name="creator_experience_idx"),
+            models.Index(fields=["collaboration_type"], name="creator_collab_type_idx"),
+            models.Index(fields=["followers"], name="creator_followers_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.email} - Creator Profile"
 
@@ -67,6 +78,15 @@ class CollaboratorProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Equality filters of /collaborator/search, paired with the price range.
+        indexes = [
+            models.Index(fields=["skill_category", "pricing_amount"], name="collab_skill_price_idx"),
+            models.Index(fields=["pricing_amount"], name="collab_price_idx"),
+            models.Index(fields=["experience"], name="collab_experience_idx"),
+            models.Index(fields=["availability"], name="collab_availability_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.email} - Collaborator Profile"
 
@@ -108,6 +128,12 @@ class UserData(models.Model):
     # NEW — required for accurate typing indicator
     typing_with = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # "Online now" checks and activity stats.
+            models.Index(fields=["last_active"], name="userdata_last_active_idx"),
+        ]
+
     def set_password(self, raw_password):
         self.password = make_password(raw_password)
         self.save()
@@ -124,17 +150,61 @@ class UserData(models.Model):
 # ============================================================
 
 class Conversation(models.Model):
-    user1 = models.ForeignKey("creator_app.UserData", on_delete=models.CASCADE, related_name="convo_user1")
-    user2 = models.ForeignKey("creator_app.UserData", on_delete=models.CASCADE, related_name="convo_user2")
+    # Direct chats name both users here; group chats leave them empty and
+    # list their members in ConversationParticipant.
+    user1 = models.ForeignKey(
+        "creator_app.UserData", on_delete=models.CASCADE, related_name="convo_user1", null=True, blank=True,
+    )
+    user2 = models.ForeignKey(
+        "creator_app.UserData", on_delete=models.CASCADE, related_name="convo_user2", null=True, blank=True,
+    )
+    is_group = models.BooleanField(default=False)
+    title = models.CharField(max_length=255, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last sequence number handed out to this conversation's messages (creator_app/messaging.py).
+    last_seq = models.PositiveBigIntegerField(default=0)
 
     class Meta:
         unique_together = ('user1', 'user2')
 
     def __str__(self):
+        if self.is_group:
+            return f"Group {self.title or self.id}"
         return f"Conversation between {self.user1.email} and {self.user2.email}"
 
 
+class ConversationParticipant(models.Model):
+    """
+    A member of a group conversation. Per-member delivery and read state are
+    watermarks on the conversation's seq, not per-message rows: a send writes
+    one Message whatever the group size, and "read up to here" is one UPDATE.
+    """
+    OWNER = "owner"
+    MEMBER = "member"
+    ROLE_CHOICES = [(OWNER, "Owner"), (MEMBER, "Member")]
+
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="participants")
+    user = models.ForeignKey("creator_app.UserData", on_delete=models.CASCADE, related_name="group_memberships")
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default=MEMBER)
+    joined_at = models.DateTimeField(auto_now_add=True)
+    # Highest seq the member's devices have received / the member has read.
+    delivered_seq = models.PositiveBigIntegerField(default=0)
+    read_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = "conversation_participants"
+        constraints = [
+            models.UniqueConstraint(fields=["conversation", "user"], name="participant_conversation_user_uniq"),
+        ]
+        indexes = [
+            # A user's groups (sync, group list) without touching the members of each.
+            models.Index(fields=["user", "conversation"], name="participant_user_convo_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.conversation_id}"
+
+
 class Message(models.Model):
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey("creator_app.UserData", on_delete=models.CASCADE)
@@ -162,11 +232,129 @@ class Message(models.Model):
     message_type = models.CharField(max_length=20, default="text")
     seen_at = models.DateTimeField(null=True, blank=True)
 
+    # Idempotency key from the client (Idempotency-Key header or form field);
+    # a retried send finds the message it already created.
+    client_message_id = models.CharField(max_length=64, null=True, blank=True)
+
+    # Conversation sequence number of the last insert or state change; moves on
+    # every change so clients can sync with `seq > since`.
+    seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # A conversation's messages in order, and its latest message, without a sort.
+            models.Index(fields=["conversation", "created_at"], name="message_convo_created_idx"),
+            models.Index(fields=["conversation", "seq"], name="message_convo_seq_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["sender", "client_message_id"], name="message_sender_client_id_uniq"),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.email} at {self.created_at}"
 
 
+# ============================================================
+# BACKGROUND JOBS (see creator_app/jobs.py)
+# ============================================================
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+
+    queue = models.CharField(max_length=50, default="default")
+    priority = models.SmallIntegerField(default=0)   # higher runs first
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    last_error = models.TextField(blank=True, null=True)
+    # The task's return value, for callers that poll the job (e.g. imports).
+    result = models.JSONField(null=True, blank=True)
+
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "jobs"
+        indexes = [
+            # Claim query: status + queue equality, then priority / run_at ordering.
+            models.Index(fields=["status", "queue", "-priority", "run_at"], name="jobs_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} [{self.status}]"
+
+
+# ============================================================
+# STATISTICS ROLLUPS
+# ============================================================
+
+class StatCounter(models.Model):
+    """
+    One precomputed count, e.g. ("creators_by_niche", "fashion") -> 412.
+
+    Kept current by creator_app/stats.py from the write routes and corrected
+    nightly by a full recount.
+    """
+    metric = models.CharField(max_length=64)
+    # 191 chars keeps the unique index within InnoDB's utf8mb4 key limit.
+    key = models.CharField(max_length=191)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "stat_counters"
+        constraints = [
+            models.UniqueConstraint(fields=["metric", "key"], name="stat_counter_metric_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.key}] = {self.value}"
+
+
+# ============================================================
+# CHANGE LOG
+# ============================================================
+
+class ChangeLog(models.Model):
+    """
+    Append-only record of profile writes, read by consumers as a feed
+    (GET /changes?after=<id>). Written in the same transaction as the change
+    by creator_app/change_log.py; the id is the cursor.
+    """
+    UPSERT = "upsert"
+    DELETE = "delete"
+    OP_CHOICES = [(UPSERT, "Upsert"), (DELETE, "Delete")]
+
+    id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=20)      # "user", "creator", "collaborator"
+    object_id = models.BigIntegerField()          # the user id for all three
+    op = models.CharField(max_length=10, choices=OP_CHOICES, default=UPSERT)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "change_log"
+        indexes = [
+            # Compaction: is there a newer entry for the same row?
+            models.Index(fields=["entity", "object_id", "id"], name="change_log_entity_object_idx"),
+            models.Index(fields=["created_at"], name="change_log_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.op} {self.entity}:{self.object_id}"
+
+
 # ============================================================
 # TEST MODEL
 # ============================================================
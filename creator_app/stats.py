@@ -0,0 +1,251 @@
+"""
+Marketplace statistics kept as rollups in the `stat_counters` table.
+
+Write routes report what a change does to the counts:
+
+    old = stats.creator_keys(row_before)     # [] for a new profile
+    new = stats.creator_keys(row_after)      # [] for a deleted profile
+    stats.track(old, new)
+
+Deltas build up in an in-process buffer. The API flushes it every
+STATS_FLUSH_INTERVAL seconds with one `value = value + delta` UPDATE per
+touched key, so a burst of messages costs one write, not one per message.
+Dashboard reads (`GET /stats/*`) only ever read the rollup rows.
+
+Bulk imports report their deltas the same way. Deltas lost in a crash,
+writes that skip both (admin, raw SQL) and racing edits leave drift.
+reconcile() recounts everything from the source tables on the primary and
+fixes the rows. The `reconcile_stats` task runs it nightly.
+"""
+import asyncio
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, time as dt_time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from creator_app.models import CollaboratorProfile, CreatorProfile, Message, StatCounter
+
+logger = logging.getLogger(__name__)
+
+STATS_FLUSH_INTERVAL = float(os.getenv("STATS_FLUSH_INTERVAL", 5))
+# Hour (UTC) of the nightly recount.
+STATS_RECONCILE_HOUR = int(os.getenv("STATS_RECONCILE_HOUR", 3))
+
+# Upper bounds of the collaborator price buckets; the last bucket is open-ended.
+PRICE_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+TOTAL = "all"
+CREATOR_FIELDS = ("primary_niche", "platforms", "creator_type")
+COLLABORATOR_FIELDS = ("skill_category", "language", "pricing_amount")
+
+
+# ================================
+# KEYS
+# ================================
+def _normalize(value):
+    value = (value or "").strip().lower()
+    return value[:191] or None
+
+
+def _split(value):
+    # platforms / languages are stored comma-separated.
+    return {part for part in map(_normalize, (value or "").split(",")) if part}
+
+
+def price_bucket(amount):
+    if amount is None:
+        return None
+    lower = 0
+    for upper in PRICE_BUCKETS:
+        if amount < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+def creator_keys(row):
+    """(metric, key) pairs one creator profile counts towards; `row` maps CREATOR_FIELDS."""
+    if row is None:
+        return []
+    keys = [("creators", TOTAL)]
+    if niche := _normalize(row["primary_niche"]):
+        keys.append(("creators_by_niche", niche))
+    if creator_type := _normalize(row["creator_type"]):
+        keys.append(("creators_by_type", creator_type))
+    keys += [("creators_by_platform", platform) for platform in sorted(_split(row["platforms"]))]
+    return keys
+
+
+def collaborator_keys(row):
+    """(metric, key) pairs one collaborator profile counts towards; `row` maps COLLABORATOR_FIELDS."""
+    if row is None:
+        return []
+    keys = [("collaborators", TOTAL)]
+    if skill := _normalize(row["skill_category"]):
+        keys.append(("collaborators_by_skill", skill))
+    keys += [("collaborators_by_language", language) for language in sorted(_split(row["language"]))]
+    if bucket := price_bucket(row["pricing_amount"]):
+        keys.append(("collaborators_by_price", bucket))
+    return keys
+
+
+def message_keys(created_at):
+    return [("messages", TOTAL), ("messages_per_day", created_at.date().isoformat())]
+
+
+def stat_row(obj, fields):
+    return {name: getattr(obj, name) for name in fields}
+
+
+# ================================
+# BUFFERED DELTAS
+# ================================
+class StatBuffer:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas = Counter()
+
+    def add(self, deltas):
+        with self._lock:
+            self._deltas.update(deltas)
+
+    def take(self):
+        with self._lock:
+            deltas, self._deltas = self._deltas, Counter()
+        return {key: delta for key, delta in deltas.items() if delta}
+
+
+buffer = StatBuffer()
+
+
+def track(old_keys, new_keys):
+    """Record a change from `old_keys` to `new_keys`; unchanged keys cancel out."""
+    deltas = Counter(new_keys)
+    deltas.subtract(Counter(old_keys))
+    buffer.add(deltas)
+
+
+def apply_deltas(deltas):
+    now = timezone.now()
+    for (metric, key), delta in deltas.items():
+        counter = StatCounter.objects.filter(metric=metric, key=key)
+        if counter.update(value=F("value") + delta, updated_at=now):
+            continue
+        try:
+            with transaction.atomic():
+                StatCounter.objects.create(metric=metric, key=key, value=delta)
+        except IntegrityError:
+            # Another process created it first.
+            counter.update(value=F("value") + delta, updated_at=now)
+
+
+def flush():
+    deltas = buffer.take()
+    if not deltas:
+        return 0
+    try:
+        apply_deltas(deltas)
+    except Exception:
+        # Keep them for the next flush rather than dropping counts.
+        buffer.add(deltas)
+        raise
+    return len(deltas)
+
+
+async def flush_periodically(interval=STATS_FLUSH_INTERVAL):
+    """Lifespan task: flush the buffer until cancelled, then once more."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await sync_to_async(flush)()
+            except Exception:
+                logger.exception("Flushing stat deltas failed")
+    finally:
+        await sync_to_async(flush)()
+
+
+# ================================
+# READS
+# ================================
+async def read_metrics(*metrics, since=None):
+    """
+    {metric: {key: value}} straight from the rollup rows. `since` keeps only
+    keys >= it, e.g. ISO dates for messages_per_day.
+    """
+    rows = StatCounter.objects.filter(metric__in=metrics)
+    if since is not None:
+        rows = rows.filter(key__gte=since)
+    result = {metric: {} for metric in metrics}
+    async for metric, key, value in rows.values_list("metric", "key", "value"):
+        result[metric][key] = value
+    return result
+
+
+# ================================
+# RECONCILIATION
+# ================================
+def recount():
+    counts = Counter()
+    for row in CreatorProfile.objects.values(*CREATOR_FIELDS).iterator(chunk_size=2000):
+        counts.update(creator_keys(row))
+    for row in CollaboratorProfile.objects.values(*COLLABORATOR_FIELDS).iterator(chunk_size=2000):
+        counts.update(collaborator_keys(row))
+    per_day = Message.objects.annotate(day=TruncDate("created_at")).values("day").annotate(n=Count("id")).order_by()
+    for row in per_day:
+        counts[("messages_per_day", row["day"].isoformat())] += row["n"]
+        counts[("messages", TOTAL)] += row["n"]
+    return counts
+
+
+def reconcile():
+    """
+    Recount from the source tables and correct the rollups; returns rows changed.
+
+    The rollups are locked first and the recount runs on the primary in the
+    same transaction, so flushes wait and then land on top of the new counts.
+    A replica could lag behind the primary and turn its rollups back. Other
+    processes' unflushed deltas for rows the recount already saw are still
+    added when they flush: up to STATS_FLUSH_INTERVAL of writes, fixed by the
+    next run.
+    """
+    flush()
+
+    changed = 0
+    with transaction.atomic():
+        existing = {
+            (metric, key): (pk, value)
+            for pk, metric, key, value in StatCounter.objects.select_for_update().values_list("id", "metric", "key", "value")
+        }
+        counts = recount()
+        stale = [pk for key, (pk, _) in existing.items() if key not in counts]
+        if stale:
+            StatCounter.objects.filter(id__in=stale).delete()
+        changed += len(stale)
+
+        missing = [StatCounter(metric=m, key=k, value=v) for (m, k), v in counts.items() if (m, k) not in existing]
+        StatCounter.objects.bulk_create(missing, batch_size=500)
+        changed += len(missing)
+
+        now = timezone.now()
+        for key, value in counts.items():
+            if key in existing and existing[key][1] != value:
+                StatCounter.objects.filter(id=existing[key][0]).update(value=value, updated_at=now)
+                changed += 1
+    if changed:
+        logger.info("Stats reconciliation corrected %d rollup rows", changed)
+    return changed
+
+
+def next_reconcile_at(now=None):
+    now = now or timezone.now()
+    run_at = datetime.combine(now.date(), dt_time(STATS_RECONCILE_HOUR), tzinfo=now.tzinfo)
+    return run_at if run_at > now else run_at + timedelta(days=1)
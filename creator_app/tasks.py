@@ -0,0 +1,73 @@
+"""Background tasks run by `manage.py runworker` (see creator_app/jobs.py)."""
+import os
+
+from django.core.mail import send_mail
+
+from creator_app import bulk_import, change_log, jobs, messaging, stats
+from creator_app.jobs import heartbeat, task
+from creator_app.models import Job
+
+
+@task(priority=10, max_attempts=5)
+def send_email(subject, message, recipient_list, from_email=None):
+    send_mail(subject=subject, message=message, from_email=from_email, recipient_list=recipient_list)
+
+
+@task(max_attempts=3)
+def mark_seen(conversation_id, user_id):
+    messaging.mark_seen(conversation_id, user_id)
+
+
+# One attempt: the upload is consumed either way, and a rerun in insert mode
+# would only report every row it already wrote as a duplicate.
+@task(max_attempts=1)
+def import_profiles(upload_path, fmt, mode, report_path):
+    """Bulk import from a spooled upload; the counts become the job's result."""
+    try:
+        with open(upload_path, "rb") as f:
+            result = bulk_import.import_profiles(f, fmt, report_path=report_path, mode=mode, on_chunk=heartbeat)
+    finally:
+        os.remove(upload_path)
+    return result.as_dict()
+
+
+@task(max_attempts=3)
+def reconcile_stats(reschedule=True):
+    stats.reconcile()
+    if reschedule:
+        schedule_reconcile_stats()
+
+
+def schedule_reconcile_stats():
+    """Queue the next nightly recount unless one is already waiting."""
+    pending = Job.objects.filter(task=reconcile_stats.name, status=Job.QUEUED)
+    if not pending.exists():
+        reconcile_stats.enqueue(run_at=stats.next_reconcile_at())
+
+
+@task(max_attempts=3)
+def compact_changes(reschedule=True):
+    change_log.compact()
+    if reschedule:
+        schedule_compact_changes()
+
+
+def schedule_compact_changes():
+    """Queue the next nightly change-log compaction unless one is already waiting."""
+    pending = Job.objects.filter(task=compact_changes.name, status=Job.QUEUED)
+    if not pending.exists():
+        compact_changes.enqueue(run_at=change_log.next_compact_at())
+
+
+@task(max_attempts=3)
+def purge_jobs(reschedule=True):
+    jobs.purge_finished()
+    if reschedule:
+        schedule_purge_jobs()
+
+
+def schedule_purge_jobs():
+    """Queue the next nightly purge of finished jobs unless one is already waiting."""
+    pending = Job.objects.filter(task=purge_jobs.name, status=Job.QUEUED)
+    if not pending.exists():
+        purge_jobs.enqueue(run_at=jobs.next_purge_at())
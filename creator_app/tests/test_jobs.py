@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from creator_app import jobs
+from creator_app.jobs import task
+from creator_app.models import Job
+from creator_app.tasks import purge_jobs, schedule_purge_jobs
+
+calls = []
+
+
+@task(name="tests.record", max_attempts=2)
+def record(value):
+    calls.append(value)
+    return {"value": value}
+
+
+@task(name="tests.fail", max_attempts=2)
+def fail():
+    raise RuntimeError("boom")
+
+
+@task(name="tests.requeued")
+def requeued():
+    # Taken for a dead worker's and picked up by another one mid-run.
+    jobs.requeue_stale(timeout=0)
+    jobs.claim("other-worker")
+
+
+class JobTests(TransactionTestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def run_worker(self):
+        return jobs.Worker(poll_interval=0, name="test-worker").run(burst=True)
+
+    def test_worker_runs_jobs_in_priority_order(self):
+        record.enqueue(value="low")
+        record.enqueue(value="high", priority=5)
+        record.enqueue(value="later", delay=3600)
+
+        self.assertEqual(self.run_worker(), 2)
+        self.assertEqual(calls, ["high", "low"])
+        done = Job.objects.get(payload__value="high")
+        self.assertEqual((done.status, done.result, done.locked_by), (Job.DONE, {"value": "high"}, None))
+        self.assertEqual(Job.objects.get(payload__value="later").status, Job.QUEUED)
+
+    def test_a_job_is_claimed_once(self):
+        record.enqueue(value="x")
+        self.assertEqual(len(jobs.claim("a")), 1)
+        self.assertEqual(jobs.claim("b"), [])
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = fail.enqueue()
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=jobs.JOB_RETRY_BASE - 1))
+        self.assertIn("RuntimeError: boom", job.last_error)
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.FAILED, 2, None))
+
+    def test_unknown_task_fails(self):
+        job = jobs.enqueue("tests.missing", max_attempts=1)
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("LookupError", job.last_error)
+
+    def test_stale_jobs_are_requeued_unless_on_their_last_attempt(self):
+        retried = record.enqueue(value="x")
+        lost = record.enqueue(value="y", max_attempts=1)
+        jobs.claim("dead-worker", limit=2)
+        later = timezone.now() + timedelta(seconds=jobs.JOB_LOCK_TIMEOUT + 1)
+        with mock.patch.object(jobs.timezone, "now", return_value=later):
+            jobs.requeue_stale()
+        retried.refresh_from_db()
+        lost.refresh_from_db()
+        self.assertEqual((retried.status, retried.locked_by), (Job.QUEUED, None))
+        self.assertEqual(lost.status, Job.FAILED)
+
+    def test_heartbeat_renews_the_lock(self):
+        record.enqueue(value="x")
+        job = jobs.claim("test-worker")[0]
+        token = jobs._current_job.set(job)
+        self.addCleanup(jobs._current_job.reset, token)
+        later = timezone.now() + timedelta(seconds=60)
+        with mock.patch.object(jobs.timezone, "now", return_value=later):
+            jobs.heartbeat()
+        job.refresh_from_db()
+        self.assertEqual(job.locked_at, later)
+
+    def test_outcome_of_a_requeued_job_is_dropped(self):
+        job = requeued.enqueue()
+        claimed = jobs.claim("test-worker")[0]
+        self.assertFalse(jobs.run_job(claimed))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.RUNNING, "other-worker"))
+
+    def test_finished_jobs_are_purged_after_retention(self):
+        kept = record.enqueue(value="queued")
+        for status in (Job.DONE, Job.FAILED, Job.DONE):
+            Job.objects.create(task="tests.record", status=status)
+        old = timezone.now() - timedelta(days=jobs.JOB_RETENTION_DAYS + 1)
+        recent = Job.objects.create(task="tests.record", status=Job.DONE)
+        Job.objects.exclude(id__in=[kept.id, recent.id]).update(updated_at=old)
+        Job.objects.filter(id=kept.id).update(updated_at=old)
+
+        with mock.patch.object(jobs, "PURGE_BATCH", 2):
+            self.assertEqual(jobs.purge_finished(), 3)
+        self.assertEqual(set(Job.objects.values_list("id", flat=True)), {kept.id, recent.id})
+
+    def test_purge_task_reschedules_itself(self):
+        schedule_purge_jobs()
+        schedule_purge_jobs()
+        job = Job.objects.get(task=purge_jobs.name)
+        self.assertEqual((job.run_at.hour, job.run_at > timezone.now()), (jobs.JOB_PURGE_HOUR, True))
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        self.run_worker()
+        self.assertEqual(Job.objects.get(id=job.id).status, Job.DONE)
+        self.assertEqual(Job.objects.filter(task=purge_jobs.name, status=Job.QUEUED).count(), 1)
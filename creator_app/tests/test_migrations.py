@@ -0,0 +1,33 @@
+import importlib
+from datetime import timedelta
+
+from django.apps import apps
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from creator_app.models import Conversation, Message, UserData
+
+message_seq = importlib.import_module("creator_app.migrations.0010_message_seq")
+
+
+class MessageSeqBackfillTests(TransactionTestCase):
+
+    def test_history_is_numbered_per_conversation_in_send_order(self):
+        me = UserData.objects.create(email="me@example.com")
+        other = UserData.objects.create(email="other@example.com")
+        a = Conversation.objects.create(user1=me, user2=other)
+        b = Conversation.objects.create(user1=other, user2=me)
+        empty = Conversation.objects.create(user1=me, user2=me)
+
+        now = timezone.now()
+        # Rows written before the migration carry seq 0; ids do not follow send order.
+        for conversation, content, minutes in ((a, "a1", 2), (b, "b0", 0), (a, "a0", 1), (a, "a2", 3)):
+            msg = Message.objects.create(conversation=conversation, sender=me, content=content)
+            Message.objects.filter(id=msg.id).update(created_at=now + timedelta(minutes=minutes))
+
+        message_seq.number_existing_messages(apps, None)
+
+        seqs = dict(Message.objects.values_list("content", "seq"))
+        self.assertEqual(seqs, {"a0": 1, "a1": 2, "a2": 3, "b0": 1})
+        last_seq = dict(Conversation.objects.values_list("id", "last_seq"))
+        self.assertEqual(last_seq, {a.id: 3, b.id: 1, empty.id: 0})
@@ -0,0 +1,89 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from creator_app import stats
+from creator_app.models import CollaboratorProfile, Conversation, CreatorProfile, Message, StatCounter, UserData
+
+CREATOR = {"primary_niche": "Fashion", "platforms": "instagram, YouTube", "creator_type": "Influencer"}
+
+
+class StatsTests(TransactionTestCase):
+
+    def setUp(self):
+        stats.buffer.take()
+        self.addCleanup(stats.buffer.take)
+
+    def counters(self):
+        return {(metric, key): value for metric, key, value in StatCounter.objects.values_list("metric", "key", "value")}
+
+    def create_creator(self, email, **fields):
+        user = UserData.objects.create(email=email, role="creator")
+        return CreatorProfile.objects.create(
+            user=user, creator_name="Creator", experience_level="Mid", portfolio_category="Photo",
+            collaboration_type="Paid", project_type="Campaign", **{**CREATOR, **fields},
+        )
+
+    def test_unchanged_keys_cancel_out(self):
+        stats.track(stats.creator_keys(CREATOR), stats.creator_keys(CREATOR))
+        self.assertEqual(stats.buffer.take(), {})
+
+        stats.track(stats.creator_keys(CREATOR), stats.creator_keys({**CREATOR, "primary_niche": "travel"}))
+        self.assertEqual(stats.buffer.take(), {("creators_by_niche", "fashion"): -1, ("creators_by_niche", "travel"): 1})
+
+    def test_keys_are_normalized(self):
+        self.assertEqual(stats.creator_keys(CREATOR), [
+            ("creators", stats.TOTAL), ("creators_by_niche", "fashion"), ("creators_by_type", "influencer"),
+            ("creators_by_platform", "instagram"), ("creators_by_platform", "youtube"),
+        ])
+        row = {"skill_category": " Editing ", "language": "", "pricing_amount": Decimal("2500")}
+        self.assertEqual(stats.collaborator_keys(row), [
+            ("collaborators", stats.TOTAL), ("collaborators_by_skill", "editing"), ("collaborators_by_price", "2500-5000"),
+        ])
+
+    def test_flush_applies_deltas_in_place(self):
+        stats.track([], stats.creator_keys(CREATOR))
+        self.assertEqual(stats.flush(), 5)
+        stats.track([], [("creators", stats.TOTAL)])
+        stats.track([("creators_by_niche", "fashion")], [])
+        stats.flush()
+        counters = self.counters()
+        self.assertEqual((counters[("creators", stats.TOTAL)], counters[("creators_by_niche", "fashion")]), (2, 0))
+        self.assertEqual(stats.flush(), 0)
+
+    def test_failed_flush_keeps_the_deltas(self):
+        stats.track([], [("creators", stats.TOTAL)])
+        with mock.patch.object(stats, "apply_deltas", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                stats.flush()
+        # Deltas tracked meanwhile are merged, not lost.
+        stats.track([], [("creators", stats.TOTAL)])
+        stats.flush()
+        self.assertEqual(self.counters(), {("creators", stats.TOTAL): 2})
+
+    def test_reconcile_fixes_drift(self):
+        self.create_creator("a@example.com")
+        self.create_creator("b@example.com", primary_niche="Travel", platforms="")
+        collaborator = UserData.objects.create(email="c@example.com", role="collaborator")
+        CollaboratorProfile.objects.create(
+            user=collaborator, name="Editor", language="English", skill_category="Editing", experience="Senior",
+        )
+        Message.objects.create(
+            conversation=Conversation.objects.create(user1=collaborator, user2=collaborator), sender=collaborator,
+        )
+
+        # Drift: a lost delta, a stale key and a count nothing ever reported.
+        StatCounter.objects.create(metric="creators", key=stats.TOTAL, value=1)
+        StatCounter.objects.create(metric="creators_by_niche", key="gaming", value=3)
+        stats.track([], [("collaborators", stats.TOTAL)])    # unflushed: reconcile flushes first
+
+        changed = stats.reconcile()
+        expected = stats.recount()
+        self.assertEqual(self.counters(), dict(expected))
+        # creators fixed, gaming deleted, collaborators already right after the flush, the rest created.
+        self.assertEqual(changed, 1 + 1 + (len(expected) - 2))
+        self.assertEqual(self.counters()[("creators", stats.TOTAL)], 2)
+        self.assertEqual(self.counters()[("messages", stats.TOTAL)], 1)
+        self.assertNotIn(("creators_by_niche", "gaming"), self.counters())
+        self.assertEqual(stats.reconcile(), 0)
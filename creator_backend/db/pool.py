@@ -0,0 +1,228 @@
+"""
+Bounded, thread-safe pool of DB-API connections for Django backends.
+
+Django keeps one connection per thread and, with CONN_MAX_AGE = 0, opens and
+closes it around every request. PooledDatabaseWrapperMixin turns that open
+and close into a checkout from and return to a process-wide pool. Physical
+connections are then reused across threads, and their total is capped by
+POOL["MAX_SIZE"].
+
+    DATABASES["default"]["POOL"] = {
+        "MAX_SIZE": 20,         # physical connections per process
+        "TIMEOUT": 10,          # seconds to wait for a free connection
+        "MAX_LIFETIME": 1800,   # recycle connections older than this
+        "PING_INTERVAL": 30,    # ping idle connections before reuse after this
+    }
+"""
+import threading
+import time
+from collections import deque
+
+POOL_DEFAULTS = {
+    "MAX_SIZE": 20,
+    "TIMEOUT": 10.0,
+    "MAX_LIFETIME": 1800.0,
+    "PING_INTERVAL": 30.0,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, max_size, timeout, max_lifetime, ping_interval):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()            # (conn, created_at, last_used)
+        self._checked_out = {}          # id(conn) -> created_at
+        self._open = 0
+        self._waiting = 0
+
+        self.created_total = 0
+        self.reused_total = 0
+        self.discarded_total = 0
+        self.timeouts_total = 0
+        self.wait_seconds_total = 0.0
+
+    # ------------------------------
+    # Checkout / return
+    # ------------------------------
+    def acquire(self, connect):
+        """Return a pooled connection, calling `connect()` when a new one is allowed."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                if self._idle:
+                    # LIFO: the most recently used connection is the likeliest to be alive.
+                    entry = self._idle.pop()
+                elif self._open < self.max_size:
+                    self._open += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts_total += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout}s "
+                            f"({self.max_size} in use)"
+                        )
+                    self._waiting += 1
+                    self._cond.wait(remaining)
+                    self._waiting -= 1
+                    continue
+
+            if entry is None:
+                return self._connect(connect, start)
+
+            conn, created_at, last_used = entry
+            if self._usable(conn, created_at, last_used):
+                with self._cond:
+                    self._checked_out[id(conn)] = created_at
+                    self.reused_total += 1
+                    self.wait_seconds_total += time.monotonic() - start
+                return conn
+
+            self._close(conn)
+
+    def release(self, conn, discard: bool = False):
+        now = time.monotonic()
+        with self._cond:
+            created_at = self._checked_out.pop(id(conn), None)
+            if created_at is None:
+                foreign = True
+            else:
+                foreign = False
+                if not discard and now - created_at < self.max_lifetime:
+                    self._idle.append((conn, created_at, now))
+                    self._cond.notify()
+                    return
+
+        if foreign:
+            conn.close()
+        else:
+            self._close(conn)
+
+    def close_idle(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": len(self._checked_out),
+                "waiting": self._waiting,
+                "created_total": self.created_total,
+                "reused_total": self.reused_total,
+                "discarded_total": self.discarded_total,
+                "timeouts_total": self.timeouts_total,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+            }
+
+    # ------------------------------
+    # Internals
+    # ------------------------------
+    def _connect(self, connect, start):
+        try:
+            conn = connect()
+        except BaseException:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._checked_out[id(conn)] = time.monotonic()
+            self.created_total += 1
+            self.wait_seconds_total += time.monotonic() - start
+        return conn
+
+    def _usable(self, conn, created_at, last_used):
+        now = time.monotonic()
+        if now - created_at >= self.max_lifetime:
+            return False
+        if now - last_used < self.ping_interval:
+            return True
+        try:
+            conn.ping()
+            return True
+        except Exception:
+            return False
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._open -= 1
+            self.discarded_total += 1
+            self._cond.notify()
+
+
+# ================================
+# DJANGO BACKEND INTEGRATION
+# ================================
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options=None):
+    with _pools_lock:
+        if alias not in _pools:
+            opts = {**POOL_DEFAULTS, **(options or {})}
+            _pools[alias] = ConnectionPool(
+                max_size=int(opts["MAX_SIZE"]),
+                timeout=float(opts["TIMEOUT"]),
+                max_lifetime=float(opts["MAX_LIFETIME"]),
+                ping_interval=float(opts["PING_INTERVAL"]),
+            )
+        return _pools[alias]
+
+
+def pool_stats():
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def close_pools():
+    for pool in list(_pools.values()):
+        pool.close_idle()
+
+
+class PooledDatabaseWrapperMixin:
+    """Mix in ahead of a backend's DatabaseWrapper to route connect/close through the pool."""
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict.get("POOL"))
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        try:
+            return self.pool.acquire(lambda: connect(conn_params))
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            # A connection that saw errors may be broken; don't hand it to another thread.
+            discard = self.errors_occurred
+            if not discard and (self.in_atomic_block or not self.autocommit):
+                try:
+                    self.connection.rollback()
+                except self.Database.Error:
+                    discard = True
+            self.pool.release(self.connection, discard=discard)
@@ -0,0 +1,150 @@
+"""
+Primary/replica routing for Django.
+
+Every write goes to `default`. Reads go to a `replica*` alias only inside a
+`replica_reads()` scope. The FastAPI read routes open that scope through the
+`read_replica` dependency. Reads stay on the primary:
+- outside such a scope
+- inside a transaction on the primary
+- when no replica is configured
+- when every replica refuses connections; one that does is skipped for
+  REPLICA_RETRY_SECONDS before it is tried again
+
+    DATABASE_ROUTERS = ["creator_backend.db.routers.PrimaryReplicaRouter"]
+    DATABASES["replica"] = {..., "TEST": {"MIRROR": "default"}}
+
+A scope also notes whether anything was written while it was active, so
+callers can start a read-your-writes window for that client (see
+ReadYourWrites).
+"""
+import logging
+import random
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Seconds a client keeps reading from the primary after it writes, to cover replica lag.
+READ_YOUR_WRITES_SECONDS = float(getattr(settings, "READ_YOUR_WRITES_SECONDS", 5))
+# Seconds a replica that refused a connection is left out of rotation.
+REPLICA_RETRY_SECONDS = float(getattr(settings, "REPLICA_RETRY_SECONDS", 30))
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+class RoutingState:
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self, replica=False):
+        self.replica = replica
+        self.wrote = False
+
+
+# sync_to_async copies the context to the ORM thread, so the router sees the
+# same state object the request set up.
+_state = ContextVar("db_routing", default=None)
+
+
+@contextmanager
+def routing_scope(replica=False):
+    state = RoutingState(replica)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def current_state():
+    return _state.get()
+
+
+def replica_reads():
+    return routing_scope(replica=True)
+
+
+class PrimaryReplicaRouter:
+
+    def __init__(self):
+        self.replicas = replica_aliases()
+        self._down_until = {}
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica or not self.replicas:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        for alias in random.sample(self.replicas, len(self.replicas)):
+            if self._available(alias):
+                return alias
+        return DEFAULT_DB_ALIAS
+
+    def _available(self, alias):
+        # Only connection failures are caught here; a replica that dies
+        # mid-query fails that query, and the next read skips it.
+        if self._down_until.get(alias, 0) > time.monotonic():
+            return False
+        try:
+            connections[alias].ensure_connection()
+        except SynchronousOnlyOperation:
+            # Asked while a queryset is built on the event loop (related
+            # managers do); the query is routed again on its DB thread.
+            return True
+        except DatabaseError:
+            logger.warning("Replica %s unavailable; reading from the primary", alias, exc_info=True)
+            self._down_until[alias] = time.monotonic() + REPLICA_RETRY_SECONDS
+            return False
+        self._down_until.pop(alias, None)
+        return True
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in self.replicas
+
+
+class ReadYourWrites:
+    """
+    Per-process record of clients that wrote recently.
+
+    A client that wrote in the last READ_YOUR_WRITES_SECONDS is served from
+    the primary, so it never reads a replica that hasn't caught up with its
+    own write. Bounded LRU, like the in-memory rate limiter.
+    """
+
+    def __init__(self, window: float = READ_YOUR_WRITES_SECONDS, max_keys: int = 100_000):
+        self.window = window
+        self.max_keys = max_keys
+        self._until = OrderedDict()
+
+    def mark(self, key):
+        self._until[key] = time.monotonic() + self.window
+        self._until.move_to_end(key)
+        if len(self._until) > self.max_keys:
+            self._until.popitem(last=False)
+
+    def recent(self, key):
+        until = self._until.get(key)
+        if until is None:
+            return False
+        if until < time.monotonic():
+            del self._until[key]
+            return False
+        return True
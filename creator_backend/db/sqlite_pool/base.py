@@ -0,0 +1,10 @@
+from django.db.backends.sqlite3 import base
+
+from creator_backend.db.pool import PooledDatabaseWrapperMixin
+
+
+# SQLite stand-in for mysql_pool, for exercising the pool without a server.
+# sqlite3 connections have no ping(), so ones idle past PING_INTERVAL are
+# replaced rather than reused.
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
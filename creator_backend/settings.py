@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 import pymysql
 pymysql.install_as_MySQLdb()
@@ -81,18 +82,45 @@ WSGI_APPLICATION = 'creator_backend.wsgi.application'
 #         'NAME': BASE_DIR / 'db.sqlite3',
 #     }
 # }
+# MySQL behind a per-process connection pool (creator_backend/db/pool.py).
+# CONN_MAX_AGE = 0 hands the connection back to the pool at the end of every
+# request instead of closing it; the pool recycles physical connections.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": "creator_backend.db.mysql_pool",
         "NAME": "CCW_project", 
         "USER": "root",
         "PASSWORD": "Welcome#1234",
         "HOST": "127.0.0.1",
         "PORT": "3306",
         "OPTIONS": { "charset": "utf8mb4" },
+        "CONN_MAX_AGE": 0,
+        "POOL": {
+            "MAX_SIZE": 20,
+            "TIMEOUT": 10,
+            "MAX_LIFETIME": 1800,
+            "PING_INTERVAL": 30,
+        },
     }
 }
 
+# Read replicas: DB_REPLICA_HOSTS=host1,host2 adds `replica`, `replica_2`, ...
+# with the primary's credentials. Only read routes that opt in use them, and
+# a client that just wrote stays on the primary for READ_YOUR_WRITES_SECONDS
+# (creator_backend/db/routers.py).
+for _i, _host in enumerate(h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()):
+    DATABASES["replica" if _i == 0 else f"replica_{_i + 1}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["creator_backend.db.routers.PrimaryReplicaRouter"]
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+# A replica that refuses connections is skipped, reads falling back to the
+# primary, for this many seconds before it is tried again.
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", 30))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -129,6 +157,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded media: one root for profile pictures and message attachments,
+# served by the API itself at MEDIA_URL (fastapi_app/routes/media.py).
+MEDIA_URL = '/media/'
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR / "media"))
+
+# With MEDIA_SIGNED_URLS=true, files under MEDIA_PRIVATE_DIRS are only served
+# to URLs signed by the API, valid for MEDIA_URL_TTL to 2 * MEDIA_URL_TTL seconds.
+MEDIA_SIGNED_URLS = os.getenv("MEDIA_SIGNED_URLS", "false").lower() == "true"
+MEDIA_PRIVATE_DIRS = ["message_files/"]
+MEDIA_URL_TTL = int(os.getenv("MEDIA_URL_TTL", 3600))
+
+# Signing key for the API's access and refresh tokens (fastapi_app/security.py).
+# Required outside DEBUG; in DEBUG it falls back to SECRET_KEY.
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
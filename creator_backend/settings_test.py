@@ -0,0 +1,39 @@
+"""
+Settings for the test suite: SQLite files instead of MySQL, no network.
+
+    python manage.py test       # picks these settings up by itself
+    python -m pytest -q         # so does conftest.py
+
+`replica` mirrors `default` like a real read replica would; the router
+tests point it at a second SQLite file when they need the two apart.
+"""
+import os
+import tempfile
+
+from creator_backend.settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+_TEST_DB_DIR = os.getenv("TEST_DB_DIR", tempfile.gettempdir())
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(_TEST_DB_DIR, "ccw.sqlite3"),
+        "OPTIONS": {"timeout": 30},
+        # A file rather than :memory:, so the DB lane threads share the data.
+        "TEST": {"NAME": os.path.join(_TEST_DB_DIR, f"ccw-test-{os.getpid()}.sqlite3")},
+    },
+}
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "NAME": os.path.join(_TEST_DB_DIR, "ccw-replica.sqlite3"),
+    "TEST": {"MIRROR": "default"},
+}
+
+# Hashing strength is not under test; the default hasher costs ~0.3s a call.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+MEDIA_SIGNED_URLS = False
+
+JWT_SECRET_KEY = "test-jwt-secret"
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import threading
+
+from django.db import connections
+from django.test import SimpleTestCase
+
+from creator_backend.db import pool
+from creator_backend.db.sqlite_pool.base import DatabaseWrapper as PooledSQLiteWrapper
+
+
+class FakeConnection:
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def ping(self):
+        if not self.alive:
+            raise OSError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**options):
+    opts = {"max_size": 2, "timeout": 0.05, "max_lifetime": 60, "ping_interval": 60, **options}
+    return pool.ConnectionPool(**opts)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def test_released_connections_are_reused(self):
+        p = make_pool()
+        conn = p.acquire(FakeConnection)
+        p.release(conn)
+        self.assertIs(p.acquire(FakeConnection), conn)
+        self.assertEqual((p.stats()["created_total"], p.stats()["reused_total"]), (1, 1))
+
+    def test_exhausted_pool_times_out(self):
+        p = make_pool()
+        p.acquire(FakeConnection)
+        p.acquire(FakeConnection)
+        with self.assertRaises(pool.PoolTimeout):
+            p.acquire(FakeConnection)
+        self.assertEqual(p.stats()["timeouts_total"], 1)
+
+    def test_waiter_gets_the_released_connection(self):
+        p = make_pool(max_size=1, timeout=5)
+        conn = p.acquire(FakeConnection)
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(p.acquire(FakeConnection)))
+        waiter.start()
+        p.release(conn)
+        waiter.join(5)
+        self.assertEqual(got, [conn])
+
+    def test_discarded_and_expired_connections_are_closed(self):
+        p = make_pool()
+        broken = p.acquire(FakeConnection)
+        p.release(broken, discard=True)
+        self.assertTrue(broken.closed)
+
+        p = make_pool(max_lifetime=0)
+        old = p.acquire(FakeConnection)
+        p.release(old)
+        self.assertTrue(old.closed)
+        self.assertEqual(p.stats()["open"], 0)
+
+    def test_dead_idle_connection_is_replaced(self):
+        p = make_pool(ping_interval=0)
+        dead = p.acquire(lambda: FakeConnection(alive=False))
+        p.release(dead)
+        fresh = p.acquire(FakeConnection)
+        self.assertIsNot(fresh, dead)
+        self.assertTrue(dead.closed)
+        self.assertEqual(p.stats()["discarded_total"], 1)
+
+    def test_failed_connect_frees_its_slot(self):
+        p = make_pool(max_size=1)
+
+        def refuse():
+            raise OSError("refused")
+
+        with self.assertRaises(OSError):
+            p.acquire(refuse)
+        p.acquire(FakeConnection)
+        self.assertEqual(p.stats()["open"], 1)
+
+
+class PooledBackendTests(SimpleTestCase):
+    alias = "pool_test"
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_dict = connections.configure_settings({
+            "default": {},
+            self.alias: {"ENGINE": "creator_backend.db.sqlite_pool", "NAME": os.path.join(tmp.name, "pool.sqlite3")},
+        })[self.alias]
+        self.db = PooledSQLiteWrapper(settings_dict, self.alias)
+        self.addCleanup(self.drop_pool)
+
+    def drop_pool(self):
+        self.db.close()
+        pool.close_pools()
+        pool._pools.pop(self.alias, None)
+
+    def query(self, sql):
+        with self.db.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchall()
+
+    def test_request_cycles_share_one_physical_connection(self):
+        for _ in range(50):
+            self.assertEqual(self.query("SELECT 1"), [(1,)])
+            self.db.close()
+        stats = pool.pool_stats()[self.alias]
+        self.assertEqual((stats["created_total"], stats["reused_total"], stats["idle"]), (1, 49, 1))
+
+    def test_open_transaction_is_rolled_back_on_return(self):
+        self.query("CREATE TABLE t (x INTEGER)")
+        self.db.set_autocommit(False)
+        self.query("INSERT INTO t VALUES (1)")
+        self.db.close()
+        self.assertEqual(self.query("SELECT COUNT(*) FROM t"), [(0,)])
+        self.assertEqual(pool.pool_stats()[self.alias]["created_total"], 1)
+
+    def test_connection_that_saw_errors_is_discarded(self):
+        self.query("SELECT 1")
+        self.db.errors_occurred = True
+        self.db.close()
+        self.query("SELECT 1")
+        stats = pool.pool_stats()[self.alias]
+        self.assertEqual((stats["created_total"], stats["discarded_total"]), (2, 1))
@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connections, router as db_router, transaction
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import ChangeLog, CreatorProfile, UserData
+from creator_backend.db import routers
+from creator_backend.db.routers import replica_reads
+from fastapi_app import db_routing, security
+from fastapi_app.main import app
+from fastapi_app.routes import changes
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """`replica` is a snapshot of the primary taken in setUp, so the two can be told apart."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.router = next(r for r in db_router.routers if isinstance(r, routers.PrimaryReplicaRouter))
+        self.router._down_until.clear()
+        self.addCleanup(self.router._down_until.clear)
+        db_routing.read_your_writes._until.clear()
+        self.addCleanup(db_routing.read_your_writes._until.clear)
+
+        self.user = UserData.objects.create(email="creator@example.com", role="creator")
+        self.profile = CreatorProfile.objects.create(
+            user=self.user, creator_name="Creator", creator_type="Influencer", experience_level="Mid",
+            primary_niche="Fashion", portfolio_category="Photo", collaboration_type="Paid", project_type="Campaign",
+        )
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.use_replica(self.snapshot_primary())
+
+        # The primary moves on; the replica lags behind.
+        CreatorProfile.objects.filter(id=self.profile.id).update(primary_niche="Travel")
+
+    def snapshot_primary(self):
+        path = os.path.join(self.tmp, "replica.sqlite3")
+        primary = connections["default"]
+        primary.ensure_connection()
+        target = sqlite3.connect(path)
+        primary.connection.backup(target)
+        target.close()
+        return path
+
+    def use_replica(self, name):
+        # The settings dict is shared by every thread's `replica` connection.
+        replica = connections["replica"]
+        original = replica.settings_dict["NAME"]
+        replica.close()
+        replica.settings_dict["NAME"] = name
+
+        def restore():
+            replica.close()
+            replica.settings_dict["NAME"] = original
+
+        self.addCleanup(restore)
+
+    def niche(self):
+        return CreatorProfile.objects.get(id=self.profile.id).primary_niche
+
+    def test_reads_go_to_the_replica_and_writes_to_the_primary(self):
+        with replica_reads():
+            self.assertEqual(self.niche(), "Fashion")
+            UserData.objects.create(email="new@example.com", role="creator")
+        self.assertEqual(self.niche(), "Travel")
+        self.assertTrue(UserData.objects.using("default").filter(email="new@example.com").exists())
+        self.assertFalse(UserData.objects.using("replica").filter(email="new@example.com").exists())
+
+    def test_reads_inside_a_transaction_stay_on_the_primary(self):
+        with replica_reads(), transaction.atomic():
+            self.assertEqual(self.niche(), "Travel")
+
+    def test_client_reads_its_own_writes(self):
+        api = TestClient(app)
+        token = security.create_access_token(self.user.id, "creator")
+        writer = {"Authorization": f"Bearer {token}"}
+        url = f"/creator/get/{self.user.id}"
+
+        self.assertEqual(api.get(url, headers=writer).json()["primary_niche"], "Fashion")
+
+        res = api.put(f"/creator/edit/{self.user.id}", params={"primary_niche": "Music"}, headers=writer)
+        self.assertEqual(res.status_code, 200, res.text)
+
+        self.assertEqual(api.get(url, headers=writer).json()["primary_niche"], "Music")
+        # Other clients keep reading the (stale) replica.
+        self.assertEqual(api.get(url).json()["primary_niche"], "Fashion")
+
+    def test_change_feed_reads_the_primary(self):
+        entry = ChangeLog.objects.create(entity="creator", object_id=self.user.id)
+        ChangeLog.objects.filter(id=entry.id).update(created_at=entry.created_at - timedelta(minutes=1))
+        with mock.patch.object(changes, "CHANGES_API_KEY", "changes-key"):
+            res = TestClient(app).get("/changes", params={"after": 0}, headers={"X-Changes-Key": "changes-key"})
+        self.assertEqual([row["id"] for row in res.json()["changes"]], [entry.id])
+
+    def test_falls_back_to_the_primary_when_the_replica_is_down(self):
+        self.use_replica(os.path.join(self.tmp, "missing", "replica.sqlite3"))
+
+        with replica_reads():
+            self.assertEqual(self.niche(), "Travel")
+        self.assertIn("replica", self.router._down_until)
+
+        res = TestClient(app).get(f"/creator/get/{self.user.id}")
+        self.assertEqual((res.status_code, res.json()["primary_niche"]), (200, "Travel"))
+
+        # Skipped without another connection attempt until the retry window ends.
+        with mock.patch.object(connections["replica"], "ensure_connection") as connect, replica_reads():
+            self.niche()
+        connect.assert_not_called()
+
+        self.use_replica(self.snapshot_primary())
+        later = time.monotonic() + routers.REPLICA_RETRY_SECONDS + 1
+        with mock.patch.object(routers.time, "monotonic", return_value=later), replica_reads():
+            self.assertEqual(self.niche(), "Travel")
+            self.assertEqual(self.router.db_for_read(CreatorProfile), "replica")
+        self.assertNotIn("replica", self.router._down_until)
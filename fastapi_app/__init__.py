@@ -1,6 +0,0 @@
-import os
-import django
-
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "creator_backend.settings")
-django.setup()
-
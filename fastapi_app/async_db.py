@@ -0,0 +1,119 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext, sync_to_async
+from django.core import signals
+
+# ================================
+# EXECUTOR SIZING
+# ================================
+# Threads that run Django ORM calls. Each keeps its own DB connection, so this
+# is also the per-worker connection budget.
+DB_THREADS = int(os.getenv("DB_THREADS", 16))
+
+# Threads for blocking work that never touches the ORM (hashing, mail, files).
+BLOCKING_THREADS = int(os.getenv("BLOCKING_THREADS", 8))
+
+
+class DatabaseLanes:
+    """
+    A fixed set of long-lived ORM threads shared by all requests.
+
+    Django's async ORM methods (aget, afilter, ...) run through
+    sync_to_async(thread_sensitive=True). Outside Django's own ASGI handler
+    that means one global thread for every query in the process. Each lane
+    is a ThreadSensitiveContext bound to its own single-thread executor. A
+    request is pinned to the least-loaded lane for its lifetime, so its ORM
+    calls stay on one thread and total ORM threads stay at `size`.
+    """
+
+    def __init__(self, size: int = DB_THREADS):
+        self.size = size
+        self.contexts = [ThreadSensitiveContext() for _ in range(size)]
+        self.executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"django-db-{i}")
+            for i in range(size)
+        ]
+        self.inflight = [0] * size
+        for context, executor in zip(self.contexts, self.executors):
+            SyncToAsync.context_to_thread_executor[context] = executor
+
+    def acquire(self):
+        index = min(range(self.size), key=self.inflight.__getitem__)
+        self.inflight[index] += 1
+        token = SyncToAsync.thread_sensitive_context.set(self.contexts[index])
+        return index, token
+
+    def release(self, index, token):
+        SyncToAsync.thread_sensitive_context.reset(token)
+        self.inflight[index] -= 1
+
+    def shutdown(self):
+        for executor in self.executors:
+            executor.shutdown(wait=True)
+
+
+lanes = DatabaseLanes()
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_THREADS, thread_name_prefix="blocking")
+
+
+def run_blocking(func, *args, **kwargs):
+    """Await a blocking, non-ORM call on the dedicated blocking pool."""
+    return sync_to_async(func, thread_sensitive=False, executor=blocking_executor)(*args, **kwargs)
+
+
+async def _on_own_lane(awaitable, lanes):
+    # Runs as its own task, so the lane set here is private to this branch.
+    index, token = lanes.acquire()
+    try:
+        return await awaitable
+    finally:
+        lanes.release(index, token)
+
+
+async def gather_lanes(*awaitables, lanes: DatabaseLanes = lanes):
+    """
+    asyncio.gather() for ORM work that should actually overlap.
+
+    A request's ORM calls all queue on its one lane, so gathering them
+    directly still runs the queries back to back. Here every awaitable gets
+    a lane of its own for its lifetime. Each branch holds a DB connection,
+    so keep fan-outs small.
+    """
+    return await asyncio.gather(*(_on_own_lane(awaitable, lanes) for awaitable in awaitables))
+
+
+# ================================
+# ASGI MIDDLEWARE
+# ================================
+def _request_started():
+    signals.request_started.send(sender=DatabaseLaneMiddleware)
+
+
+def _request_finished():
+    signals.request_finished.send(sender=DatabaseLaneMiddleware)
+
+
+class DatabaseLaneMiddleware:
+    """
+    Pins the request to a DB lane and brackets it with Django's request
+    signals on that lane's thread, so close_old_connections() and
+    reset_queries() act on the connection the request actually used.
+    """
+
+    def __init__(self, app, lanes: DatabaseLanes = lanes):
+        self.app = app
+        self.lanes = lanes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        index, token = self.lanes.acquire()
+        try:
+            await sync_to_async(_request_started)()
+            await self.app(scope, receive, send)
+        finally:
+            await sync_to_async(_request_finished)()
+            self.lanes.release(index, token)
@@ -0,0 +1,63 @@
+"""
+Offline stand-in for the Auth0 endpoints used by the social login flow.
+
+    jwks, private_key = local_keyset()
+    await http_client.startup(transport=mock_auth0_transport(jwks, private_key))
+
+After that the callback route exchanges codes against this transport
+instead of the network. Any code is accepted except "invalid", which gets
+Auth0's `invalid_grant` error; "fail" answers 503 to exercise retries and
+the circuit breaker, and "html" answers a non-JSON 400 error page.
+"""
+import json
+import time
+
+import httpx
+import jwt
+
+from fastapi_app.security import AUTH0_CLIENT_ID, AUTH0_DOMAIN
+
+
+def mock_auth0_transport(jwks: dict, private_key, domain: str | None = None, client_id: str | None = None):
+    domain = domain or AUTH0_DOMAIN
+    client_id = client_id or AUTH0_CLIENT_ID
+    kid = jwks["keys"][0]["kid"]
+
+    def handler(request: httpx.Request):
+        if request.url.host != domain:
+            return httpx.Response(404)
+
+        if request.url.path == "/.well-known/jwks.json":
+            return httpx.Response(200, json=jwks)
+
+        if request.url.path == "/oauth/token" and request.method == "POST":
+            code = json.loads(request.content or b"{}").get("code")
+
+            if code == "fail":
+                return httpx.Response(503, json={"error": "temporarily_unavailable"})
+            if code == "html":
+                return httpx.Response(400, text="<html><body>Bad Request</body></html>")
+            if not code or code == "invalid":
+                return httpx.Response(403, json={"error": "invalid_grant"})
+
+            now = int(time.time())
+            id_token = jwt.encode(
+                {
+                    "iss": f"https://{domain}/",
+                    "aud": client_id,
+                    "sub": f"google-oauth2|{code}",
+                    "email": f"{code}@example.com",
+                    "given_name": "Mock",
+                    "family_name": "User",
+                    "iat": now,
+                    "exp": now + 300,
+                },
+                private_key,
+                algorithm="RS256",
+                headers={"kid": kid},
+            )
+            return httpx.Response(200, json={"id_token": id_token, "token_type": "Bearer"})
+
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
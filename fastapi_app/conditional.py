@@ -0,0 +1,140 @@
+import hashlib
+
+from django.db.models import F
+from django.utils import timezone
+from fastapi import HTTPException, Request, Response
+
+from creator_app import change_log
+
+# ================================
+# CACHE POLICIES
+# ================================
+# Clients may keep a copy but must revalidate each time; with ETags that is a cheap 304.
+PUBLIC_PROFILE_CACHE = "public, no-cache"
+# Personal contact details: browsers only, never shared caches.
+PRIVATE_PROFILE_CACHE = "private, no-cache"
+
+
+def make_etag(kind, pk, *stamps):
+    """
+    Strong ETag for a row version: kind, id and the updated_at values of
+    every row the payload is built from (e.g. profile + user).
+    """
+    version = ":".join([kind, str(pk), *(s.isoformat() if s else "-" for s in stamps)])
+    return '"' + hashlib.blake2b(version.encode(), digest_size=12).hexdigest() + '"'
+
+
+def if_none_match(request: Request):
+    return request.headers.get("if-none-match")
+
+
+def etag_matches(header, etag):
+    """If-None-Match uses weak comparison, so W/"x" matches "x"."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def if_match(request: Request):
+    return request.headers.get("if-match")
+
+
+def etag_matches_strong(header, etag):
+    """If-Match uses strong comparison: weak tags never match."""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip() == etag for tag in header.split(","))
+
+
+def cache_headers(etag, cache_control):
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag, cache_control):
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
+
+
+def set_cache_headers(response: Response, etag, cache_control):
+    response.headers.update(cache_headers(etag, cache_control))
+
+
+async def conditional_values(request: Request, response: Response, queryset, *, kind, pk,
+                             versions, cache_control, fields, **expressions):
+    """
+    Fetch one `values()` row with ETag handling.
+
+    With If-None-Match, only the `versions` columns are read first; a match
+    returns a 304 Response. Otherwise the full row is read (versions included)
+    and ETag / Cache-Control are set on `response`. Returns None if no row.
+    """
+    header = if_none_match(request)
+    if header is not None:
+        stamps = await queryset.values_list(*versions).afirst()
+        if stamps is None:
+            return None
+        etag = make_etag(kind, pk, *stamps)
+        if etag_matches(header, etag):
+            return not_modified(etag, cache_control)
+
+    version_aliases = {f"version_{i}": F(name) for i, name in enumerate(versions)}
+    row = await queryset.values(*fields, **expressions, **version_aliases).afirst()
+    if row is None:
+        return None
+
+    etag = make_etag(kind, pk, *(row.pop(alias) for alias in version_aliases))
+    set_cache_headers(response, etag, cache_control)
+    return row
+
+
+async def conditional_update(request: Request, response: Response, queryset, *, kind, pk,
+                             versions, changes, expected=None, log=()):
+    """
+    UPDATE only the `changes` columns of the single row in `queryset`, with
+    optimistic concurrency instead of row locks.
+
+    `versions` are the ETag columns, as in conditional_values; the first must
+    be the row's own `updated_at`. The precondition is If-Match (an ETag from
+    a GET) or `expected`, a known `updated_at` value. It becomes part of the
+    UPDATE's WHERE clause, so an edit that lands in between matches no row
+    and gets a 412 instead of being overwritten. Without either, the update
+    is unconditional.
+
+    `log` entries (creator_app/change_log.py) are appended in the UPDATE's
+    transaction when it writes the row.
+
+    Sets the new ETag on `response` and returns the new `updated_at`, or
+    None if there is no row.
+    """
+    if not changes:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    model = queryset.model
+    for name, value in changes.items():
+        if value is None and not model._meta.get_field(name).null:
+            raise HTTPException(status_code=422, detail=f"{name} cannot be null")
+
+    header = if_match(request)
+    stamps = None
+    guarded = queryset
+    if header is not None:
+        stamps = await queryset.values_list(*versions).afirst()
+        if stamps is None:
+            return None
+        if not etag_matches_strong(header, make_etag(kind, pk, *stamps)):
+            raise HTTPException(status_code=412, detail="Resource was modified; reload and retry")
+        expected = stamps[0]
+    if expected is not None:
+        guarded = queryset.filter(**{versions[0]: expected})
+
+    now = timezone.now()
+    if not await change_log.awrite(lambda: guarded.update(**changes, **{versions[0]: now}), *log):
+        if not await queryset.aexists():
+            return None
+        raise HTTPException(status_code=412, detail="Resource was modified; reload and retry")
+
+    if len(versions) > 1 and stamps is None:
+        stamps = await queryset.values_list(*versions).afirst()
+    others = stamps[1:] if stamps else ()
+    response.headers["ETag"] = make_etag(kind, pk, now, *others)
+    return now
@@ -0,0 +1,39 @@
+from fastapi import Request
+
+from creator_backend.db.routers import ReadYourWrites, current_state, routing_scope
+from fastapi_app.ratelimit import client_identity
+
+read_your_writes = ReadYourWrites()
+
+
+class ReadRoutingMiddleware:
+    """
+    Opens a primary-by-default routing scope for each request.
+
+    Routes opt into replicas with the `read_replica` dependency. When a
+    request that was not a replica read writes anything, its client reads
+    from the primary for the read-your-writes window.
+    """
+
+    def __init__(self, app, tracker: ReadYourWrites = read_your_writes):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with routing_scope() as state:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # Replica reads may still bump last_active; that's no reason to pin the client.
+                if state.wrote and not state.replica:
+                    self.tracker.mark(client_identity(scope))
+
+
+async def read_replica(request: Request):
+    """Route dependency: serve this read from a replica unless the client just wrote."""
+    state = current_state()
+    if state is not None and not read_your_writes.recent(client_identity(request.scope)):
+        state.replica = True
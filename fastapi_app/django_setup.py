@@ -1,8 +1,18 @@
 # fastapi_app/django_setup.py
+# The single Django bootstrap for the FastAPI app. Every module that touches
+# settings or models imports this first; setup runs once per process.
 import os
 import django
 import warnings
+from django.apps import apps
 warnings.filterwarnings("ignore", category=RuntimeWarning, module="django.db.models.base")
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "creator_backend.settings")  
-django.setup()
+
+def setup_django():
+    if apps.ready:
+        return
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "creator_backend.settings")
+    django.setup()
+
+
+setup_django()
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ================================
+# CLIENT SETTINGS
+# ================================
+HTTP_TIMEOUT = httpx.Timeout(5.0, connect=2.0, pool=2.0)
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30)
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.2         # seconds, doubled per attempt
+
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30  # seconds before a half-open probe
+
+# Errors where the request never reached the server, so a retry is always safe.
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+# ================================
+# CIRCUIT BREAKER
+# ================================
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker.
+
+    After `failure_threshold` failures in a row the circuit opens and calls
+    fail fast for `reset_timeout` seconds. Then a single call is let through
+    as a probe and either closes the circuit or re-opens it; calls arriving
+    while the probe is in flight still fail fast.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "half-open":
+            # A probe that never reports back (cancelled) frees the slot after reset_timeout.
+            now = time.monotonic()
+            if self.probe_started is None or now - self.probe_started >= self.reset_timeout:
+                self.probe_started = now
+                return
+        if state != "closed":
+            raise CircuitOpenError("Identity provider temporarily unavailable")
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.state == "half-open":
+            self.opened_at = time.monotonic()
+            self.probe_started = None
+
+
+# ================================
+# APPLICATION-SCOPED CLIENT
+# ================================
+_client: httpx.AsyncClient | None = None
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def create_client(transport: httpx.AsyncBaseTransport | None = None):
+    return httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS, transport=transport)
+
+
+async def startup(transport: httpx.AsyncBaseTransport | None = None):
+    global _client
+    if _client is None:
+        _client = create_client(transport)
+
+
+async def shutdown():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client():
+    # Lifespan normally creates the client; this covers scripts and bare test clients.
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+def get_breaker(name: str):
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker()
+    return _breakers[name]
+
+
+# ================================
+# REQUEST WITH RETRIES
+# ================================
+async def request_json(method: str, url: str, breaker: str, **kwargs):
+    """
+    Send a request through the shared pool and return the decoded JSON body.
+
+    Connection failures are retried up to MAX_RETRIES times. For GET, read
+    timeouts and 5xx responses are retried too; a POST is never re-sent once
+    the server may have seen it. Every failure counts against the named
+    circuit breaker. A body that is not JSON (an HTML error page from a
+    proxy, say) raises httpx.DecodingError, so callers only handle httpx.HTTPError.
+    """
+    circuit = get_breaker(breaker)
+    circuit.before_call()
+
+    client = get_client()
+    idempotent = method.upper() == "GET"
+
+    for attempt in range(MAX_RETRIES + 1):
+        last = attempt == MAX_RETRIES
+        try:
+            res = await client.request(method, url, **kwargs)
+        except _CONNECT_ERRORS:
+            circuit.record_failure()
+            if last:
+                raise
+        except httpx.TimeoutException:
+            circuit.record_failure()
+            if last or not idempotent:
+                raise
+        else:
+            if res.status_code < 500:
+                circuit.record_success()
+                try:
+                    return res.json()
+                except ValueError as exc:
+                    raise httpx.DecodingError(
+                        f"Non-JSON response ({res.status_code}) from {url}", request=res.request,
+                    ) from exc
+            circuit.record_failure()
+            if last or not idempotent:
+                res.raise_for_status()
+
+        circuit.before_call()
+        delay = RETRY_BACKOFF * (2 ** attempt)
+        logger.warning("Retrying %s %s in %.2fs (attempt %d)", method, url, delay, attempt + 1)
+        await asyncio.sleep(delay * (0.5 + random.random()))
@@ -0,0 +1,53 @@
+"""
+Replays for retried writes.
+
+Clients send an `Idempotency-Key` header (or a `client_message_id` field)
+with each write and reuse it on retries. The first response is kept per
+(user, key) in a bounded per-process LRU for IDEMPOTENCY_TTL seconds. A
+retry that lands here is answered without touching the database or storage.
+Retries that reach another worker, or arrive after eviction, fall through
+to the database: the key is stored on the row behind a unique constraint,
+so the original row is found and replayed instead of written twice.
+"""
+import os
+import time
+from collections import OrderedDict
+
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", 600))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", 10_000))
+IDEMPOTENCY_KEY_MAX_LENGTH = 64
+
+# Set on responses that replay an earlier result.
+REPLAYED_HEADER = "idempotent-replayed"
+
+
+class IdempotencyStore:
+    """Bounded LRU of {(user, key): response body} with a TTL."""
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL, max_keys: int = IDEMPOTENCY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._responses = OrderedDict()
+
+    def get(self, key):
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        expires, body = entry
+        if expires < time.monotonic():
+            del self._responses[key]
+            return None
+        self._responses.move_to_end(key)
+        return body
+
+    def set(self, key, body):
+        self._responses[key] = (time.monotonic() + self.ttl, body)
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_keys:
+            self._responses.popitem(last=False)
+
+    def clear(self):
+        self._responses.clear()
+
+
+sent_messages = IdempotencyStore()
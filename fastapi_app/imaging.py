@@ -0,0 +1,99 @@
+"""
+Avatar normalization in a process pool.
+
+Decoding and re-encoding images is CPU-bound and holds the GIL for long
+stretches, so it runs in separate processes, off the event loop and the
+DB / blocking thread pools. Every upload becomes WebP renditions:
+
+    full  longest side capped at AVATAR_MAX_SIDE, aspect kept
+    512, 256, 128, 64   square center crops for avatars in lists and chats
+
+EXIF orientation is applied and metadata dropped. This module is imported by
+the pool's worker processes, so it stays free of Django and imports Pillow
+only inside the worker.
+"""
+import asyncio
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import get_context
+
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 2))
+
+AVATAR_MAX_SIDE = int(os.getenv("AVATAR_MAX_SIDE", 1024))
+AVATAR_SIZES = (512, 256, 128, 64)
+AVATAR_QUALITY = int(os.getenv("AVATAR_QUALITY", 80))
+# Decompression-bomb guard: refuse images above this many pixels before decoding.
+AVATAR_MAX_PIXELS = int(os.getenv("AVATAR_MAX_PIXELS", 40_000_000))
+ACCEPTED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "BMP"}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+# ================================
+# WORKER SIDE
+# ================================
+def _encode(image):
+    out = BytesIO()
+    image.save(out, "WEBP", quality=AVATAR_QUALITY, method=4)
+    return out.getvalue()
+
+
+def render_avatar(path):
+    """Decode the image at `path` and return {"full" | size: webp bytes}."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = AVATAR_MAX_PIXELS
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(path) as image:
+                if image.format not in ACCEPTED_FORMATS:
+                    raise InvalidImage(f"Unsupported image format {image.format}")
+                # JPEG can decode straight at a reduced scale; much cheaper for camera photos.
+                image.draft("RGB", (AVATAR_MAX_SIDE, AVATAR_MAX_SIDE))
+                image = ImageOps.exif_transpose(image)
+                image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, Image.DecompressionBombWarning, OSError) as exc:
+        raise InvalidImage(str(exc)) from None
+
+    mode = "RGBA" if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info else "RGB"
+    image = image.convert(mode)
+
+    full = image.copy()
+    full.thumbnail((AVATAR_MAX_SIDE, AVATAR_MAX_SIDE), Image.Resampling.LANCZOS)
+    renditions = {"full": _encode(full)}
+    for size in AVATAR_SIZES:
+        square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        renditions[size] = _encode(square)
+    return renditions
+
+
+# ================================
+# APP SIDE
+# ================================
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_pool():
+    # Created on first upload so boot stays cheap; spawn, because forking a
+    # process that already runs DB and blocking threads is unsafe.
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=get_context("spawn"))
+    return _pool
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+async def normalize_avatar(path):
+    """Render avatar renditions for the image file at `path` in the process pool."""
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), render_avatar, path)
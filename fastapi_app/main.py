@@ -1,12 +1,53 @@
+import fastapi_app.django_setup
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from importlib import import_module
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from creator_app import stats
+from creator_backend.db.pool import close_pools, pool_stats
+from fastapi_app import http_client, imaging
+from fastapi_app.async_db import DatabaseLaneMiddleware
+from fastapi_app.db_routing import ReadRoutingMiddleware
+from fastapi_app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry
+from fastapi_app.ratelimit import RateLimitMiddleware
+from fastapi_app.responses import ORJSONResponse
+from fastapi_app.sql_profiler import SQLProfilerMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One keep-alive connection pool per worker for outbound calls (Auth0).
+    await http_client.startup()
+    # Stats deltas from the write routes, flushed to the rollup tables in batches.
+    stats_flusher = asyncio.create_task(stats.flush_periodically())
+    yield
+    stats_flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await stats_flusher
+    await http_client.shutdown()
+    imaging.shutdown()
+    close_pools()
+
+
+# orjson for every JSON body; routes declare response_model for typed OpenAPI schemas.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Query count / DB time headers and N+1 warnings (on in DEBUG, see SQL_PROFILER).
+app.add_middleware(SQLProfilerMiddleware)
+
+# Pins each request's async ORM calls to one of a fixed set of DB threads.
+app.add_middleware(DatabaseLaneMiddleware)
 
-from fastapi_app.routes.auth import router as auth_router
-from fastapi_app.routes.creator import router as creator_router
-from fastapi_app.routes.collaborator import router as collaborator_router 
-from fastapi_app.routes.my_profile import router as my_profile_router 
+# Primary by default; read routes opt into replicas (fastapi_app/db_routing.py).
+app.add_middleware(ReadRoutingMiddleware)
 
-app = FastAPI()
+# Rate limiting sits inside CORS so 429 responses still carry CORS headers.
+app.add_middleware(RateLimitMiddleware)
 
 # CORS (optional if you already added)
 app.add_middleware(
@@ -17,11 +58,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency and status cover everything above, including 429s.
+app.add_middleware(MetricsMiddleware)
+
 # REGISTER ROUTES
-app.include_router(auth_router)
-app.include_router(creator_router)
-app.include_router(collaborator_router) 
-app.include_router(my_profile_router)
+# Dotted paths of modules exposing `router`; imported only when the app is built.
+ROUTERS = [
+    "fastapi_app.routes.auth",
+    "fastapi_app.routes.creator",
+    "fastapi_app.routes.collaborator",
+    "fastapi_app.routes.my_profile",
+    "fastapi_app.routes.message",
+    "fastapi_app.routes.bulk_import",
+    "fastapi_app.routes.media",
+    "fastapi_app.routes.stats",
+    "fastapi_app.routes.home",
+    "fastapi_app.routes.changes",
+    "fastapi_app.routes.groups",
+]
+
+
+def include_routers(app: FastAPI, routers=ROUTERS):
+    for module in routers:
+        app.include_router(import_module(module).router)
+
+
+include_routers(app)
 
 
 
@@ -29,3 +91,14 @@ app.include_router(my_profile_router)
 @app.get("/")
 def home():
     return {"message": "Welcome to CCW FastAPI"}
+
+
+@app.get("/health/db")
+def db_health():
+    return {"pools": pool_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Per worker process; Prometheus scrapes each worker and sums.
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
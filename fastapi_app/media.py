@@ -0,0 +1,218 @@
+"""
+Media file responses and URLs.
+
+Files live under MEDIA_ROOT and are served at MEDIA_URL by
+fastapi_app/routes/media.py, for deployments without a CDN or nginx in front.
+
+- Range requests (video seeking, resumed downloads) via Starlette's FileResponse.
+- If-None-Match / If-Modified-Since revalidation answered with a 304.
+- Zero-copy bodies: on servers offering the ASGI `http.response.zerocopy`
+  extension, the server os.sendfile()s straight from our file descriptor;
+  `http.response.pathsend` is used next, then plain chunked reads.
+- Content-hashed names are immutable and cached for a year.
+- With MEDIA_SIGNED_URLS, private attachments need an expiring signature
+  (see media_url()).
+"""
+import os
+import re
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+
+from fastapi_app.async_db import run_blocking
+from fastapi_app.conditional import etag_matches, not_modified
+from fastapi_app.imaging import AVATAR_SIZES
+
+# ================================
+# CACHE POLICIES
+# ================================
+# A hash in the name means the bytes behind the URL never change.
+IMMUTABLE_MEDIA_CACHE = "public, max-age=31536000, immutable"
+# Plain names can be overwritten in place; revalidate (cheap 304) every time.
+MEDIA_CACHE = "public, no-cache"
+
+# `<hash>.webp`, `avatar.<hash>.png`, `<hash>/256.webp`: 16+ lowercase hex digits as a path part.
+CONTENT_HASH = re.compile(r"(?:^|[/._-])[0-9a-f]{16,64}(?:[/._-]|$)")
+
+SIGNATURE_SALT = "fastapi_app.media"
+
+
+def is_content_hashed(name):
+    return CONTENT_HASH.search(name) is not None
+
+
+def is_private(name):
+    return any(name.startswith(prefix) for prefix in settings.MEDIA_PRIVATE_DIRS)
+
+
+def resolve(name):
+    """
+    Absolute path for a media name, or None if it escapes MEDIA_ROOT or is
+    not in canonical form (empty, `.` or `..` segments). A name that only
+    spells a path differently would otherwise dodge is_private().
+    """
+    if not name or "\x00" in name or any(part in ("", ".", "..") for part in name.split("/")):
+        return None
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        return None
+    return path
+
+
+def is_private_path(path):
+    """is_private() for a resolved path, so a symlink into a private dir stays private."""
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    return is_private(os.path.relpath(path, root).replace(os.sep, "/"))
+
+
+# ================================
+# SIGNED URLS
+# ================================
+def signature(name, expires):
+    return salted_hmac(SIGNATURE_SALT, f"{name}:{expires}", algorithm="sha256").hexdigest()[:32]
+
+
+def verify_signature(name, expires, sig, now=None):
+    """Seconds the signature stays valid for, or None if it is bad or expired."""
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return None
+    remaining = expires - int(now or time.time())
+    if remaining <= 0 or not sig or not constant_time_compare(sig, signature(name, expires)):
+        return None
+    return remaining
+
+
+def signed_query(name, now=None):
+    # Expiry rounded up to a TTL boundary, so the URL for a file stays the same
+    # for a whole window and browsers can cache it.
+    ttl = settings.MEDIA_URL_TTL
+    expires = (int(now or time.time()) // ttl + 2) * ttl
+    return urlencode({"expires": expires, "signature": signature(name, expires)})
+
+
+def media_url(name, request=None):
+    """
+    Public URL of a stored file name (absolute when `request` is given).
+    Private attachments are signed when MEDIA_SIGNED_URLS is on.
+    """
+    if not name:
+        return None
+    url = f"{settings.MEDIA_URL}{name}"
+    if request is not None:
+        url = f"{str(request.base_url).rstrip('/')}{url}"
+    if settings.MEDIA_SIGNED_URLS and is_private(name):
+        url = f"{url}?{signed_query(name)}"
+    return url
+
+
+# ================================
+# AVATARS
+# ================================
+# Normalized profile pictures (fastapi_app/imaging.py), named by a hash of the
+# uploaded bytes: avatars/<key>.webp plus avatars/<key>-<size>.webp.
+AVATAR_DIR = "avatars"
+AVATAR_NAME = re.compile(rf"^{AVATAR_DIR}/([0-9a-f]{{32}})\.webp$")
+
+
+def avatar_name(key, size="full"):
+    return f"{AVATAR_DIR}/{key}.webp" if size == "full" else f"{AVATAR_DIR}/{key}-{size}.webp"
+
+
+def avatar_urls(name, request=None):
+    """{size: url} for a normalized profile picture, None for legacy uploads."""
+    match = AVATAR_NAME.match(name or "")
+    if match is None:
+        return None
+    return {str(size): media_url(avatar_name(match.group(1), size), request) for size in AVATAR_SIZES}
+
+
+def avatar_thumbnail(name, request=None, size=128):
+    """Small avatar URL for lists and cards; the original file for legacy uploads."""
+    match = AVATAR_NAME.match(name or "")
+    if match is None:
+        return media_url(name, request)
+    return media_url(avatar_name(match.group(1), size), request)
+
+
+# ================================
+# RESPONSE
+# ================================
+def cache_control_for(name, signed_for=None):
+    if signed_for is not None:
+        # Never outlive the signature, and keep it out of shared caches.
+        return f"private, max-age={signed_for}"
+    return IMMUTABLE_MEDIA_CACHE if is_content_hashed(name) else MEDIA_CACHE
+
+
+def _not_modified_since(header, mtime):
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return since is not None and int(mtime) <= since.timestamp()
+
+
+class MediaFileResponse(FileResponse):
+    """
+    FileResponse plus conditional GETs and zero-copy bodies.
+
+    Always constructed with `stat_result`, so headers are known up front.
+    """
+    chunk_size = 256 * 1024
+
+    def __init__(self, path, stat_result, cache_control, **kwargs):
+        super().__init__(path, stat_result=stat_result, content_disposition_type="inline", **kwargs)
+        self.headers["cache-control"] = cache_control
+        self.zerocopy = False
+
+    def is_not_modified(self, request_headers):
+        # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2).
+        if "if-none-match" in request_headers:
+            return etag_matches(request_headers["if-none-match"], self.headers["etag"])
+        if "if-modified-since" in request_headers:
+            return _not_modified_since(request_headers["if-modified-since"], self.stat_result.st_mtime)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if self.is_not_modified(Headers(scope=scope)):
+            response = not_modified(self.headers["etag"], self.headers["cache-control"])
+            response.headers["last-modified"] = self.headers["last-modified"]
+            return await response(scope, receive, send)
+
+        self.zerocopy = "http.response.zerocopy" in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _send_zerocopy(self, send, start, end):
+        file = await run_blocking(open, self.path, "rb")
+        try:
+            await send({
+                "type": "http.response.zerocopy",
+                "file": file,
+                "offset": start,
+                "count": end - start,
+                "more_body": False,
+            })
+        finally:
+            file.close()
+
+    async def _handle_simple(self, send, send_header_only, send_pathsend):
+        if send_header_only or not self.zerocopy:
+            return await super()._handle_simple(send, send_header_only, send_pathsend)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._send_zerocopy(send, 0, self.stat_result.st_size)
+
+    async def _handle_single_range(self, send, start, end, file_size, send_header_only):
+        if send_header_only or not self.zerocopy:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        await self._send_zerocopy(send, start, end)
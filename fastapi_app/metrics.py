@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from starlette.routing import Match
+
+from creator_backend.db.pool import pool_stats
+
+# ================================
+# SETTINGS
+# ================================
+# Latency bucket upper bounds in seconds (Prometheus `le` labels).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# Anything else is counted as "OTHER" so junk methods can't grow the label set.
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+# Route label for requests that match no route (404s, scanners).
+UNMATCHED = "unmatched"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PROCESS_START = time.time()
+
+
+class Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        # One slot per bucket plus +Inf; cumulated only when rendered.
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics.
+
+    Updates happen only on the event loop thread (from the middleware), so
+    plain dicts and ints are enough: no locks on the request path.
+    """
+
+    def __init__(self):
+        self.requests = {}        # (method, route, status) -> count
+        self.latency = {}         # (method, route) -> Histogram
+        self.in_progress = {}     # method -> gauge
+
+    def observe(self, method, route, status, duration):
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[(method, route)] = Histogram()
+        histogram.observe(duration)
+
+    def render(self):
+        lines = []
+
+        lines.append("# HELP http_requests_total Requests handled, by route template and status.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines.append("# HELP http_requests_in_progress Requests currently being handled.")
+        lines.append("# TYPE http_requests_in_progress gauge")
+        for method, value in sorted(self.in_progress.items()):
+            lines.append(f"http_requests_in_progress{_labels(method=method)} {value}")
+
+        lines.append("# HELP http_request_duration_seconds Request latency, by route template.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route), histogram in sorted(self.latency.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram.counts):
+                cumulative += count
+                labels = _labels(method=method, route=route, le=bound)
+                lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+            labels = _labels(method=method, route=route)
+            lines.append(f"http_request_duration_seconds_sum{labels} {histogram.sum}")
+            lines.append(f"http_request_duration_seconds_count{labels} {cumulative}")
+
+        lines.extend(_process_lines())
+        lines.extend(_pool_lines())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ================================
+# EXPOSITION HELPERS
+# ================================
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _gauge(name, help_text, value, kind="gauge"):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+def _process_lines():
+    times = os.times()
+    lines = []
+    lines += _gauge("process_cpu_seconds_total", "User and system CPU time.", times.user + times.system, "counter")
+    lines += _gauge("process_start_time_seconds", "Process start time since the epoch.", PROCESS_START)
+    lines += _gauge("process_threads", "Python threads alive.", threading.active_count())
+
+    # /proc is Linux-only; other platforms just skip these.
+    try:
+        with open("/proc/self/statm") as f:
+            vms_pages, rss_pages = f.read().split()[:2]
+        page = os.sysconf("SC_PAGE_SIZE")
+        lines += _gauge("process_virtual_memory_bytes", "Virtual memory size.", int(vms_pages) * page)
+        lines += _gauge("process_resident_memory_bytes", "Resident memory size.", int(rss_pages) * page)
+        lines += _gauge("process_open_fds", "Open file descriptors.", len(os.listdir("/proc/self/fd")))
+    except (OSError, ValueError, AttributeError):
+        pass
+    return lines
+
+
+def _pool_lines():
+    stats = pool_stats()
+    if not stats:
+        return []
+
+    lines = [
+        "# HELP db_pool_connections Pooled DB connections, by state.",
+        "# TYPE db_pool_connections gauge",
+    ]
+    for alias, pool in stats.items():
+        for state in ("open", "idle", "in_use", "waiting"):
+            lines.append(f"db_pool_connections{_labels(alias=alias, state=state)} {pool[state]}")
+    lines += [
+        "# HELP db_pool_timeouts_total Checkouts that gave up waiting for a connection.",
+        "# TYPE db_pool_timeouts_total counter",
+    ]
+    for alias, pool in stats.items():
+        lines.append(f"db_pool_timeouts_total{_labels(alias=alias)} {pool['timeouts_total']}")
+    return lines
+
+
+# ================================
+# ASGI MIDDLEWARE
+# ================================
+def route_template(scope):
+    """`/creator/get/{user_id}` rather than `/creator/get/42`, to keep label cardinality bounded."""
+    route = scope.get("route")
+    if route is None:
+        # Short-circuited before routing (429, CORS preflight): match it ourselves.
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match != Match.NONE:
+                route = candidate
+                break
+        else:
+            return UNMATCHED
+    return getattr(route, "path_format", UNMATCHED)
+
+
+class MetricsMiddleware:
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        if method not in METHODS:
+            method = "OTHER"
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = self.registry.in_progress
+        in_progress[method] = in_progress.get(method, 0) + 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress[method] -= 1
+            self.registry.observe(method, route_template(scope), status, duration)
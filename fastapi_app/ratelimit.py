@@ -0,0 +1,212 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import orjson
+from fastapi import HTTPException
+
+from fastapi_app.security import decode_token
+
+
+# ================================
+# RULES
+# ================================
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    `rate` requests per `per` seconds, with bursts of up to `burst`.
+
+    `path` is matched as a prefix unless `exact` is set. `key` picks the
+    identity a bucket belongs to: "user" (bearer token subject, falling back
+    to the client IP) or "ip".
+    """
+    path: str
+    rate: int
+    per: float = 60.0
+    burst: int | None = None
+    methods: tuple[str, ...] = ()
+    exact: bool = False
+    key: str = "user"
+
+    @property
+    def capacity(self):
+        return self.burst or self.rate
+
+    @property
+    def refill_rate(self):
+        return self.rate / self.per
+
+    def matches(self, method: str, path: str):
+        if self.methods and method not in self.methods:
+            return False
+        return path == self.path if self.exact else path.startswith(self.path)
+
+
+# First matching rule wins; unmatched paths are not limited.
+RATE_LIMITS = [
+    RateLimit("/auth/login", rate=10, per=60, key="ip", exact=True),
+    RateLimit("/auth/signup", rate=5, per=60, key="ip", exact=True),
+    RateLimit("/auth/refresh", rate=30, per=60, exact=True),
+    RateLimit("/auth/forgot-password/", rate=5, per=300, key="ip"),
+    RateLimit("/auth/change-password/", rate=5, per=60),
+    RateLimit("/creator/search", rate=60, per=60, burst=20, exact=True),
+    RateLimit("/collaborator/search", rate=60, per=60, burst=20, exact=True),
+    RateLimit("/message/conversation/", rate=120, per=60, burst=30),
+    RateLimit("/message/send", rate=60, per=60, burst=20, exact=True),
+]
+
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+# Proxies in front of the API that append to X-Forwarded-For. Entries left of
+# the ones they added were sent by the client and are not trusted.
+RATE_LIMIT_PROXY_HOPS = int(os.getenv("RATE_LIMIT_PROXY_HOPS", 1))
+
+
+# ================================
+# BACKENDS
+# ================================
+class MemoryBackend:
+    """Per-process buckets in an LRU-bounded dict; every hit is O(1)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    async def hit(self, key: str, capacity: int, refill_rate: float):
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * refill_rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, tokens
+
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or capacity
+local ts = tonumber(b[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """
+    Buckets shared by every worker, updated atomically in one Lua call.
+
+    Uses the Redis server clock so workers on different hosts agree on refill.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_LUA)
+
+    async def hit(self, key: str, capacity: int, refill_rate: float):
+        allowed, tokens = await self._script(keys=[self.prefix + key], args=[capacity, refill_rate])
+        return bool(allowed), float(tokens)
+
+
+def default_backend():
+    if RATE_LIMIT_REDIS_URL:
+        return RedisBackend(RATE_LIMIT_REDIS_URL)
+    return MemoryBackend()
+
+
+# ================================
+# ASGI MIDDLEWARE
+# ================================
+def client_identity(scope, use_token: bool = True):
+    """
+    Bearer token subject ("u<id>") if `use_token` and valid, else the client IP.
+
+    Behind RATE_LIMIT_PROXY_HOPS trusted proxies the client IP is the address
+    the outermost one saw, counted from the right of X-Forwarded-For.
+    """
+    headers = dict(scope["headers"])
+
+    if use_token:
+        auth = headers.get(b"authorization", b"")
+        if auth[:7].lower() == b"bearer ":
+            try:
+                return "u" + decode_token(auth[7:].decode("latin-1"))["sub"]
+            except HTTPException:
+                pass
+
+    if RATE_LIMIT_TRUST_FORWARDED and b"x-forwarded-for" in headers:
+        forwarded = [h.strip() for h in headers[b"x-forwarded-for"].split(b",")]
+        if len(forwarded) >= RATE_LIMIT_PROXY_HOPS > 0:
+            return forwarded[-RATE_LIMIT_PROXY_HOPS].decode("latin-1")
+
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+
+    def __init__(self, app, rules=None, backend=None):
+        self.app = app
+        self.rules = RATE_LIMITS if rules is None else rules
+        self.backend = backend or default_backend()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+        method = scope["method"]
+
+        for index, rule in enumerate(self.rules):
+            if not rule.matches(method, path):
+                continue
+
+            key = f"{index}:{self.identity(scope, rule)}"
+            allowed, tokens = await self.backend.hit(key, rule.capacity, rule.refill_rate)
+            if not allowed:
+                retry_after = max(1, math.ceil((1 - tokens) / rule.refill_rate))
+                return await self.reject(send, rule, retry_after)
+            break
+
+        await self.app(scope, receive, send)
+
+    def identity(self, scope, rule: RateLimit):
+        return client_identity(scope, use_token=rule.key == "user")
+
+    async def reject(self, send, rule: RateLimit, retry_after: int):
+        body = orjson.dumps({"detail": "Too many requests"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                (b"x-ratelimit-limit", str(rule.capacity).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
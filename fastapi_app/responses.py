@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+
+def _default(obj):
+    # DecimalField values (collaborator pricing) render as numbers, as jsonable_encoder did.
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """App-wide default response: orjson rendering, plus Decimal support."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_rows(rows, status_code: int = 200):
+    """
+    Return `values()` rows straight to orjson.
+
+    Routes use this for large list/search payloads. The route's
+    response_model still documents the shape, but FastAPI skips
+    re-validating thousands of rows it already got from typed columns.
+    """
+    return ORJSONResponse(rows, status_code=status_code)
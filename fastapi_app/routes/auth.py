@@ -1,20 +1,37 @@
 import fastapi_app.django_setup
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse, HTMLResponse
-from fastapi.templating import Jinja2Templates
 
+from creator_app import change_log
 from creator_app.models import UserData
+from creator_app.tasks import send_email
+from fastapi_app import http_client
+from fastapi_app.async_db import run_blocking
+from fastapi_app.schemas import (
+    Auth0LoginResponse,
+    LoginResponse,
+    RefreshResponse,
+    SignupResponse,
+    StatusMessage,
+)
+from fastapi_app.security import (
+    authorize_user,
+    decode_token,
+    issue_tokens,
+    password_version,
+    verify_auth0_id_token,
+)
 
-from django.core.mail import send_mail
 from django.contrib.auth.hashers import make_password
 
+import functools
 import re
+from contextlib import contextmanager
 import time
 import logging
 import os
-import requests
-import jwt
+import httpx
 from random import randint
 from dotenv import load_dotenv
 
@@ -28,15 +45,23 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
 
-templates = Jinja2Templates(directory=TEMPLATE_DIR)
 logger = logging.getLogger(__name__)
 
+
+@functools.cache
+def get_templates():
+    # Jinja2 is only needed by the test page; load it on first render.
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory=TEMPLATE_DIR)
+
+
 # ================================
 # TEST PAGE ROUTE
 # ================================
 @router.get("/auth-test", response_class=HTMLResponse)
-def auth_test(request: Request):
-    return templates.TemplateResponse("auth_test.html", {"request": request})
+async def auth_test(request: Request):
+    return get_templates().TemplateResponse(request, "auth_test.html")
 
 
 # ================================
@@ -65,8 +90,8 @@ def hash_password(value: str):
 # ================================
 # SIGNUP
 # ================================
-@router.post("/signup")
-def signup(email: str, phone: str, password: str, role: str | None = None):
+@router.post("/signup", response_model=SignupResponse)
+async def signup(email: str, phone: str, password: str, role: str | None = None):
 
     strong_regex = (
         r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)"
@@ -76,42 +101,60 @@ def signup(email: str, phone: str, password: str, role: str | None = None):
     if not re.match(strong_regex, password):
         raise HTTPException(400, "Weak password")
 
-    if UserData.objects.filter(email=email).exists():
+    if await UserData.objects.filter(email=email).aexists():
         raise HTTPException(400, "Email already exists")
 
     user = UserData(email=email, phone_number=phone, role=role or "")
-    user.set_password(password)
-    user.save()
+    user.password = await run_blocking(hash_password, password)
+    await change_log.acreate(user, change_log.USER)
 
-    return {"message": "Signup successful", "user_id": user.id}
+    return {"message": "Signup successful", "user_id": user.id, **issue_tokens(user)}
 
 
 # ================================
 # LOGIN
 # ================================
-@router.post("/login")
-def login(email: str, password: str):
+@router.post("/login", response_model=LoginResponse)
+async def login(email: str, password: str):
 
     try:
-        user = UserData.objects.get(email=email)
+        user = await UserData.objects.aget(email=email)
     except UserData.DoesNotExist:
         raise HTTPException(401, "Invalid email or password")
 
-    if not user.check_password(password):
+    if not await run_blocking(user.check_password, password):
         raise HTTPException(401, "Invalid email or password")
 
-    return {"message": "Login successful", "user_id": user.id, "role": user.role}
+    return {
+        "message": "Login successful",
+        "user_id": user.id,
+        "role": user.role,
+        **issue_tokens(user),
+    }
+
+
+# ================================
+# REFRESH ACCESS TOKEN
+# ================================
+@router.post("/refresh", response_model=RefreshResponse)
+async def refresh_token(refresh_token: str):
+
+    claims = decode_token(refresh_token, "refresh")
+
+    user = await UserData.objects.filter(id=int(claims["sub"])).only("id", "role", "password").afirst()
+    if not user or claims.get("pwv") != password_version(user.password):
+        raise HTTPException(401, "Refresh token revoked")
+
+    return {"user_id": user.id, "role": user.role, **issue_tokens(user)}
 
 
 # ================================
 # SEND OTP
 # ================================
-@router.post("/forgot-password/send-otp")
-def send_otp(email: str):
+@router.post("/forgot-password/send-otp", response_model=StatusMessage)
+async def send_otp(email: str):
 
-    try:
-        user = UserData.objects.get(email=email)
-    except UserData.DoesNotExist:
+    if not await UserData.objects.filter(email=email).aexists():
         raise HTTPException(404, "Email not found")
 
     otp = randint(100000, 999999)
@@ -130,7 +173,8 @@ def send_otp(email: str):
         f"– Stackly.AI Security Team"
     )
 
-    send_mail(
+    # Delivered by the job worker; SMTP latency and retries stay out of the request.
+    await send_email.aenqueue(
         subject="Your Stackly.AI OTP Code",
         message=message,
         from_email=None,
@@ -143,8 +187,8 @@ def send_otp(email: str):
 # ================================
 # RESEND OTP
 # ================================
-@router.post("/forgot-password/resend-otp")
-def resend_otp(email: str):
+@router.post("/forgot-password/resend-otp", response_model=StatusMessage)
+async def resend_otp(email: str):
 
     if email in OTP_CACHE:
         record = OTP_CACHE[email]
@@ -156,14 +200,14 @@ def resend_otp(email: str):
                 f"Please wait {RESEND_COOLDOWN} seconds before resending OTP."
             )
 
-    return send_otp(email)
+    return await send_otp(email)
 
 
 # ================================
 # VERIFY OTP
 # ================================
-@router.post("/forgot-password/verify-otp")
-def verify_otp(email: str, otp: int):
+@router.post("/forgot-password/verify-otp", response_model=StatusMessage)
+async def verify_otp(email: str, otp: int):
 
     if email not in OTP_CACHE:
         raise HTTPException(400, "OTP not requested")
@@ -183,18 +227,19 @@ def verify_otp(email: str, otp: int):
 # ================================
 # RESET PASSWORD
 # ================================
-@router.post("/forgot-password/reset")
-def reset_password(email: str, new_password: str, confirm_password: str):
+@router.post("/forgot-password/reset", response_model=StatusMessage)
+async def reset_password(email: str, new_password: str, confirm_password: str):
 
     if new_password != confirm_password:
         raise HTTPException(400, "Passwords do not match")
 
     try:
-        user = UserData.objects.get(email=email)
+        user = await UserData.objects.aget(email=email)
     except UserData.DoesNotExist:
         raise HTTPException(404, "User not found")
 
-    user.set_password(new_password)
+    user.password = await run_blocking(hash_password, new_password)
+    await user.asave()
 
     return {"message": "Password reset successful"}
 
@@ -202,15 +247,15 @@ def reset_password(email: str, new_password: str, confirm_password: str):
 # ================================
 # CHANGE PASSWORD (USER ID)
 # ================================
-@router.post("/change-password/{user_id}")
-def change_password(user_id: int, old_password: str, new_password: str, confirm_password: str):
+@router.post("/change-password/{user_id}", response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def change_password(user_id: int, old_password: str, new_password: str, confirm_password: str):
 
     try:
-        user = UserData.objects.get(id=user_id)
+        user = await UserData.objects.aget(id=user_id)
     except UserData.DoesNotExist:
         raise HTTPException(404, "User not found")
 
-    if not user.check_password(old_password):
+    if not await run_blocking(user.check_password, old_password):
         raise HTTPException(400, "Old password incorrect")
 
     if new_password != confirm_password:
@@ -223,7 +268,8 @@ def change_password(user_id: int, old_password: str, new_password: str, confirm_
     if not re.match(strong_regex, new_password):
         raise HTTPException(400, "Weak password")
 
-    user.set_password(new_password)
+    user.password = await run_blocking(hash_password, new_password)
+    await user.asave()
 
     return {"message": "Password changed successfully"}
 
@@ -232,7 +278,7 @@ def change_password(user_id: int, old_password: str, new_password: str, confirm_
 # AUTH0 SOCIAL LOGIN ROUTES
 # ================================
 @router.get("/auth0/login/google")
-def login_google():
+async def login_google():
     url = (
         f"https://{AUTH0_DOMAIN}/authorize?"
         f"response_type=code&client_id={AUTH0_CLIENT_ID}"
@@ -243,7 +289,7 @@ def login_google():
 
 
 @router.get("/auth0/login/facebook")
-def login_facebook():
+async def login_facebook():
     url = (
         f"https://{AUTH0_DOMAIN}/authorize?"
         f"response_type=code&client_id={AUTH0_CLIENT_ID}"
@@ -254,7 +300,7 @@ def login_facebook():
 
 
 @router.get("/auth0/login/apple")
-def login_apple():
+async def login_apple():
     url = (
         f"https://{AUTH0_DOMAIN}/authorize?"
         f"response_type=code&client_id={AUTH0_CLIENT_ID}"
@@ -271,25 +317,40 @@ def get_provider_from_sub(sub: str):
     return sub.split("|", 1)[0] if sub else "auth0"
 
 
-def _auth0_callback_logic(code: str):
-
-    token_res = requests.post(
-        f"https://{AUTH0_DOMAIN}/oauth/token",
-        json={
-            "grant_type": "authorization_code",
-            "client_id": AUTH0_CLIENT_ID,
-            "client_secret": AUTH0_CLIENT_SECRET,
-            "code": code,
-            "redirect_uri": AUTH0_CALLBACK_URL,
-        }
-    )
-
-    tokens = token_res.json()
+@contextmanager
+def identity_provider_errors(action: str):
+    """503 while the Auth0 breaker is open, 502 when Auth0 fails or answers garbage."""
+    try:
+        yield
+    except http_client.CircuitOpenError as exc:
+        raise HTTPException(503, str(exc))
+    except httpx.HTTPError:
+        logger.exception("%s failed", action)
+        raise HTTPException(502, "Identity provider unavailable")
+
+
+async def _auth0_callback_logic(code: str):
+
+    with identity_provider_errors("Auth0 token exchange"):
+        tokens = await http_client.request_json(
+            "POST",
+            f"https://{AUTH0_DOMAIN}/oauth/token",
+            breaker="auth0",
+            json={
+                "grant_type": "authorization_code",
+                "client_id": AUTH0_CLIENT_ID,
+                "client_secret": AUTH0_CLIENT_SECRET,
+                "code": code,
+                "redirect_uri": AUTH0_CALLBACK_URL,
+            },
+        )
 
     if "id_token" not in tokens:
         raise HTTPException(400, "Token exchange failed")
 
-    decoded = jwt.decode(tokens["id_token"], options={"verify_signature": False})
+    # May fetch the key set (first login, or a rotated kid).
+    with identity_provider_errors("Fetching the Auth0 key set"):
+        decoded = await verify_auth0_id_token(tokens["id_token"])
 
     email = decoded.get("email")
     sub = decoded.get("sub")
@@ -301,7 +362,7 @@ def _auth0_callback_logic(code: str):
     # ============================================================
     # 🔥 FIX: Prevent UNIQUE constraint error on userid
     # ============================================================
-    existing_user = UserData.objects.filter(userid=sub).first()
+    existing_user = await UserData.objects.filter(userid=sub).afirst()
 
     if existing_user:
         return {
@@ -309,30 +370,32 @@ def _auth0_callback_logic(code: str):
             "user_id": existing_user.id,
             "email": existing_user.email,
             "provider": existing_user.provider,
-            "next_step": "choose_role"
+            "next_step": "choose_role",
+            **issue_tokens(existing_user),
         }
 
     # If new → create fresh user
-    user_data = UserData.objects.create(
+    user_data = await change_log.acreate(UserData(
         email=email,
         first_name=decoded.get("given_name") or "",
         last_name=decoded.get("family_name") or "",
         provider=provider,
         userid=sub,
-        password=hash_password(sub),
-    )
+        password=await run_blocking(hash_password, sub),
+    ), change_log.USER)
 
     return {
         "message": "Auth0 login successful",
         "user_id": user_data.id,
         "email": email,
         "provider": provider,
-        "next_step": "choose_role"
+        "next_step": "choose_role",
+        **issue_tokens(user_data),
     }
 
 
-@router.get("/auth0/callback")
-def auth0_callback(code: str = None, error: str = None, error_description: str = None):
+@router.get("/auth0/callback", response_model=Auth0LoginResponse)
+async def auth0_callback(code: str = None, error: str = None, error_description: str = None):
 
     if error:
         raise HTTPException(400, f"Auth0 Error: {error} – {error_description}")
@@ -340,4 +403,4 @@ def auth0_callback(code: str = None, error: str = None, error_description: str =
     if not code:
         raise HTTPException(400, "Missing 'code' parameter")
 
-    return _auth0_callback_logic(code)
+    return await _auth0_callback_logic(code)
@@ -0,0 +1,110 @@
+import fastapi_app.django_setup
+
+from fastapi import APIRouter, File, Form, Header, HTTPException, UploadFile
+from fastapi.responses import FileResponse
+from django.conf import settings
+
+from creator_app import tasks
+from creator_app.bulk_import import detect_format
+from creator_app.models import Job
+from fastapi_app.async_db import run_blocking
+
+import os
+import shutil
+import tempfile
+import uuid
+from dotenv import load_dotenv
+
+load_dotenv()
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+BULK_IMPORT_API_KEY = os.getenv("BULK_IMPORT_API_KEY")
+# Imports run on the job workers (creator_app/tasks.py), and their state is the
+# job row, so any API process can answer for any import. Uploads and reports
+# live here: the API and the workers must share this directory.
+REPORT_DIR = os.path.join(settings.BASE_DIR, "import_reports")
+UPLOAD_DIR = os.path.join(REPORT_DIR, "uploads")
+
+
+def _check_key(key: str | None):
+    if not BULK_IMPORT_API_KEY:
+        raise HTTPException(403, "Bulk import is disabled")
+    if key != BULK_IMPORT_API_KEY:
+        raise HTTPException(403, "Invalid import key")
+
+
+async def _get_import(import_id: int):
+    job = await Job.objects.filter(id=import_id, task=tasks.import_profiles.name).afirst()
+    if job is None:
+        raise HTTPException(404, "Import not found")
+    return job
+
+
+def _spool_upload(src, fmt: str):
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, upload_path = tempfile.mkstemp(suffix=f".{fmt}", dir=UPLOAD_DIR)
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(src, out, length=1024 * 1024)
+    return upload_path
+
+
+# ------------------------------
+# START IMPORT (CSV / NDJSON)
+# ------------------------------
+@router.post("/profiles")
+async def import_profiles(
+    file: UploadFile = File(...),
+    mode: str = Form("insert"),
+    format: str | None = Form(None),
+    x_import_key: str | None = Header(None),
+):
+    _check_key(x_import_key)
+
+    if mode not in ("insert", "upsert"):
+        raise HTTPException(400, "mode must be 'insert' or 'upsert'")
+
+    fmt = format or detect_format(file.filename)
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(400, "format must be 'csv' or 'ndjson'")
+
+    # Spool the upload to disk in chunks; a job worker runs the import.
+    upload_path = await run_blocking(_spool_upload, file.file, fmt)
+
+    job = await tasks.import_profiles.aenqueue(
+        upload_path=upload_path,
+        fmt=fmt,
+        mode=mode,
+        report_path=os.path.join(REPORT_DIR, f"{uuid.uuid4().hex}.csv"),
+    )
+
+    return {"import_id": job.id, "status": job.status}
+
+
+# ------------------------------
+# IMPORT STATUS
+# ------------------------------
+@router.get("/{import_id}")
+async def import_status(import_id: int, x_import_key: str | None = Header(None)):
+    _check_key(x_import_key)
+
+    job = await _get_import(import_id)
+    status = {"import_id": job.id, "status": job.status, **(job.result or {})}
+    if job.status == Job.FAILED and job.last_error:
+        # Last line of the traceback: the exception itself.
+        status["error"] = job.last_error.strip().splitlines()[-1]
+    return status
+
+
+# ------------------------------
+# DOWNLOAD ERROR REPORT
+# ------------------------------
+@router.get("/{import_id}/errors")
+async def import_errors(import_id: int, x_import_key: str | None = Header(None)):
+    _check_key(x_import_key)
+
+    report_path = (await _get_import(import_id)).payload["report_path"]
+    if not os.path.exists(report_path):
+        raise HTTPException(404, "Report not found")
+
+    return FileResponse(report_path, media_type="text/csv", filename=f"import-{import_id}-errors.csv")
@@ -0,0 +1,59 @@
+import fastapi_app.django_setup
+import os
+from datetime import timedelta
+from typing import Literal
+
+from django.utils import timezone
+from fastapi import APIRouter, Header, HTTPException, Query
+
+from creator_app.models import ChangeLog
+from fastapi_app.responses import json_rows
+from fastapi_app.schemas import ChangesOut
+
+# Served from the primary. CHANGES_SETTLE only covers commit delays there: a
+# replica lagging by more than the window may already show a newer entry
+# while an older one is still on its way, and a tail would step over it.
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+# The feed names every profile that changes; it is for back-end consumers
+# (search indexers, caches) holding this key, not for app clients.
+CHANGES_API_KEY = os.getenv("CHANGES_API_KEY")
+CHANGES_PAGE_MAX = int(os.getenv("CHANGES_PAGE_MAX", 1000))
+# Ids are handed out at INSERT but become visible at COMMIT, so a fresh entry
+# can show up behind a newer one. Holding back the last moment of the log
+# keeps a tail from stepping over one that is still committing.
+CHANGES_SETTLE = timedelta(seconds=float(os.getenv("CHANGES_SETTLE_SECONDS", 2)))
+
+
+def _check_key(key: str | None):
+    if not CHANGES_API_KEY:
+        raise HTTPException(403, "Change feed is disabled")
+    if key != CHANGES_API_KEY:
+        raise HTTPException(403, "Invalid changes key")
+
+
+# ------------------------------------------------
+# Tail the profile change log
+# ------------------------------------------------
+@router.get("", response_model=ChangesOut)
+async def list_changes(
+    after: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=CHANGES_PAGE_MAX),
+    entity: list[Literal["user", "creator", "collaborator"]] | None = Query(None),
+    x_changes_key: str | None = Header(None),
+):
+    """
+    Entries with id > `after`, oldest first. Pass `next` back as `after`;
+    re-read the named rows from /profile, /creator or /collaborator.
+    """
+    _check_key(x_changes_key)
+
+    entries = ChangeLog.objects.filter(id__gt=after, created_at__lte=timezone.now() - CHANGES_SETTLE)
+    if entity:
+        entries = entries.filter(entity__in=entity)
+    rows = [
+        row async for row in entries.order_by("id").values("id", "entity", "object_id", "op", "created_at")[:limit + 1]
+    ]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return json_rows({"changes": rows, "next": rows[-1]["id"] if rows else after, "has_more": has_more})
@@ -1,19 +1,44 @@
 import fastapi_app.django_setup
 
+from datetime import datetime
+from decimal import Decimal
 from typing import Optional
-from django.db.models import Q
-from fastapi import APIRouter, HTTPException, Query
+from django.db.models import F, Q
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
 
+from creator_app import change_log, stats
 from creator_app.models import UserData, CollaboratorProfile
+from fastapi_app.conditional import PUBLIC_PROFILE_CACHE, conditional_update, conditional_values
+from fastapi_app.db_routing import read_replica
+from fastapi_app.responses import json_rows
+from fastapi_app.schemas import (
+    CollaboratorListItem, CollaboratorProfileOut, CollaboratorSearchItem, ProfileSaved, ProfileUpdated,
+    StatusMessage,
+)
+from fastapi_app.security import authorize_user
+from fastapi_app.user_cards import invalidate_user_card
 
 router = APIRouter(prefix="/collaborator", tags=["Collaborator"])
 
+# Columns each response reads; rows come straight from values(), no model instances.
+LIST_FIELDS = ("user_id", "name", "skill_category", "location")
+SEARCH_FIELDS = (
+    "id", "name", "skill_category", "pricing_amount", "pricing_unit", "location",
+    "experience", "language", "availability", "social_link", "portfolio_link",
+)
+PROFILE_FIELDS = (
+    "user_id", "name", "language", "skill_category", "experience", "pricing_amount",
+    "pricing_unit", "availability", "timing", "social_link", "portfolio_link", "badges",
+    "skills_rating", "about", "location",
+)
+
 
 # ------------------------------------------------
 # FILTER COLLABORATORS  (ADDED — NOTHING REMOVED)
 # ------------------------------------------------
-@router.get("/search")
-def search_collaborators(
+@router.get("/search", response_model=list[CollaboratorSearchItem], dependencies=[Depends(read_replica)])
+async def search_collaborators(
     search: Optional[str] = None,
     skill_category: Optional[str] = None,
     location: Optional[str] = None,
@@ -52,29 +77,18 @@ def search_collaborators(
     if availability:
         profiles = profiles.filter(availability__iexact=availability)
 
-    return [
-        {
-            "id": p.id,
-            "email": p.user.email,
-            "name": p.name,
-            "skill_category": p.skill_category,
-            "pricing": f"{p.pricing_amount} {p.pricing_unit}",
-            "location": p.location,
-            "experience": p.experience,
-            "language": p.language,
-            "availability": p.availability,
-            "social_link": p.social_link,
-            "portfolio_link": p.portfolio_link,
-        }
-        for p in profiles
-    ]
+    rows = []
+    async for row in profiles.values(*SEARCH_FIELDS, email=F("user__email")):
+        row["pricing"] = f"{row.pop('pricing_amount')} {row.pop('pricing_unit')}"
+        rows.append(row)
+    return json_rows(rows)
 
 
 # ------------------------------------------------
 # Create / Update Collaborator Profile (USER ID VERSION)
 # ------------------------------------------------
-@router.post("/save/{user_id}")
-def save_collaborator_profile(
+@router.post("/save/{user_id}", response_model=ProfileSaved, dependencies=[Depends(authorize_user)])
+async def save_collaborator_profile(
     user_id: int,
     name: str,
     language: str,
@@ -92,32 +106,39 @@ def save_collaborator_profile(
     location: str | None = None,
 ):
     try:
-        user = UserData.objects.get(id=user_id)
+        user = await UserData.objects.aget(id=user_id)
     except UserData.DoesNotExist:
         raise HTTPException(status_code=404, detail="User not found")
 
-    profile, created = CollaboratorProfile.objects.update_or_create(
-        user=user,
-        defaults={
-            "name": name,
-            "language": language,
-            "skill_category": skill_category,
-            "experience": experience,
-            "pricing_amount": pricing_amount,
-            "pricing_unit": pricing_unit,
-            "availability": availability,
-            "timing": timing,
-            "social_link": social_link,
-            "portfolio_link": portfolio_link,
-            "badges": badges,
-            "skills_rating": skills_rating,
-            "about": about,
-            "location": location,
-        },
-    )
+    old = await CollaboratorProfile.objects.filter(user_id=user_id).values(*stats.COLLABORATOR_FIELDS).afirst()
+    defaults = {
+        "name": name,
+        "language": language,
+        "skill_category": skill_category,
+        "experience": experience,
+        "pricing_amount": pricing_amount,
+        "pricing_unit": pricing_unit,
+        "availability": availability,
+        "timing": timing,
+        "social_link": social_link,
+        "portfolio_link": portfolio_link,
+        "badges": badges,
+        "skills_rating": skills_rating,
+        "about": about,
+        "location": location,
+    }
 
-    user.role = "collaborator"
-    user.save()
+    def write():
+        saved = CollaboratorProfile.objects.update_or_create(user=user, defaults=defaults)
+        user.role = "collaborator"
+        user.save(update_fields=["role", "updated_at"])
+        return saved
+
+    profile, created = await change_log.awrite(
+        write, change_log.upsert(change_log.COLLABORATOR, user_id), change_log.upsert(change_log.USER, user_id),
+    )
+    invalidate_user_card(user_id)
+    stats.track(stats.collaborator_keys(old), stats.collaborator_keys(stats.stat_row(profile, stats.COLLABORATOR_FIELDS)))
 
     return {"message": "Collaborator profile saved", "created": created}
 
@@ -125,62 +146,40 @@ def save_collaborator_profile(
 # ------------------------------------------------
 # Get Collaborator Profile by USER ID
 # ------------------------------------------------
-@router.get("/get/{user_id}")
-def get_collaborator_profile(user_id: int):
-    try:
-        user = UserData.objects.get(id=user_id)
-        profile = CollaboratorProfile.objects.get(user=user)
-    except (UserData.DoesNotExist, CollaboratorProfile.DoesNotExist):
+@router.get("/get/{user_id}", response_model=CollaboratorProfileOut, dependencies=[Depends(read_replica)])
+async def get_collaborator_profile(user_id: int, request: Request, response: Response):
+    profile = await conditional_values(
+        request, response, CollaboratorProfile.objects.filter(user_id=user_id),
+        kind="collaborator", pk=user_id, versions=("updated_at", "user__updated_at"),
+        cache_control=PUBLIC_PROFILE_CACHE, fields=PROFILE_FIELDS, email=F("user__email"),
+    )
+    if profile is None:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    return {
-        "user_id": user_id,
-        "email": user.email,
-        "name": profile.name,
-        "language": profile.language,
-        "skill_category": profile.skill_category,
-        "experience": profile.experience,
-        "pricing_amount": profile.pricing_amount,
-        "pricing_unit": profile.pricing_unit,
-        "availability": profile.availability,
-        "timing": profile.timing,
-        "social_link": profile.social_link,
-        "portfolio_link": profile.portfolio_link,
-        "badges": profile.badges,
-        "skills_rating": profile.skills_rating,
-        "about": profile.about,
-        "location": profile.location,
-    }
+    return profile
 
 
 # ------------------------------------------------
 # List All Collaborators
 # ------------------------------------------------
-@router.get("/list")
-def list_collaborators():
-    profiles = CollaboratorProfile.objects.all()
-    return [
-        {
-            "user_id": p.user.id,
-            "email": p.user.email,
-            "name": p.name,
-            "skill_category": p.skill_category,
-            "location": p.location,
-        }
-        for p in profiles
-    ]
+@router.get("/list", response_model=list[CollaboratorListItem], dependencies=[Depends(read_replica)])
+async def list_collaborators():
+    rows = CollaboratorProfile.objects.values(*LIST_FIELDS, email=F("user__email"))
+    return json_rows([row async for row in rows])
 
 
 # ------------------------------------------------
 # Delete Collaborator Profile by USER ID
 # ------------------------------------------------
-@router.delete("/delete/{user_id}")
-def delete_collaborator_profile(user_id: int):
-    try:
-        user = UserData.objects.get(id=user_id)
-        CollaboratorProfile.objects.get(user=user).delete()
-    except (UserData.DoesNotExist, CollaboratorProfile.DoesNotExist):
+@router.delete("/delete/{user_id}", response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def delete_collaborator_profile(user_id: int):
+    profiles = CollaboratorProfile.objects.filter(user_id=user_id)
+    old = await profiles.values(*stats.COLLABORATOR_FIELDS).afirst()
+    deleted = await change_log.awrite(lambda: profiles.delete()[0], change_log.delete(change_log.COLLABORATOR, user_id))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Profile not found")
+    invalidate_user_card(user_id)
+    stats.track(stats.collaborator_keys(old), [])
 
     return {"message": "Collaborator profile deleted"}
 
@@ -188,8 +187,8 @@ def delete_collaborator_profile(user_id: int):
 # ------------------------------------------------
 # Edit Collaborator Profile (USER ID VERSION)
 # ------------------------------------------------
-@router.put("/edit/{user_id}")
-def edit_collaborator_profile(
+@router.put("/edit/{user_id}", response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def edit_collaborator_profile(
     user_id: int,
     name: str | None = None,
     language: str | None = None,
@@ -207,26 +206,72 @@ def edit_collaborator_profile(
     location: str | None = None,
 ):
     try:
-        user = UserData.objects.get(id=user_id)
-        profile = CollaboratorProfile.objects.get(user=user)
-    except (UserData.DoesNotExist, CollaboratorProfile.DoesNotExist):
+        profile = await CollaboratorProfile.objects.aget(user_id=user_id)
+    except CollaboratorProfile.DoesNotExist:
         raise HTTPException(status_code=404, detail="Collaborator profile not found")
 
-    if name is not None: profile.name = name
-    if language is not None: profile.language = language
-    if skill_category is not None: profile.skill_category = skill_category
-    if experience is not None: profile.experience = experience
-    if pricing_amount is not None: profile.pricing_amount = pricing_amount
-    if pricing_unit is not None: profile.pricing_unit = pricing_unit
-    if availability is not None: profile.availability = availability
-    if timing is not None: profile.timing = timing
-    if social_link is not None: profile.social_link = social_link
-    if portfolio_link is not None: profile.portfolio_link = portfolio_link
-    if badges is not None: profile.badges = badges
-    if skills_rating is not None: profile.skills_rating = skills_rating
-    if about is not None: profile.about = about
-    if location is not None: profile.location = location
-
-    profile.save()
+    changes = {
+        "name": name, "language": language, "skill_category": skill_category,
+        "experience": experience, "pricing_amount": pricing_amount, "pricing_unit": pricing_unit,
+        "availability": availability, "timing": timing, "social_link": social_link,
+        "portfolio_link": portfolio_link, "badges": badges, "skills_rating": skills_rating,
+        "about": about, "location": location,
+    }
+    changed = [field for field, value in changes.items() if value is not None]
+    old = stats.stat_row(profile, stats.COLLABORATOR_FIELDS)
+    for field in changed:
+        setattr(profile, field, changes[field])
+
+    if changed:
+        await change_log.awrite(
+            lambda: profile.save(update_fields=[*changed, "updated_at"]), change_log.upsert(change_log.COLLABORATOR, user_id),
+        )
+        stats.track(stats.collaborator_keys(old), stats.collaborator_keys(stats.stat_row(profile, stats.COLLABORATOR_FIELDS)))
+    invalidate_user_card(user_id)
 
     return {"message": "Collaborator profile updated successfully"}
+
+
+# ------------------------------------------------
+# Partial Update Collaborator Profile (JSON, optimistic concurrency)
+# ------------------------------------------------
+class CollaboratorProfilePatch(BaseModel):
+    name: str | None = None
+    language: str | None = None
+    skill_category: str | None = None
+    experience: str | None = None
+    pricing_amount: Decimal | None = None
+    pricing_unit: str | None = None
+    availability: str | None = None
+    timing: str | None = None
+    social_link: str | None = None
+    portfolio_link: str | None = None
+    badges: str | None = None
+    skills_rating: int | None = None
+    about: str | None = None
+    location: str | None = None
+    # Precondition alternative to If-Match: the updated_at from the last write.
+    updated_at: datetime | None = None
+
+
+@router.patch("/edit/{user_id}", response_model=ProfileUpdated, dependencies=[Depends(authorize_user)])
+async def patch_collaborator_profile(user_id: int, payload: CollaboratorProfilePatch, request: Request, response: Response):
+    """Write only the fields sent (null clears optional ones); 412 if the profile changed meanwhile."""
+    changes = payload.model_dump(exclude_unset=True, exclude={"updated_at"})
+    profiles = CollaboratorProfile.objects.filter(user_id=user_id)
+    # Only edits to counted fields need the old values for the stats delta.
+    old = None
+    if changes.keys() & set(stats.COLLABORATOR_FIELDS):
+        old = await profiles.values(*stats.COLLABORATOR_FIELDS).afirst()
+    updated_at = await conditional_update(
+        request, response, profiles,
+        kind="collaborator", pk=user_id, versions=("updated_at", "user__updated_at"),
+        changes=changes, expected=payload.updated_at, log=[change_log.upsert(change_log.COLLABORATOR, user_id)],
+    )
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Collaborator profile not found")
+    invalidate_user_card(user_id)
+    if old is not None:
+        stats.track(stats.collaborator_keys(old), stats.collaborator_keys({**old, **changes}))
+
+    return {"message": "Collaborator profile updated successfully", "updated_at": updated_at}
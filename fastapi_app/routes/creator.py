@@ -1,19 +1,39 @@
 import fastapi_app.django_setup
 
+from datetime import datetime
 from typing import Optional, List
-from django.db.models import Q
-from fastapi import APIRouter, HTTPException, Query
+from django.db.models import F, Q
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel
 
+from creator_app import change_log, stats
 from creator_app.models import UserData, CreatorProfile
+from fastapi_app.conditional import PUBLIC_PROFILE_CACHE, conditional_update, conditional_values
+from fastapi_app.db_routing import read_replica
+from fastapi_app.responses import json_rows
+from fastapi_app.schemas import (
+    CreatorListItem, CreatorProfileOut, CreatorSearchItem, ProfileSaved, ProfileUpdated, StatusMessage,
+)
+from fastapi_app.security import authorize_user
+from fastapi_app.user_cards import invalidate_user_card
 
 router = APIRouter(prefix="/creator", tags=["Creator"])
 
+# Columns each response reads; rows come straight from values(), no model instances.
+LIST_FIELDS = ("user_id", "creator_name", "creator_type", "primary_niche", "location", "followers")
+SEARCH_FIELDS = LIST_FIELDS + ("platforms", "experience_level", "collaboration_type", "project_type")
+PROFILE_FIELDS = (
+    "user_id", "creator_name", "creator_type", "experience_level", "primary_niche",
+    "secondary_niche", "platforms", "followers", "portfolio_category", "portfolio_link",
+    "collaboration_type", "project_type", "location",
+)
+
 
 # ------------------------------------------------
 # FILTER CREATORS  (ADDED — NOTHING REMOVED)
 # ------------------------------------------------
-@router.get("/search")
-def search_creators(
+@router.get("/search", response_model=list[CreatorSearchItem], dependencies=[Depends(read_replica)])
+async def search_creators(
     search: Optional[str] = None,
     niche: Optional[str] = None,
     creator_type: Optional[str] = None,
@@ -62,29 +82,15 @@ def search_creators(
             q |= Q(platforms__icontains=p)
         profiles = profiles.filter(q)
 
-    return [
-        {
-            "user_id": p.user.id,
-            "email": p.user.email,
-            "creator_name": p.creator_name,
-            "creator_type": p.creator_type,
-            "primary_niche": p.primary_niche,
-            "location": p.location,
-            "followers": p.followers,
-            "platforms": p.platforms,
-            "experience_level": p.experience_level,
-            "collaboration_type": p.collaboration_type,
-            "project_type": p.project_type,
-        }
-        for p in profiles
-    ]
+    rows = profiles.values(*SEARCH_FIELDS, email=F("user__email"))
+    return json_rows([row async for row in rows])
 
 
 # ------------------------------------------------
 # Create / Update Creator Profile (USER ID VERSION)
 # ------------------------------------------------
-@router.post("/save/{user_id}")
-def save_creator_profile(
+@router.post("/save/{user_id}", response_model=ProfileSaved, dependencies=[Depends(authorize_user)])
+async def save_creator_profile(
     user_id: int,
     creator_name: str,
     creator_type: str,
@@ -100,30 +106,37 @@ def save_creator_profile(
     location: str | None = None,
 ):
     try:
-        user = UserData.objects.get(id=user_id)
+        user = await UserData.objects.aget(id=user_id)
     except UserData.DoesNotExist:
         raise HTTPException(status_code=404, detail="User not found")
 
-    profile, created = CreatorProfile.objects.update_or_create(
-        user=user,
-        defaults={
-            "creator_name": creator_name,
-            "creator_type": creator_type,
-            "experience_level": experience_level,
-            "primary_niche": primary_niche,
-            "secondary_niche": secondary_niche,
-            "platforms": platforms,
-            "followers": followers,
-            "portfolio_category": portfolio_category,
-            "portfolio_link": portfolio_link,
-            "collaboration_type": collaboration_type,
-            "project_type": project_type,
-            "location": location,
-        },
-    )
+    old = await CreatorProfile.objects.filter(user_id=user_id).values(*stats.CREATOR_FIELDS).afirst()
+    defaults = {
+        "creator_name": creator_name,
+        "creator_type": creator_type,
+        "experience_level": experience_level,
+        "primary_niche": primary_niche,
+        "secondary_niche": secondary_niche,
+        "platforms": platforms,
+        "followers": followers,
+        "portfolio_category": portfolio_category,
+        "portfolio_link": portfolio_link,
+        "collaboration_type": collaboration_type,
+        "project_type": project_type,
+        "location": location,
+    }
 
-    user.role = "creator"
-    user.save()
+    def write():
+        saved = CreatorProfile.objects.update_or_create(user=user, defaults=defaults)
+        user.role = "creator"
+        user.save(update_fields=["role", "updated_at"])
+        return saved
+
+    profile, created = await change_log.awrite(
+        write, change_log.upsert(change_log.CREATOR, user_id), change_log.upsert(change_log.USER, user_id),
+    )
+    invalidate_user_card(user_id)
+    stats.track(stats.creator_keys(old), stats.creator_keys(stats.stat_row(profile, stats.CREATOR_FIELDS)))
 
     return {"message": "Creator profile saved", "created": created}
 
@@ -131,63 +144,40 @@ def save_creator_profile(
 # ------------------------------------------------
 # Get Creator Profile by USER ID
 # ------------------------------------------------
-@router.get("/get/{user_id}")
-def get_creator_profile(user_id: int):
-    try:
-        user = UserData.objects.get(id=user_id)
-        profile = CreatorProfile.objects.get(user=user)
-    except (UserData.DoesNotExist, CreatorProfile.DoesNotExist):
+@router.get("/get/{user_id}", response_model=CreatorProfileOut, dependencies=[Depends(read_replica)])
+async def get_creator_profile(user_id: int, request: Request, response: Response):
+    profile = await conditional_values(
+        request, response, CreatorProfile.objects.filter(user_id=user_id),
+        kind="creator", pk=user_id, versions=("updated_at", "user__updated_at"),
+        cache_control=PUBLIC_PROFILE_CACHE, fields=PROFILE_FIELDS, email=F("user__email"),
+    )
+    if profile is None:
         raise HTTPException(status_code=404, detail="Creator profile not found")
 
-    return {
-        "user_id": user_id,
-        "email": user.email,
-        "creator_name": profile.creator_name,
-        "creator_type": profile.creator_type,
-        "experience_level": profile.experience_level,
-        "primary_niche": profile.primary_niche,
-        "secondary_niche": profile.secondary_niche,
-        "platforms": profile.platforms,
-        "followers": profile.followers,
-        "portfolio_category": profile.portfolio_category,
-        "portfolio_link": profile.portfolio_link,
-        "collaboration_type": profile.collaboration_type,
-        "project_type": profile.project_type,
-        "location": profile.location,
-    }
+    return profile
 
 
 # ------------------------------------------------
 # List All Creators
 # ------------------------------------------------
-@router.get("/list")
-def list_creators():
-    profiles = CreatorProfile.objects.all()
-
-    return [
-        {
-            "user_id": p.user.id,
-            "email": p.user.email,
-            "creator_name": p.creator_name,
-            "creator_type": p.creator_type,
-            "primary_niche": p.primary_niche,
-            "location": p.location,
-            "followers": p.followers,
-        }
-        for p in profiles
-    ]
+@router.get("/list", response_model=list[CreatorListItem], dependencies=[Depends(read_replica)])
+async def list_creators():
+    rows = CreatorProfile.objects.values(*LIST_FIELDS, email=F("user__email"))
+    return json_rows([row async for row in rows])
 
 
 # ------------------------------------------------
 # Delete Creator Profile by USER ID
 # ------------------------------------------------
-@router.delete("/delete/{user_id}")
-def delete_creator_profile(user_id: int):
-    try:
-        user = UserData.objects.get(id=user_id)
-        CreatorProfile.objects.get(user=user).delete()
-    except (UserData.DoesNotExist, CreatorProfile.DoesNotExist):
+@router.delete("/delete/{user_id}", response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def delete_creator_profile(user_id: int):
+    profiles = CreatorProfile.objects.filter(user_id=user_id)
+    old = await profiles.values(*stats.CREATOR_FIELDS).afirst()
+    deleted = await change_log.awrite(lambda: profiles.delete()[0], change_log.delete(change_log.CREATOR, user_id))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Creator profile not found")
+    invalidate_user_card(user_id)
+    stats.track(stats.creator_keys(old), [])
 
     return {"message": "Creator profile deleted"}
 
@@ -195,8 +185,8 @@ def delete_creator_profile(user_id: int):
 # ------------------------------------------------
 # Edit Creator Profile (USER ID VERSION)
 # ------------------------------------------------
-@router.put("/edit/{user_id}")
-def edit_creator_profile(
+@router.put("/edit/{user_id}", response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def edit_creator_profile(
     user_id: int,
     creator_name: str | None = None,
     creator_type: str | None = None,
@@ -212,24 +202,70 @@ def edit_creator_profile(
     location: str | None = None,
 ):
     try:
-        user = UserData.objects.get(id=user_id)
-        profile = CreatorProfile.objects.get(user=user)
-    except (UserData.DoesNotExist, CreatorProfile.DoesNotExist):
+        profile = await CreatorProfile.objects.aget(user_id=user_id)
+    except CreatorProfile.DoesNotExist:
         raise HTTPException(status_code=404, detail="Creator profile not found")
 
-    if creator_name is not None: profile.creator_name = creator_name
-    if creator_type is not None: profile.creator_type = creator_type
-    if experience_level is not None: profile.experience_level = experience_level
-    if primary_niche is not None: profile.primary_niche = primary_niche
-    if secondary_niche is not None: profile.secondary_niche = secondary_niche
-    if platforms is not None: profile.platforms = platforms
-    if followers is not None: profile.followers = followers
-    if portfolio_category is not None: profile.portfolio_category = portfolio_category
-    if portfolio_link is not None: profile.portfolio_link = portfolio_link
-    if collaboration_type is not None: profile.collaboration_type = collaboration_type
-    if project_type is not None: profile.project_type = project_type
-    if location is not None: profile.location = location
-
-    profile.save()
+    changes = {
+        "creator_name": creator_name, "creator_type": creator_type,
+        "experience_level": experience_level, "primary_niche": primary_niche,
+        "secondary_niche": secondary_niche, "platforms": platforms, "followers": followers,
+        "portfolio_category": portfolio_category, "portfolio_link": portfolio_link,
+        "collaboration_type": collaboration_type, "project_type": project_type, "location": location,
+    }
+    changed = [name for name, value in changes.items() if value is not None]
+    old = stats.stat_row(profile, stats.CREATOR_FIELDS)
+    for name in changed:
+        setattr(profile, name, changes[name])
+
+    if changed:
+        await change_log.awrite(
+            lambda: profile.save(update_fields=[*changed, "updated_at"]), change_log.upsert(change_log.CREATOR, user_id),
+        )
+        stats.track(stats.creator_keys(old), stats.creator_keys(stats.stat_row(profile, stats.CREATOR_FIELDS)))
+    invalidate_user_card(user_id)
 
     return {"message": "Creator profile updated successfully"}
+
+
+# ------------------------------------------------
+# Partial Update Creator Profile (JSON, optimistic concurrency)
+# ------------------------------------------------
+class CreatorProfilePatch(BaseModel):
+    creator_name: str | None = None
+    creator_type: str | None = None
+    experience_level: str | None = None
+    primary_niche: str | None = None
+    secondary_niche: str | None = None
+    platforms: str | None = None
+    followers: int | None = None
+    portfolio_category: str | None = None
+    portfolio_link: str | None = None
+    collaboration_type: str | None = None
+    project_type: str | None = None
+    location: str | None = None
+    # Precondition alternative to If-Match: the updated_at from the last write.
+    updated_at: datetime | None = None
+
+
+@router.patch("/edit/{user_id}", response_model=ProfileUpdated, dependencies=[Depends(authorize_user)])
+async def patch_creator_profile(user_id: int, payload: CreatorProfilePatch, request: Request, response: Response):
+    """Write only the fields sent (null clears optional ones); 412 if the profile changed meanwhile."""
+    changes = payload.model_dump(exclude_unset=True, exclude={"updated_at"})
+    profiles = CreatorProfile.objects.filter(user_id=user_id)
+    # Only edits to counted fields need the old values for the stats delta.
+    old = None
+    if changes.keys() & set(stats.CREATOR_FIELDS):
+        old = await profiles.values(*stats.CREATOR_FIELDS).afirst()
+    updated_at = await conditional_update(
+        request, response, profiles,
+        kind="creator", pk=user_id, versions=("updated_at", "user__updated_at"),
+        changes=changes, expected=payload.updated_at, log=[change_log.upsert(change_log.CREATOR, user_id)],
+    )
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Creator profile not found")
+    invalidate_user_card(user_id)
+    if old is not None:
+        stats.track(stats.creator_keys(old), stats.creator_keys({**old, **changes}))
+
+    return {"message": "Creator profile updated successfully", "updated_at": updated_at}
@@ -0,0 +1,242 @@
+import fastapi_app.django_setup
+
+import os
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
+from pydantic import BaseModel, Field
+
+from creator_app import messaging
+from creator_app.models import Conversation, ConversationParticipant, Message, UserData
+from fastapi_app.db_routing import read_replica
+from fastapi_app.idempotency import IDEMPOTENCY_KEY_MAX_LENGTH
+from fastapi_app.responses import json_rows
+from fastapi_app.routes.message import (
+    MESSAGE_FIELDS, idempotency_key_for, message_out, replay_sent, store_message,
+)
+from fastapi_app.schemas import (
+    GroupMembersAdded, GroupMessages, GroupOut, GroupSummary, MessageSent, StatusMessage, StatusResponse,
+)
+from fastapi_app.security import authorize_user, check_user, get_token_claims
+from fastapi_app.user_cards import build_card, fetch_card_rows
+
+router = APIRouter(prefix="/group", tags=["Groups"])
+
+GROUP_PAGE_SIZE = int(os.getenv("GROUP_PAGE_SIZE", 50))
+GROUP_PAGE_MAX = 200
+
+
+# -------------------------------
+# Pydantic Schema
+# -------------------------------
+class GroupCreate(BaseModel):
+    owner_id: int
+    title: str | None = Field(None, max_length=255)
+    member_ids: list[int] = Field(default_factory=list, max_length=messaging.GROUP_MAX_MEMBERS)
+
+
+class GroupMembersAdd(BaseModel):
+    user_id: int     # acting user; must be the group's owner
+    member_ids: list[int] = Field(min_length=1, max_length=messaging.GROUP_MAX_MEMBERS)
+
+
+class GroupReceipt(BaseModel):
+    user_id: int
+    delivered_seq: int = Field(0, ge=0)
+    read_seq: int = Field(0, ge=0)
+
+
+# -------------------------------
+# Helper: membership check
+# -------------------------------
+async def member_role(conversation_id, user_id):
+    """The user's role in the group; 404 for no such group, 403 for non-members."""
+    role = await ConversationParticipant.objects.filter(
+        conversation_id=conversation_id, user_id=user_id,
+    ).values_list("role", flat=True).afirst()
+    if role is None:
+        if not await Conversation.objects.filter(id=conversation_id, is_group=True).aexists():
+            raise HTTPException(status_code=404, detail="Group not found")
+        raise HTTPException(status_code=403, detail="Not a member of this group")
+    return role
+
+
+async def check_users(ids):
+    ids = set(ids)
+    if await UserData.objects.filter(id__in=ids).acount() != len(ids):
+        raise HTTPException(status_code=404, detail="User not found")
+
+
+# -------------------------------
+# Create a group
+# -------------------------------
+@router.post("/create", response_model=GroupOut)
+async def create_group(payload: GroupCreate, request: Request, claims: dict = Depends(get_token_claims)):
+    check_user(claims, payload.owner_id)
+    await check_users([payload.owner_id, *payload.member_ids])
+    try:
+        group = await sync_to_async(messaging.create_group)(payload.owner_id, payload.title, payload.member_ids)
+    except messaging.GroupFull:
+        raise HTTPException(status_code=400, detail=f"Groups are limited to {messaging.GROUP_MAX_MEMBERS} members")
+    return await group_detail(group.id, request)
+
+
+# -------------------------------
+# List my groups with unread counts
+# -------------------------------
+@router.get("/list", response_model=list[GroupSummary], dependencies=[Depends(authorize_user), Depends(read_replica)])
+async def list_groups(user_id: int = Query(...)):
+    # Correlated subqueries on (conversation, seq) / (conversation, created_at):
+    # each group costs its unread rows plus one index probe, not its history.
+    unread = (
+        Message.objects.filter(conversation=OuterRef("conversation"), seq__gt=OuterRef("read_seq"))
+        .exclude(sender_id=user_id)
+        .order_by().values("conversation").annotate(n=Count("id")).values("n")
+    )
+    last_message = Message.objects.filter(conversation=OuterRef("conversation")).order_by("-created_at").values("created_at")[:1]
+    rows = ConversationParticipant.objects.filter(user_id=user_id).annotate(
+        unread=Coalesce(Subquery(unread, output_field=IntegerField()), 0),
+        last_message_time=Subquery(last_message),
+    ).order_by(F("last_message_time").desc(nulls_last=True), "-conversation_id").values(
+        "conversation_id", "read_seq", "unread", "last_message_time",
+        title=F("conversation__title"), seq=F("conversation__last_seq"),
+    )
+    return json_rows([row async for row in rows])
+
+
+# -------------------------------
+# Group details with member watermarks
+# -------------------------------
+async def group_detail(conversation_id, request):
+    group = await Conversation.objects.filter(id=conversation_id).values("title", "last_seq").aget()
+    members = [
+        row async for row in ConversationParticipant.objects.filter(conversation_id=conversation_id)
+        .order_by("id").values("user_id", "role", "delivered_seq", "read_seq")
+    ]
+    cards = await fetch_card_rows([m["user_id"] for m in members])
+    now = timezone.now()
+    return json_rows({
+        "conversation_id": conversation_id,
+        "title": group["title"],
+        "seq": group["last_seq"],
+        "members": [
+            {
+                "user": build_card(cards[m["user_id"]], request, now),
+                "role": m["role"],
+                "delivered_seq": m["delivered_seq"],
+                "read_seq": m["read_seq"],
+            }
+            for m in members if m["user_id"] in cards
+        ],
+    })
+
+
+@router.get("/{conversation_id}", response_model=GroupOut, dependencies=[Depends(authorize_user), Depends(read_replica)])
+async def get_group(conversation_id: int, request: Request, user_id: int = Query(...)):
+    await member_role(conversation_id, user_id)
+    return await group_detail(conversation_id, request)
+
+
+# -------------------------------
+# Members
+# -------------------------------
+@router.post("/{conversation_id}/members", response_model=GroupMembersAdded)
+async def add_members(conversation_id: int, payload: GroupMembersAdd, claims: dict = Depends(get_token_claims)):
+    check_user(claims, payload.user_id)
+    if await member_role(conversation_id, payload.user_id) != ConversationParticipant.OWNER:
+        raise HTTPException(status_code=403, detail="Only the group owner can add members")
+    await check_users(payload.member_ids)
+    try:
+        added = await sync_to_async(messaging.add_members)(conversation_id, payload.member_ids)
+    except messaging.GroupFull:
+        raise HTTPException(status_code=400, detail=f"Groups are limited to {messaging.GROUP_MAX_MEMBERS} members")
+    return {"message": "Members added", "added": added}
+
+
+@router.delete("/{conversation_id}/members/{member_id}", response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def remove_member(conversation_id: int, member_id: int, user_id: int = Query(...)):
+    """Members can leave; the owner can remove anyone but themselves."""
+    role = await member_role(conversation_id, user_id)
+    if member_id != user_id and role != ConversationParticipant.OWNER:
+        raise HTTPException(status_code=403, detail="Only the group owner can remove members")
+    if member_id == user_id and role == ConversationParticipant.OWNER:
+        raise HTTPException(status_code=400, detail="The owner cannot leave the group")
+    deleted, _ = await ConversationParticipant.objects.filter(conversation_id=conversation_id, user_id=member_id).adelete()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return {"message": "Member removed"}
+
+
+# -------------------------------
+# Send to a group (one Message row, whatever the size)
+# -------------------------------
+@router.post("/{conversation_id}/send", response_model=MessageSent)
+async def send_group_message(
+    conversation_id: int,
+    response: Response,
+    sender_id: int = Form(...),
+    content: str = Form(None),
+    reply_to: int = Form(None),
+    file: UploadFile = File(None),
+    client_message_id: str = Form(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH),
+    idempotency_key: str = Header(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH),
+    claims: dict = Depends(get_token_claims),
+):
+    check_user(claims, sender_id)
+    key = idempotency_key_for(idempotency_key, client_message_id)
+    if key and (sent := await replay_sent(response, sender_id, key)) is not None:
+        return sent
+
+    await member_role(conversation_id, sender_id)
+    sender = await UserData.objects.aget(id=sender_id)
+    await UserData.objects.filter(id=sender_id).aupdate(last_active=timezone.now(), is_typing=False, typing_with=None)
+    group = await Conversation.objects.aget(id=conversation_id)
+
+    # Members pick the message up through /message/sync; nothing is written per recipient.
+    return await store_message(response, group, sender, key, content, reply_to, file)
+
+
+# -------------------------------
+# History, newest page first
+# -------------------------------
+@router.get("/{conversation_id}/messages", response_model=GroupMessages, dependencies=[Depends(authorize_user), Depends(read_replica)])
+async def group_messages(
+    conversation_id: int,
+    request: Request,
+    user_id: int = Query(...),
+    before: int | None = Query(None, ge=1),
+    limit: int = Query(GROUP_PAGE_SIZE, ge=1, le=GROUP_PAGE_MAX),
+):
+    """A page of messages with seq < `before` (latest page without it), keyset-paginated on (conversation, seq)."""
+    await member_role(conversation_id, user_id)
+    messages = Message.objects.filter(conversation_id=conversation_id)
+    if before is not None:
+        messages = messages.filter(seq__lt=before)
+    rows = [
+        m async for m in messages.order_by("-seq", "-id").values(*MESSAGE_FIELDS, "seq", "seen_at")[:limit]
+    ]
+    rows.reverse()
+    return json_rows({
+        "conversation_id": conversation_id,
+        "messages": [
+            {**message_out(m, request), "conversation_id": conversation_id, "seq": m["seq"], "seen_at": m["seen_at"]}
+            for m in rows
+        ],
+        "before": rows[0]["seq"] if len(rows) == limit else None,
+    })
+
+
+# -------------------------------
+# Delivery / read receipts (watermarks)
+# -------------------------------
+@router.post("/{conversation_id}/receipt", response_model=StatusResponse)
+async def group_receipt(conversation_id: int, payload: GroupReceipt, claims: dict = Depends(get_token_claims)):
+    check_user(claims, payload.user_id)
+    await member_role(conversation_id, payload.user_id)
+    await sync_to_async(messaging.advance_watermarks)(
+        conversation_id, payload.user_id, delivered_seq=payload.delivered_seq, read_seq=payload.read_seq,
+    )
+    return {"status": "receipt updated"}
@@ -0,0 +1,107 @@
+import fastapi_app.django_setup
+
+import os
+
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.utils import timezone
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from creator_app.models import CollaboratorProfile, Conversation, CreatorProfile, Message
+from fastapi_app.async_db import gather_lanes
+from fastapi_app.db_routing import read_replica
+from fastapi_app.responses import json_rows
+from fastapi_app.routes import collaborator, creator
+from fastapi_app.schemas import HomeOut
+from fastapi_app.security import authorize_user
+from fastapi_app.user_cards import build_card, fetch_card_rows
+
+router = APIRouter(prefix="/home", tags=["Home"])
+
+HOME_INBOX_SIZE = int(os.getenv("HOME_INBOX_SIZE", 20))
+HOME_SUGGESTIONS = int(os.getenv("HOME_SUGGESTIONS", 10))
+
+
+# ------------------------------------------------
+# Sections
+# ------------------------------------------------
+async def role_profile(model, fields, user_id):
+    return await model.objects.filter(user_id=user_id).values(*fields, email=F("user__email")).afirst()
+
+
+async def inbox(user_id, request, now):
+    """The user's most recent conversations with unread counts, newest first."""
+    last_message = Message.objects.filter(conversation=OuterRef("pk")).order_by("-created_at").values("content")[:1]
+    rows = [
+        row async for row in Conversation.objects.filter(Q(user1_id=user_id) | Q(user2_id=user_id))
+        .annotate(
+            last_message_time=Max("messages__created_at"),
+            unread=Count("messages", filter=Q(messages__is_seen=False) & ~Q(messages__sender_id=user_id)),
+            last_message=Subquery(last_message),
+        )
+        .order_by(F("last_message_time").desc(nulls_last=True), "-id")
+        .values("id", "user1_id", "user2_id", "last_message", "last_message_time", "unread")[:HOME_INBOX_SIZE]
+    ]
+    for row in rows:
+        row["other_id"] = row["user2_id"] if row["user1_id"] == user_id else row["user1_id"]
+    cards = await fetch_card_rows([row["other_id"] for row in rows])
+    return [
+        {
+            "conversation_id": row["id"],
+            "user": build_card(cards[row["other_id"]], request, now),
+            "last_message": row["last_message"],
+            "last_message_time": row["last_message_time"],
+            "unread": row["unread"],
+        }
+        for row in rows if row["other_id"] in cards
+    ]
+
+
+async def suggestions(queryset, fields, user_id, order_by):
+    rows = queryset.exclude(user_id=user_id).order_by(order_by).values(*fields, email=F("user__email"))
+    return [row async for row in rows[:HOME_SUGGESTIONS]]
+
+
+async def nothing():
+    return None
+
+
+# ------------------------------------------------
+# Home screen in one request
+# ------------------------------------------------
+@router.get("/{user_id}", response_model=HomeOut, dependencies=[Depends(authorize_user), Depends(read_replica)])
+async def get_home(user_id: int, request: Request):
+    """
+    Everything the app shows at launch: the user's card, their role profile,
+    the top of the inbox and a first page of suggestions.
+
+    The card (usually an LRU hit) decides the role; the remaining sections
+    are independent queries and run concurrently, each on its own DB lane.
+    """
+    now = timezone.now()
+    cards = await fetch_card_rows([user_id])
+    if user_id not in cards:
+        raise HTTPException(status_code=404, detail="User not found")
+    card = build_card(cards[user_id], request, now)
+
+    is_creator = card["role"] == "creator"
+    if is_creator:
+        profile = role_profile(CreatorProfile, creator.PROFILE_FIELDS, user_id)
+        # Newest collaborators first.
+        suggested = suggestions(CollaboratorProfile.objects.all(), collaborator.LIST_FIELDS, user_id, "-id")
+    else:
+        collaborator_role = card["role"] == "collaborator"
+        profile = role_profile(CollaboratorProfile, collaborator.PROFILE_FIELDS, user_id) if collaborator_role else nothing()
+        # Most followed first, straight off the followers index.
+        creators = CreatorProfile.objects.filter(followers__isnull=False)
+        suggested = suggestions(creators, creator.LIST_FIELDS, user_id, "-followers")
+
+    profile, conversations, suggested = await gather_lanes(profile, inbox(user_id, request, now), suggested)
+
+    return json_rows({
+        "user": card,
+        "creator_profile": profile if is_creator else None,
+        "collaborator_profile": None if is_creator else profile,
+        "inbox": conversations,
+        "suggested_creators": [] if is_creator else suggested,
+        "suggested_collaborators": suggested if is_creator else [],
+    })
@@ -0,0 +1,41 @@
+import fastapi_app.django_setup
+import os
+import stat
+
+from django.conf import settings
+from fastapi import APIRouter, HTTPException
+
+from fastapi_app.async_db import run_blocking
+from fastapi_app.media import MediaFileResponse, cache_control_for, is_private, is_private_path, resolve, verify_signature
+
+router = APIRouter(tags=['Media'])
+
+
+def _stat_file(path):
+    try:
+        result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return result if stat.S_ISREG(result.st_mode) else None
+
+
+# ------------------------------
+# SERVE MEDIA FILE
+# ------------------------------
+@router.api_route(settings.MEDIA_URL + '{name:path}', methods=['GET', 'HEAD'], include_in_schema=False)
+async def serve_media(name: str, expires: str | None = None, signature: str | None = None):
+    path = resolve(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    signed_for = None
+    if settings.MEDIA_SIGNED_URLS and (is_private(name) or is_private_path(path)):
+        signed_for = verify_signature(name, expires, signature)
+        if signed_for is None:
+            raise HTTPException(status_code=403, detail="Invalid or expired media link")
+
+    stat_result = await run_blocking(_stat_file, path)
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    return MediaFileResponse(path, stat_result, cache_control_for(name, signed_for))
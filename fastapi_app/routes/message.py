@@ -1,16 +1,29 @@
-from fastapi_app.django_setup import setup_django
-setup_django()
+import fastapi_app.django_setup
 
-from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Header, Request, Response, Query
 from pydantic import BaseModel
-from django.db.models import Q
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError
+from django.db.models import OuterRef, Q, Subquery
 from django.utils import timezone
 from datetime import timedelta
-
-from creator_app.models import UserData, Conversation, Message
+import os
+
+from creator_app import messaging, stats, tasks
+from creator_app.models import UserData, Conversation, ConversationParticipant, Message
+from fastapi_app.async_db import run_blocking
+from fastapi_app.db_routing import read_replica
+from fastapi_app.idempotency import IDEMPOTENCY_KEY_MAX_LENGTH, REPLAYED_HEADER, sent_messages
+from fastapi_app.media import media_url
+from fastapi_app.responses import json_rows
+from fastapi_app.schemas import ConversationOut, InboxUser, MessageSent, StatusResponse, SyncOut
+from fastapi_app.security import authorize_user, check_user, get_token_claims
 
 router = APIRouter(prefix="/message", tags=["Messaging"])
 
+# Messages per /message/sync response; the rest comes on the next call.
+SYNC_MAX_MESSAGES = int(os.getenv("SYNC_MAX_MESSAGES", 1000))
+
 
 # -------------------------------
 # Pydantic Schema
@@ -24,60 +37,65 @@ class SendMessage(BaseModel):
 # -------------------------------
 # Helper: get or create conversation
 # -------------------------------
-def get_or_create_conversation(user1, user2):
-    convo = Conversation.objects.filter(
+async def get_or_create_conversation(user1, user2):
+    convo = await Conversation.objects.filter(
         Q(user1=user1, user2=user2) |
         Q(user1=user2, user2=user1)
-    ).first()
+    ).afirst()
 
     if convo:
         return convo
 
-    return Conversation.objects.create(user1=user1, user2=user2)
+    return await Conversation.objects.acreate(user1=user1, user2=user2)
 
 
 # -------------------------------
 # List users (for left panel)
 # -------------------------------
-@router.get("/users")
-def list_users(current_user_id: int = Query(...)):
-
-    users = UserData.objects.all()
+@router.get("/users", response_model=list[InboxUser], dependencies=[Depends(read_replica)])
+async def list_users(current_user_id: int = Query(...), claims: dict = Depends(get_token_claims)):
+    check_user(claims, current_user_id)
+
+    # The last message of each of the user's direct chats, in one query.
+    latest_msg = Message.objects.filter(conversation=OuterRef("pk")).order_by("-created_at")
+    convos = Conversation.objects.filter(
+        Q(user1_id=current_user_id) | Q(user2_id=current_user_id), is_group=False,
+    ).annotate(
+        last_content=Subquery(latest_msg.values("content")[:1]),
+        last_time=Subquery(latest_msg.values("created_at")[:1]),
+    ).values("user1_id", "user2_id", "last_content", "last_time")
+
+    last_by_user = {}
+    async for c in convos:
+        other_id = c["user2_id"] if c["user1_id"] == current_user_id else c["user1_id"]
+        seen = last_by_user.get(other_id)
+        if c["last_time"] and (seen is None or c["last_time"] > seen["created_at"]):
+            last_by_user[other_id] = {"content": c["last_content"], "created_at": c["last_time"]}
+
+    users = UserData.objects.exclude(id=current_user_id).values("id", "first_name", "email", "last_active")
     now = timezone.now()
     result = []
 
-    for u in users:
-        if not u.id:
-            continue
-        if u.id == current_user_id:
-            continue
-
+    async for u in users:
         # Online if active in last 60 seconds
         online = False
-        if u.last_active:
-            online = (now - u.last_active) <= timedelta(seconds=60)
+        if u["last_active"]:
+            online = (now - u["last_active"]) <= timedelta(seconds=60)
 
         # Last message preview
-        convo_qs = Conversation.objects.filter(
-            Q(user1_id=current_user_id, user2=u) |
-            Q(user1=u, user2_id=current_user_id)
-        )
-
-        last_msg = Message.objects.filter(
-            conversation__in=convo_qs
-        ).order_by("-created_at").first()
+        last_msg = last_by_user.get(u["id"])
 
-        display_name = (u.first_name or "") or (u.email or f"User {u.id}")
+        display_name = (u["first_name"] or "") or (u["email"] or f"User {u['id']}")
 
         result.append({
-            "id": u.id,
+            "id": u["id"],
             "name": display_name,
             "online": online,
-            "last_message": last_msg.content if last_msg else "",
-            "last_message_time": last_msg.created_at if last_msg else None,
+            "last_message": last_msg["content"] if last_msg else "",
+            "last_message_time": last_msg["created_at"] if last_msg else None,
         })
 
-    return result
+    return json_rows(result)
 
 
 # -------------------------------
@@ -89,9 +107,10 @@ class TypingPayload(BaseModel):
     is_typing: bool
 
 
-@router.post("/typing")
-def set_typing(payload: TypingPayload):
-    user = UserData.objects.filter(id=payload.user_id).first()
+@router.post("/typing", response_model=StatusResponse)
+async def set_typing(payload: TypingPayload, claims: dict = Depends(get_token_claims)):
+    check_user(claims, payload.user_id)
+    user = await UserData.objects.filter(id=payload.user_id).afirst()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -100,24 +119,119 @@ def set_typing(payload: TypingPayload):
     user.is_typing = payload.is_typing
     user.last_active = timezone.now()
 
-    user.save(update_fields=["is_typing", "typing_with", "last_active"])
+    await user.asave(update_fields=["is_typing", "typing_with", "last_active"])
 
     return {"status": "ok"}
 
 
+def _save_message_file(src, filename):
+    # Storage sanitizes the name and never overwrites; returns the stored name.
+    field = Message.file.field
+    return field.storage.save(field.generate_filename(None, os.path.basename(filename)), src)
+
+
+def _delete_message_file(name):
+    Message.file.field.storage.delete(name)
+
+
+SENT_FIELDS = ("id", "conversation_id", "reply_to_id", "created_at")
+
+
+def _sent_body(row):
+    return {
+        "status": "success",
+        "conversation_id": row["conversation_id"],
+        "message_id": row["id"],
+        "reply_to": row["reply_to_id"],
+        "created_at": row["created_at"],
+    }
+
+
+async def _find_sent(sender_id, key):
+    row = await Message.objects.filter(sender_id=sender_id, client_message_id=key).values(*SENT_FIELDS).afirst()
+    return None if row is None else _sent_body(row)
+
+
+def idempotency_key_for(idempotency_key, client_message_id):
+    if idempotency_key and client_message_id and idempotency_key != client_message_id:
+        raise HTTPException(status_code=400, detail="Idempotency-Key and client_message_id differ")
+    return idempotency_key or client_message_id
+
+
+async def replay_sent(response, sender_id, key):
+    """The original response for a retried send, or None for a new one."""
+    sent = sent_messages.get((sender_id, key)) or await _find_sent(sender_id, key)
+    if sent is not None:
+        sent_messages.set((sender_id, key), sent)
+        response.headers[REPLAYED_HEADER] = "true"
+    return sent
+
+
+async def store_message(response, convo, sender, key, content, reply_to, file):
+    """Write one message (and its attachment) to `convo`; returns the send response."""
+    reply_obj = None
+    if reply_to:
+        reply_obj = await Message.objects.filter(id=reply_to).afirst()
+
+    file_path = None
+    if file:
+        file_path = await run_blocking(_save_message_file, file.file, file.filename)
+
+    try:
+        msg = await sync_to_async(messaging.create_message)(
+            convo,
+            sender=sender,
+            content=content,
+            reply_to=reply_obj,
+            file=file_path,
+            client_message_id=key,
+        )
+    except IntegrityError:
+        # A concurrent retry with the same key got in first.
+        sent = await replay_sent(response, sender.id, key) if key else None
+        if sent is None:
+            raise
+        if file_path:
+            await run_blocking(_delete_message_file, file_path)
+        return sent
+    stats.track([], stats.message_keys(msg.created_at))
+
+    sent = _sent_body({
+        "id": msg.id,
+        "conversation_id": convo.id,
+        "reply_to_id": msg.reply_to_id,
+        "created_at": msg.created_at,
+    })
+    if key:
+        sent_messages.set((sender.id, key), sent)
+    return sent
+
+
 # -------------------------------
 # Send Message (supports reply + file)
 # -------------------------------
-@router.post("/send")
-def send_message(
+@router.post("/send", response_model=MessageSent)
+async def send_message(
+    response: Response,
     sender_id: int = Form(...),
     receiver_id: int = Form(...),
     content: str = Form(None),
     reply_to: int = Form(None),
-    file: UploadFile = File(None)
+    file: UploadFile = File(None),
+    client_message_id: str = Form(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH),
+    idempotency_key: str = Header(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH),
+    claims: dict = Depends(get_token_claims),
 ):
-    sender = UserData.objects.filter(id=sender_id).first()
-    receiver = UserData.objects.filter(id=receiver_id).first()
+    # Before the replay: a key must not hand out another sender's result.
+    check_user(claims, sender_id)
+
+    # Retries reuse the key; they get the original response and write nothing.
+    key = idempotency_key_for(idempotency_key, client_message_id)
+    if key and (sent := await replay_sent(response, sender_id, key)) is not None:
+        return sent
+
+    sender = await UserData.objects.filter(id=sender_id).afirst()
+    receiver = await UserData.objects.filter(id=receiver_id).afirst()
 
     if not sender or not receiver:
         raise HTTPException(status_code=404, detail="User not found")
@@ -126,142 +240,204 @@ def send_message(
     sender.last_active = timezone.now()
     sender.is_typing = False
     sender.typing_with = None
-    sender.save(update_fields=["last_active", "is_typing", "typing_with"])
+    await sender.asave(update_fields=["last_active", "is_typing", "typing_with"])
 
-    convo = get_or_create_conversation(sender, receiver)
+    convo = await get_or_create_conversation(sender, receiver)
 
-    reply_obj = None
-    if reply_to:
-        reply_obj = Message.objects.filter(id=reply_to).first()
+    return await store_message(response, convo, sender, key, content, reply_to, file)
 
-    file_path = None
-    if file:
-        import shutil, os
-        from django.conf import settings
 
-        folder = os.path.join(settings.MEDIA_ROOT, "message_files")
-        os.makedirs(folder, exist_ok=True)
+# -------------------------------
+# Message rows -> response items
+# -------------------------------
+MESSAGE_FIELDS = (
+    "id", "sender_id", "content", "file", "is_seen", "created_at",
+    "reply_to_id", "reply_to__content", "reply_to__file",
+)
+IMAGE_EXTS = ["jpg", "jpeg", "png", "gif", "bmp", "webp"]
 
-        save_path = os.path.join(folder, file.filename)
-        with open(save_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
 
-        file_path = f"message_files/{file.filename}"
+def get_message_type(name):
+    if not name:
+        return "text"
+    ext = name.split(".")[-1].lower()
+    if ext in IMAGE_EXTS:
+        return "image"
+    return "file"
 
-    msg = Message.objects.create(
-        conversation=convo,
-        sender=sender,
-        content=content,
-        reply_to=reply_obj,
-        file=file_path
-    )
 
+def message_out(m, request):
     return {
-        "status": "success",
-        "conversation_id": convo.id,
-        "message_id": msg.id,
-        "reply_to": reply_to,
-        "created_at": msg.created_at
+        "id": m["id"],
+        "sender": m["sender_id"],
+        "content": m["content"],
+        "file_url": media_url(m["file"], request),
+        "message_type": get_message_type(m["file"]),
+
+        "reply_to": (
+            {
+                "id": m["reply_to_id"],
+                "content": m["reply_to__content"],
+                "file_url": media_url(m["reply_to__file"], request),
+                "message_type": get_message_type(m["reply_to__file"]),
+            }
+            if m["reply_to_id"] else None
+        ),
+
+        "is_seen": m["is_seen"],
+        "created_at": m["created_at"]
     }
 
 
 # -------------------------------
 # Get All Messages between 2 users
 # -------------------------------
-@router.get("/conversation/{user1_id}/{user2_id}")
-def get_messages(request: Request, user1_id: int, user2_id: int):
+@router.get("/conversation/{user1_id}/{user2_id}", response_model=ConversationOut, dependencies=[Depends(read_replica)])
+async def get_messages(request: Request, user1_id: int, user2_id: int, claims: dict = Depends(get_token_claims)):
+    if int(claims["sub"]) not in (user1_id, user2_id):
+        raise HTTPException(status_code=403, detail="Not allowed to act on this user")
 
-    user1 = UserData.objects.filter(id=user1_id).first()
-    user2 = UserData.objects.filter(id=user2_id).first()
+    user1 = await UserData.objects.filter(id=user1_id).afirst()
+    user2 = await UserData.objects.filter(id=user2_id).afirst()
 
     if not user1 or not user2:
         raise HTTPException(status_code=404, detail="User not found")
 
     now = timezone.now()
     user1.last_active = now
-    user1.save(update_fields=["last_active"])
+    await user1.asave(update_fields=["last_active"])
 
-    convo = Conversation.objects.filter(
+    convo = await Conversation.objects.filter(
         Q(user1=user1, user2=user2) |
         Q(user1=user2, user2=user1)
-    ).first()
+    ).afirst()
 
     if not convo:
         return {
             "conversation_id": None,
+            "seq": 0,
             "messages": [],
             "other_user_online": False,
             "other_user_typing": (user2.is_typing and user2.typing_with == user1_id),  # UPDATED
             "other_user_last_active": user2.last_active,
         }
 
-    msgs = convo.messages.order_by("created_at")
-
-    def get_file_url(file_obj):
-        if not file_obj:
-            return None
-        return f"{request.base_url}media/{file_obj.name}"
-
-    def get_message_type(file_obj):
-        if not file_obj:
-            return "text"
-        ext = file_obj.name.split(".")[-1].lower()
-        if ext in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]:
-            return "image"
-        return "file"
+    msgs = convo.messages.order_by("created_at").values(*MESSAGE_FIELDS)
 
     online = False
     if user2.last_active:
         online = (now - user2.last_active) <= timedelta(seconds=60)
 
-    return {
+    return json_rows({
         "conversation_id": convo.id,
+        "seq": convo.last_seq,
         "other_user_online": online,
         "other_user_typing": (user2.is_typing and user2.typing_with == user1_id),  # UPDATED
         "other_user_last_active": user2.last_active,
         "messages": [
-            {
-                "id": m.id,
-                "sender": m.sender.id,
-                "content": m.content,
-                "file_url": get_file_url(m.file),
-                "message_type": get_message_type(m.file),
-
-                "reply_to": (
-                    {
-                        "id": m.reply_to.id,
-                        "content": m.reply_to.content,
-                        "file_url": get_file_url(m.reply_to.file),
-                        "message_type": get_message_type(m.reply_to.file),
-                    }
-                    if m.reply_to else None
-                ),
-
-                "is_seen": m.is_seen,
-                "created_at": m.created_at
-            }
-            for m in msgs
+            message_out(m, request)
+            async for m in msgs
         ]
-    }
+    })
 
 
 # -------------------------------
 # Mark as Seen
 # -------------------------------
-@router.post("/seen/{conversation_id}/{user_id}")
-def mark_seen(conversation_id: int, user_id: int):
+@router.post("/seen/{conversation_id}/{user_id}", response_model=StatusResponse, status_code=202,
+             dependencies=[Depends(authorize_user)])
+async def mark_seen(conversation_id: int, user_id: int):
 
-    convo = Conversation.objects.filter(id=conversation_id).first()
-    if not convo:
+    if not await Conversation.objects.filter(id=conversation_id).aexists():
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    viewer = UserData.objects.filter(id=user_id).first()
-    if viewer:
-        viewer.last_active = timezone.now()
-        viewer.save(update_fields=["last_active"])
+    await UserData.objects.filter(id=user_id).aupdate(last_active=timezone.now())
+
+    # The bulk is_seen update runs on the job worker.
+    await tasks.mark_seen.aenqueue(conversation_id=conversation_id, user_id=user_id)
+
+    return {"status": "seen update queued"}
+
+
+# -------------------------------
+# Delta sync across conversations
+# -------------------------------
+def parse_since(value):
+    """`12:40,15:3` -> {12: 40, 15: 3}; conversations left out sync from the start."""
+    cursors = {}
+    for part in filter(None, (value or "").split(",")):
+        conversation_id, _, seq = part.partition(":")
+        try:
+            cursors[int(conversation_id)] = int(seq)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must look like 12:40,15:3")
+    return cursors
+
+
+def synced(conversation_id, seq, rows, request):
+    return {
+        "conversation_id": conversation_id,
+        "seq": seq,
+        "messages": [
+            {**message_out(m, request), "conversation_id": conversation_id, "seq": m["seq"], "seen_at": m["seen_at"]}
+            for m in rows
+        ],
+    }
 
-    Message.objects.filter(
-        conversation=convo
-    ).exclude(sender__id=user_id).update(is_seen=True)
 
-    return {"status": "seen updated"}
+@router.get("/sync", response_model=SyncOut, dependencies=[Depends(authorize_user), Depends(read_replica)])
+async def sync_messages(request: Request, user_id: int = Query(...), since: str = Query(None)):
+    """
+    New and changed messages (including read receipts) in all of the user's
+    conversations, groups included, since the client's cursors, in seq order.
+    """
+    cursors = parse_since(since)
+    group_ids = ConversationParticipant.objects.filter(user_id=user_id).values("conversation_id")
+    changed = [
+        (conversation_id, last_seq)
+        async for conversation_id, last_seq in Conversation.objects.filter(
+            Q(user1_id=user_id) | Q(user2_id=user_id) | Q(id__in=group_ids)
+        ).order_by("id").values_list("id", "last_seq")
+        if last_seq > cursors.get(conversation_id, 0)
+    ]
+    if not changed:
+        return json_rows({"conversations": [], "has_more": False})
+
+    condition = Q()
+    for conversation_id, _ in changed:
+        condition |= Q(conversation_id=conversation_id, seq__gt=cursors.get(conversation_id, 0))
+    fields = (*MESSAGE_FIELDS, "conversation_id", "seq", "seen_at")
+    rows = [
+        m async for m in Message.objects.filter(condition)
+        .order_by("conversation_id", "seq", "id").values(*fields)[:SYNC_MAX_MESSAGES + 1]
+    ]
+    by_conversation = {}
+    for m in rows[:SYNC_MAX_MESSAGES]:
+        by_conversation.setdefault(m["conversation_id"], []).append(m)
+
+    conversations = []
+    has_more = len(rows) > SYNC_MAX_MESSAGES
+    last_included = rows[SYNC_MAX_MESSAGES - 1]["conversation_id"] if has_more else None
+    cut_inside = has_more and rows[SYNC_MAX_MESSAGES]["conversation_id"] == last_included
+    for conversation_id, last_seq in changed:
+        messages = by_conversation.get(conversation_id, [])
+        if conversation_id == last_included and cut_inside:
+            # Cut off mid-conversation. If the cut falls inside a batch of receipts
+            # that share one seq, stop this conversation at its last complete seq.
+            cut = messages[-1]["seq"]
+            if rows[SYNC_MAX_MESSAGES]["seq"] == cut:
+                messages = [m for m in messages if m["seq"] < cut]
+            if not messages and not conversations:
+                # One batch bigger than a page; send it whole rather than stall.
+                messages = [m async for m in Message.objects.filter(
+                    conversation_id=conversation_id, seq=cut,
+                ).order_by("id").values(*fields)]
+            if messages:
+                conversations.append(synced(conversation_id, messages[-1]["seq"], messages, request))
+            break
+        seq = max(last_seq, messages[-1]["seq"]) if messages else last_seq
+        conversations.append(synced(conversation_id, seq, messages, request))
+        if conversation_id == last_included:
+            break
+
+    return json_rows({"conversations": conversations, "has_more": has_more})
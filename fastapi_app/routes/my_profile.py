@@ -1,41 +1,125 @@
 import fastapi_app.django_setup
-from fastapi import APIRouter, HTTPException, Form, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile, Request, Response
+from creator_app import change_log
 from creator_app.models import UserData
-from django.conf import settings
+from fastapi_app.async_db import run_blocking
+from fastapi_app.conditional import PRIVATE_PROFILE_CACHE, conditional_update, conditional_values
+from fastapi_app.db_routing import read_replica
+from fastapi_app.imaging import AVATAR_SIZES, InvalidImage, normalize_avatar
+from fastapi_app.media import avatar_name, avatar_urls, media_url
+from fastapi_app.responses import json_rows
+from fastapi_app.schemas import ProfileUpdated, StatusMessage, UserCard, UserProfileOut
+from fastapi_app.security import authorize_user
+from fastapi_app.user_cards import build_card, fetch_card_rows, invalidate_user_card
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from datetime import datetime
+from pydantic import BaseModel, Field
+import hashlib
 import os
+import tempfile
 
 router = APIRouter(prefix='/profile', tags=['Profile'])
 
-BASE_DIR = settings.BASE_DIR
+PROFILE_FIELDS = ('profile_pic', 'email', 'first_name', 'last_name', 'phone_number', 'address', 'city', 'state')
 
 
 # ------------------------------
 # GET USER DATA BY ID
 # ------------------------------
-@router.get('/get/{user_id}')
-def get_user_data(user_id: int):
-    try:
-        user = UserData.objects.get(id=user_id)
-    except UserData.DoesNotExist:
+@router.get('/get/{user_id}', response_model=UserProfileOut, dependencies=[Depends(read_replica)])
+async def get_user_data(user_id: int, request: Request, response: Response):
+    user = await conditional_values(
+        request, response, UserData.objects.filter(id=user_id),
+        kind="user", pk=user_id, versions=("updated_at",),
+        cache_control=PRIVATE_PROFILE_CACHE, fields=PROFILE_FIELDS,
+    )
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    if isinstance(user, Response):
+        return user
 
-    return {
-        'profile_pic': user.profile_pic.url if user.profile_pic else None,
-        'email': user.email,
-        'first_name': user.first_name,
-        'last_name': user.last_name,
-        'phone_number': user.phone_number,
-        'address': user.address,
-        'city': user.city,
-        'state': user.state
-    }
+    user['avatars'] = avatar_urls(user['profile_pic'], request)
+    user['profile_pic'] = media_url(user['profile_pic'], request)
+    return user
+
+
+# ------------------------------
+# PROFILE PICTURE STORAGE
+# ------------------------------
+# Uploads are normalized to WebP (fastapi_app/imaging.py) and stored under a
+# hash of the uploaded bytes: avatars/<key>.webp plus avatars/<key>-<size>.webp.
+# Names never collide between users and are served as immutable.
+PROFILE_PIC_MAX_BYTES = int(os.getenv("PROFILE_PIC_MAX_BYTES", 10 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def _spool_upload(src, limit):
+    """
+    Copy the upload to a temp file in fixed-size chunks, hashing as it goes.
+    Returns (path, key); raises UploadTooLarge past `limit` bytes.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest()[:32]
+
+
+def _avatar_stored(key):
+    # The full rendition is written last, so it marks a complete set.
+    return UserData.profile_pic.field.storage.exists(avatar_name(key))
+
+
+def _store_avatar(key, renditions):
+    storage = UserData.profile_pic.field.storage
+    for size in (*AVATAR_SIZES, "full"):
+        name = avatar_name(key, size)
+        if not storage.exists(name):
+            storage.save(name, ContentFile(renditions[size]))
+    return avatar_name(key)
+
+
+async def save_profile_pic(upload: UploadFile):
+    """Validate, normalize and store an uploaded picture; returns the stored name."""
+    if upload.size is not None and upload.size > PROFILE_PIC_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Profile picture too large")
+    try:
+        path, key = await run_blocking(_spool_upload, upload.file, PROFILE_PIC_MAX_BYTES)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="Profile picture too large")
+
+    try:
+        if await run_blocking(_avatar_stored, key):
+            return avatar_name(key)
+        try:
+            renditions = await normalize_avatar(path)
+        except InvalidImage:
+            raise HTTPException(status_code=400, detail="Invalid image file")
+        return await run_blocking(_store_avatar, key, renditions)
+    finally:
+        await run_blocking(os.unlink, path)
 
 
 # ------------------------------
 # EDIT USER DATA USING USER ID
 # ------------------------------
-@router.put('/edit/{user_id}')
-def edit_user_data(
+@router.put('/edit/{user_id}', response_model=StatusMessage, dependencies=[Depends(authorize_user)])
+async def edit_user_data(
     user_id: int,
     first_name: str | None = Form(None),
     last_name: str | None = Form(None),
@@ -46,36 +130,76 @@ def edit_user_data(
     profile_pic: UploadFile | None = File(None)
 ):
     try:
-        user = UserData.objects.get(id=user_id)
+        user = await UserData.objects.aget(id=user_id)
     except UserData.DoesNotExist:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Update fields
-    if first_name is not None:
-        user.first_name = first_name
-    if last_name is not None:
-        user.last_name = last_name
-    if phone_number is not None:
-        user.phone_number = phone_number
-    if address is not None:
-        user.address = address
-    if city is not None:
-        user.city = city
-    if state is not None:
-        user.state = state
+    changes = {
+        "first_name": first_name, "last_name": last_name, "phone_number": phone_number,
+        "address": address, "city": city, "state": state,
+    }
+    changed = [name for name, value in changes.items() if value is not None]
+    for name in changed:
+        setattr(user, name, changes[name])
 
     # Handle profile picture upload
     if profile_pic is not None:
-        save_path = os.path.join(BASE_DIR, "fastapi_app", "profile_pic")
-        os.makedirs(save_path, exist_ok=True)
+        user.profile_pic = await save_profile_pic(profile_pic)
+        changed.append("profile_pic")
 
-        file_path = os.path.join(save_path, profile_pic.filename)
+    if changed:
+        await change_log.awrite(
+            lambda: user.save(update_fields=[*changed, "updated_at"]), change_log.upsert(change_log.USER, user_id),
+        )
+    invalidate_user_card(user_id)
 
-        with open(file_path, "wb") as f:
-            f.write(profile_pic.file.read())
+    return {"message": "UserData updated successfully"}
 
-        user.profile_pic = f"profile_pic/{profile_pic.filename}"
 
-    user.save()
+# ------------------------------
+# PARTIAL UPDATE (JSON, OPTIMISTIC CONCURRENCY)
+# ------------------------------
+class UserDataPatch(BaseModel):
+    first_name: str | None = None
+    last_name: str | None = None
+    phone_number: str | None = None
+    address: str | None = None
+    city: str | None = None
+    state: str | None = None
+    # Precondition alternative to If-Match: the updated_at from the last write.
+    updated_at: datetime | None = None
 
-    return {"message": "UserData updated successfully"}
+
+@router.patch('/edit/{user_id}', response_model=ProfileUpdated, dependencies=[Depends(authorize_user)])
+async def patch_user_data(user_id: int, payload: UserDataPatch, request: Request, response: Response):
+    """Write only the fields sent; 412 if the user changed since the If-Match ETag / updated_at."""
+    changes = payload.model_dump(exclude_unset=True, exclude={"updated_at"})
+    updated_at = await conditional_update(
+        request, response, UserData.objects.filter(id=user_id),
+        kind="user", pk=user_id, versions=("updated_at",),
+        changes=changes, expected=payload.updated_at, log=[change_log.upsert(change_log.USER, user_id)],
+    )
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    invalidate_user_card(user_id)
+
+    return {"message": "UserData updated successfully", "updated_at": updated_at}
+
+
+# ------------------------------
+# BATCH USER CARDS
+# ------------------------------
+USER_CARD_BATCH_MAX = int(os.getenv("USER_CARD_BATCH_MAX", 100))
+
+
+class UserCardBatch(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=USER_CARD_BATCH_MAX)
+
+
+@router.post('/batch', response_model=list[UserCard], dependencies=[Depends(read_replica)])
+async def get_user_cards(payload: UserCardBatch, request: Request):
+    """Cards for many users at once, in request order; unknown ids are left out."""
+    ids = list(dict.fromkeys(payload.ids))
+    rows = await fetch_card_rows(ids)
+    now = timezone.now()
+    return json_rows([build_card(rows[user_id], request, now) for user_id in ids if user_id in rows])
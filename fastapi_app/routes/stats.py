@@ -0,0 +1,61 @@
+import fastapi_app.django_setup
+from datetime import timedelta
+
+from django.utils import timezone
+from fastapi import APIRouter, Depends, Query, Response
+
+from creator_app import stats
+from fastapi_app.db_routing import read_replica
+from fastapi_app.schemas import CollaboratorStats, CreatorStats, MessageStats
+
+router = APIRouter(prefix="/stats", tags=["Stats"], dependencies=[Depends(read_replica)])
+
+# Rollups trail writes by up to STATS_FLUSH_INTERVAL anyway; let clients reuse them for a minute.
+STATS_CACHE = "public, max-age=60"
+
+
+# ------------------------------------------------
+# Creators per niche / platform / type
+# ------------------------------------------------
+@router.get("/creators", response_model=CreatorStats)
+async def creator_stats(response: Response):
+    counts = await stats.read_metrics("creators", "creators_by_niche", "creators_by_platform", "creators_by_type")
+    response.headers["Cache-Control"] = STATS_CACHE
+    return {
+        "total": counts["creators"].get(stats.TOTAL, 0),
+        "by_niche": counts["creators_by_niche"],
+        "by_platform": counts["creators_by_platform"],
+        "by_type": counts["creators_by_type"],
+    }
+
+
+# ------------------------------------------------
+# Collaborators per skill / language / price bucket
+# ------------------------------------------------
+@router.get("/collaborators", response_model=CollaboratorStats)
+async def collaborator_stats(response: Response):
+    counts = await stats.read_metrics(
+        "collaborators", "collaborators_by_skill", "collaborators_by_language", "collaborators_by_price",
+    )
+    response.headers["Cache-Control"] = STATS_CACHE
+    return {
+        "total": counts["collaborators"].get(stats.TOTAL, 0),
+        "by_skill": counts["collaborators_by_skill"],
+        "by_language": counts["collaborators_by_language"],
+        "by_price": counts["collaborators_by_price"],
+    }
+
+
+# ------------------------------------------------
+# Message volume per day
+# ------------------------------------------------
+@router.get("/messages", response_model=MessageStats)
+async def message_stats(response: Response, days: int = Query(30, ge=1, le=366)):
+    since = (timezone.now() - timedelta(days=days - 1)).date().isoformat()
+    total = await stats.read_metrics("messages")
+    per_day = await stats.read_metrics("messages_per_day", since=since)
+    response.headers["Cache-Control"] = STATS_CACHE
+    return {
+        "total": total["messages"].get(stats.TOTAL, 0),
+        "per_day": dict(sorted(per_day["messages_per_day"].items())),
+    }
@@ -0,0 +1,329 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+# ================================
+# COMMON
+# ================================
+class StatusMessage(BaseModel):
+    message: str
+
+
+class ProfileUpdated(StatusMessage):
+    # Send back as `updated_at` (or the new ETag as If-Match) on the next PATCH.
+    updated_at: datetime
+
+
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
+    expires_in: int
+
+
+# ================================
+# AUTH
+# ================================
+class SignupResponse(TokenPair):
+    message: str
+    user_id: int
+
+
+class LoginResponse(TokenPair):
+    message: str
+    user_id: int
+    role: str | None
+
+
+class RefreshResponse(TokenPair):
+    user_id: int
+    role: str | None
+
+
+class Auth0LoginResponse(TokenPair):
+    message: str
+    user_id: int
+    email: str | None
+    provider: str | None
+    next_step: str
+
+
+# ================================
+# CREATOR
+# ================================
+class CreatorListItem(BaseModel):
+    user_id: int
+    email: str | None
+    creator_name: str
+    creator_type: str
+    primary_niche: str
+    location: str | None
+    followers: int | None
+
+
+class CreatorSearchItem(CreatorListItem):
+    platforms: str | None
+    experience_level: str
+    collaboration_type: str
+    project_type: str
+
+
+class CreatorProfileOut(BaseModel):
+    user_id: int
+    email: str | None
+    creator_name: str
+    creator_type: str
+    experience_level: str
+    primary_niche: str
+    secondary_niche: str | None
+    platforms: str | None
+    followers: int | None
+    portfolio_category: str
+    portfolio_link: str | None
+    collaboration_type: str
+    project_type: str
+    location: str | None
+
+
+class ProfileSaved(StatusMessage):
+    created: bool
+
+
+# ================================
+# COLLABORATOR
+# ================================
+class CollaboratorListItem(BaseModel):
+    user_id: int
+    email: str | None
+    name: str
+    skill_category: str
+    location: str | None
+
+
+class CollaboratorSearchItem(BaseModel):
+    id: int
+    email: str | None
+    name: str
+    skill_category: str
+    pricing: str
+    location: str | None
+    experience: str
+    language: str
+    availability: str | None
+    social_link: str | None
+    portfolio_link: str | None
+
+
+class CollaboratorProfileOut(BaseModel):
+    user_id: int
+    email: str | None
+    name: str
+    language: str
+    skill_category: str
+    experience: str
+    pricing_amount: float | None
+    pricing_unit: str | None
+    availability: str | None
+    timing: str | None
+    social_link: str | None
+    portfolio_link: str | None
+    badges: str | None
+    skills_rating: int | None
+    about: str | None
+    location: str | None
+
+
+# ================================
+# PROFILE
+# ================================
+class UserProfileOut(BaseModel):
+    profile_pic: str | None
+    # Square WebP avatars keyed by side length ("512", "256", "128", "64").
+    avatars: dict[str, str] | None = None
+    email: str | None
+    first_name: str | None
+    last_name: str | None
+    phone_number: str | None
+    address: str | None
+    city: str | None
+    state: str | None
+
+
+class UserCard(BaseModel):
+    id: int
+    name: str | None
+    avatar: str | None
+    role: str | None
+    online: bool
+
+
+# ================================
+# MESSAGING
+# ================================
+class InboxUser(BaseModel):
+    id: int
+    name: str
+    online: bool
+    last_message: str
+    last_message_time: datetime | None
+
+
+class StatusResponse(BaseModel):
+    status: str
+
+
+class MessageSent(StatusResponse):
+    conversation_id: int
+    message_id: int
+    reply_to: int | None
+    created_at: datetime
+
+
+class ReplyPreview(BaseModel):
+    id: int
+    content: str | None
+    file_url: str | None
+    message_type: str
+
+
+class MessageOut(BaseModel):
+    id: int
+    sender: int
+    content: str | None
+    file_url: str | None
+    message_type: str
+    reply_to: ReplyPreview | None
+    is_seen: bool
+    created_at: datetime
+
+
+class ConversationOut(BaseModel):
+    conversation_id: int | None
+    # Cursor for GET /message/sync.
+    seq: int
+    other_user_online: bool
+    other_user_typing: bool
+    other_user_last_active: datetime | None
+    messages: list[MessageOut]
+
+
+class SyncMessage(MessageOut):
+    conversation_id: int
+    seq: int
+    seen_at: datetime | None
+
+
+class SyncedConversation(BaseModel):
+    conversation_id: int
+    # Send back as this conversation's `since` next time.
+    seq: int
+    messages: list[SyncMessage]
+
+
+class SyncOut(BaseModel):
+    conversations: list[SyncedConversation]
+    # Capped at SYNC_MAX_MESSAGES; call again with the new cursors for the rest.
+    has_more: bool
+
+
+# ================================
+# GROUPS
+# ================================
+class GroupMember(BaseModel):
+    user: UserCard
+    role: str
+    # Watermarks: highest seq the member has received / read.
+    delivered_seq: int
+    read_seq: int
+
+
+class GroupOut(BaseModel):
+    conversation_id: int
+    title: str | None
+    seq: int
+    members: list[GroupMember]
+
+
+class GroupSummary(BaseModel):
+    conversation_id: int
+    title: str | None
+    seq: int
+    read_seq: int
+    unread: int
+    last_message_time: datetime | None
+
+
+class GroupMembersAdded(StatusMessage):
+    added: int
+
+
+class GroupMessages(BaseModel):
+    conversation_id: int
+    # Oldest first; pass `before` to load the page above.
+    messages: list[SyncMessage]
+    before: int | None
+
+
+# ================================
+# HOME
+# ================================
+class HomeConversation(BaseModel):
+    conversation_id: int
+    user: UserCard
+    last_message: str | None
+    last_message_time: datetime | None
+    unread: int
+
+
+class HomeOut(BaseModel):
+    user: UserCard
+    # Only the profile matching the user's role is filled in.
+    creator_profile: CreatorProfileOut | None
+    collaborator_profile: CollaboratorProfileOut | None
+    inbox: list[HomeConversation]
+    # Creators are suggested collaborators and everyone else creators.
+    suggested_creators: list[CreatorListItem]
+    suggested_collaborators: list[CollaboratorListItem]
+
+
+# ================================
+# CHANGES
+# ================================
+class ChangeEntry(BaseModel):
+    id: int
+    entity: str
+    object_id: int
+    op: str
+    created_at: datetime
+
+
+class ChangesOut(BaseModel):
+    changes: list[ChangeEntry]
+    # Cursor for the next call (`after`).
+    next: int
+    has_more: bool
+
+
+# ================================
+# STATS
+# ================================
+class CreatorStats(BaseModel):
+    total: int
+    by_niche: dict[str, int]
+    by_platform: dict[str, int]
+    by_type: dict[str, int]
+
+
+class CollaboratorStats(BaseModel):
+    total: int
+    by_skill: dict[str, int]
+    by_language: dict[str, int]
+    # Price buckets such as "500-1000" and "50000+".
+    by_price: dict[str, int]
+
+
+class MessageStats(BaseModel):
+    total: int
+    # ISO date (UTC) -> messages sent that day.
+    per_day: dict[str, int]
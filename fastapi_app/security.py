@@ -0,0 +1,246 @@
+import fastapi_app.django_setup
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from fastapi_app import http_client
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+import uuid
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ================================
+# TOKEN SETTINGS
+# ================================
+JWT_SECRET_KEY = settings.JWT_SECRET_KEY or (settings.SECRET_KEY if settings.DEBUG else None)
+if not JWT_SECRET_KEY:
+    # SECRET_KEY is committed to the repo; tokens signed with it could be forged.
+    raise ImproperlyConfigured("JWT_SECRET_KEY must be set when DEBUG is off")
+JWT_ALGORITHM = "HS256"
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", 15 * 60))             # 15 minutes
+REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", 14 * 24 * 3600))    # 14 days
+
+AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
+AUTH0_CLIENT_ID = os.getenv("AUTH0_CLIENT_ID")
+AUTH0_JWKS_FILE = os.getenv("AUTH0_JWKS_FILE")
+JWKS_MIN_REFRESH_INTERVAL = 30      # seconds between refreshes on kid miss
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+# ================================
+# ACCESS / REFRESH TOKENS
+# ================================
+def password_version(password_hash: str | None):
+    """Short fingerprint of the stored hash; changes whenever the password does."""
+    return hashlib.sha256((password_hash or "").encode()).hexdigest()[:16]
+
+
+def _encode(claims: dict, ttl: int):
+    import jwt
+
+    now = int(time.time())
+    payload = {**claims, "iat": now, "exp": now + ttl}
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def create_access_token(user_id: int, role: str | None = None):
+    return _encode({"sub": str(user_id), "role": role or "", "type": "access"}, ACCESS_TOKEN_TTL)
+
+
+def create_refresh_token(user_id: int, password_hash: str | None = None):
+    return _encode(
+        {
+            "sub": str(user_id),
+            "type": "refresh",
+            "pwv": password_version(password_hash),
+            "jti": uuid.uuid4().hex,
+        },
+        REFRESH_TOKEN_TTL,
+    )
+
+
+def issue_tokens(user):
+    return {
+        "access_token": create_access_token(user.id, user.role),
+        "refresh_token": create_refresh_token(user.id, user.password),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL,
+    }
+
+
+@functools.lru_cache(maxsize=8192)
+def _verify_signature(token: str):
+    # Signature checks are cached per token string; expiry is checked on every call.
+    import jwt
+
+    return jwt.decode(
+        token,
+        JWT_SECRET_KEY,
+        algorithms=[JWT_ALGORITHM],
+        options={"require": ["sub", "exp", "type"], "verify_exp": False},
+    )
+
+
+def decode_token(token: str, expected_type: str = "access"):
+    import jwt
+
+    try:
+        # A copy: the cached dict is shared by every request with this token.
+        claims = dict(_verify_signature(token))
+    except jwt.InvalidTokenError:
+        raise HTTPException(401, "Invalid token", headers={"WWW-Authenticate": "Bearer"})
+
+    if claims["exp"] <= time.time():
+        raise HTTPException(401, "Token expired", headers={"WWW-Authenticate": "Bearer"})
+
+    if claims.get("type") != expected_type:
+        raise HTTPException(401, "Invalid token type", headers={"WWW-Authenticate": "Bearer"})
+
+    return claims
+
+
+# ================================
+# FASTAPI DEPENDENCIES (NO DB HIT)
+# ================================
+def get_token_claims(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+):
+    if credentials is None:
+        raise HTTPException(401, "Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return decode_token(credentials.credentials, "access")
+
+
+def get_current_user_id(claims: dict = Depends(get_token_claims)):
+    return int(claims["sub"])
+
+
+def check_user(claims: dict, user_id: int):
+    """403 unless the token was issued to `user_id`; for ids sent in a body or form."""
+    if int(claims["sub"]) != user_id:
+        raise HTTPException(403, "Not allowed to act on this user")
+
+
+def authorize_user(user_id: int, claims: dict = Depends(get_token_claims)):
+    """Guard for routes addressed by a `user_id` path or query parameter."""
+    check_user(claims, user_id)
+    return claims
+
+
+# ================================
+# AUTH0 JWKS CACHE
+# ================================
+class JWKSCache:
+    """
+    In-memory key set for verifying Auth0 id_tokens.
+
+    Keys are fetched once and kept until a token arrives with an unknown
+    `kid`, which triggers a refresh (at most once per JWKS_MIN_REFRESH_INTERVAL).
+    `fetch` returns the JWKS document as a dict (or an awaitable of one), so a
+    local key set can be plugged in instead of the network.
+    """
+
+    def __init__(self, fetch, min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL):
+        self._fetch = fetch
+        self._min_refresh_interval = min_refresh_interval
+        self._keys = {}
+        self._fetched_at = 0.0
+        # Created on first refresh, inside the running event loop.
+        self._lock = None
+
+    def load(self, jwks: dict):
+        import jwt
+
+        keys = {}
+        for data in jwks.get("keys", []):
+            if data.get("use", "sig") != "sig" or "kid" not in data:
+                continue
+            keys[data["kid"]] = jwt.PyJWK(data)
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    async def refresh(self, force: bool = False):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not force and time.monotonic() - self._fetched_at < self._min_refresh_interval:
+                return
+            jwks = self._fetch()
+            if inspect.isawaitable(jwks):
+                jwks = await jwks
+            self.load(jwks)
+
+    async def get_signing_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is None:
+            await self.refresh(force=not self._keys)
+            key = self._keys.get(kid)
+        if key is None:
+            raise HTTPException(401, "Unknown signing key")
+        return key
+
+
+async def _fetch_auth0_jwks():
+    if AUTH0_JWKS_FILE:
+        with open(AUTH0_JWKS_FILE) as f:
+            return json.load(f)
+
+    return await http_client.request_json(
+        "GET", f"https://{AUTH0_DOMAIN}/.well-known/jwks.json", breaker="auth0"
+    )
+
+
+auth0_jwks = JWKSCache(_fetch_auth0_jwks)
+
+
+async def verify_auth0_id_token(id_token: str, jwks: JWKSCache | None = None):
+    import jwt
+
+    jwks = jwks or auth0_jwks
+
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except jwt.InvalidTokenError:
+        raise HTTPException(401, "Malformed id_token")
+
+    key = await jwks.get_signing_key(header.get("kid"))
+
+    try:
+        return jwt.decode(
+            id_token,
+            key.key,
+            algorithms=["RS256"],
+            audience=AUTH0_CLIENT_ID,
+            issuer=f"https://{AUTH0_DOMAIN}/",
+        )
+    except jwt.InvalidTokenError as exc:
+        raise HTTPException(401, f"Invalid id_token: {exc}")
+
+
+# ================================
+# LOCAL KEY SET (OFFLINE TESTING)
+# ================================
+def local_keyset(kid: str = "local-test-key"):
+    """
+    Generate an RSA key pair and its JWKS document.
+
+    Returns (jwks, private_key) so tests can sign id_tokens and verify them
+    through JWKSCache(lambda: jwks) without any network access.
+    """
+    import jwt
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return {"keys": [public_jwk]}, private_key
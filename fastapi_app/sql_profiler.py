@@ -0,0 +1,235 @@
+"""
+Per-request SQL profiling built on `connection.execute_wrapper`.
+
+Every Django connection gets `profile_query` installed as an execute
+wrapper when it connects. The wrapper attributes each query to the current
+request through a ContextVar. sync_to_async copies the request's context
+onto the DB lane thread, so queries from concurrent requests sharing a lane
+stay separate.
+
+For each profiled request SQLProfilerMiddleware adds:
+
+    X-DB-Query-Count: 14
+    X-DB-Time-Ms: 8.31
+    X-DB-Repeated-Queries: 1     # query shapes run >= SQL_N_PLUS_ONE_THRESHOLD times
+    Server-Timing: db;dur=8.31
+
+It logs a warning naming each repeated shape. Queries slower than
+SQL_SLOW_QUERY_MS are written to a rotating log.
+
+Tests can assert budgets without enabling it globally:
+
+    with query_budget(2, max_repeats=0):
+        client.get("/creator/list")
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# ================================
+# SETTINGS
+# ================================
+# On by default in DEBUG; SQL_PROFILER=0/1 overrides.
+SQL_PROFILER = os.getenv("SQL_PROFILER", "1" if settings.DEBUG else "0") == "1"
+
+# Same query shape this many times in one request counts as an N+1.
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 5))
+
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 100))
+SQL_SLOW_LOG = os.getenv("SQL_SLOW_LOG", os.path.join(settings.BASE_DIR, "logs", "slow_queries.log"))
+SQL_SLOW_LOG_BYTES = int(os.getenv("SQL_SLOW_LOG_BYTES", 5 * 1024 * 1024))
+SQL_SLOW_LOG_BACKUPS = int(os.getenv("SQL_SLOW_LOG_BACKUPS", 5))
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("sql_profile", default=None)
+_collectors = []
+
+
+# ================================
+# FINGERPRINTS
+# ================================
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?|:\w+)\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Query shape with literals and IN lists collapsed, so N+1 loops share one key."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryProfile:
+
+    def __init__(self, label=""):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+        # First (sql, params, alias) seen for each shape, e.g. for EXPLAIN.
+        self.samples = {}
+
+    def record(self, sql, duration, params=None, alias=None):
+        shape = fingerprint(sql)
+        self.count += 1
+        self.seconds += duration
+        self.shapes[shape] += 1
+        if shape not in self.samples:
+            self.samples[shape] = (sql, params, alias)
+
+    @property
+    def milliseconds(self):
+        return self.seconds * 1000
+
+    def repeated(self, threshold=None):
+        threshold = threshold or SQL_N_PLUS_ONE_THRESHOLD
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def describe(self):
+        lines = [f"{self.label}: {self.count} queries in {self.milliseconds:.2f} ms"]
+        lines += [f"  {n} x {shape}" for shape, n in self.shapes.most_common(5)]
+        return "\n".join(lines)
+
+
+# ================================
+# EXECUTE WRAPPER
+# ================================
+_slow_logger = None
+
+
+def _get_slow_logger():
+    global _slow_logger
+    if _slow_logger is None:
+        os.makedirs(os.path.dirname(SQL_SLOW_LOG), exist_ok=True)
+        handler = RotatingFileHandler(SQL_SLOW_LOG, maxBytes=SQL_SLOW_LOG_BYTES, backupCount=SQL_SLOW_LOG_BACKUPS)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow = logging.getLogger(f"{__name__}.slow")
+        slow.addHandler(handler)
+        slow.setLevel(logging.INFO)
+        slow.propagate = False
+        _slow_logger = slow
+    return _slow_logger
+
+
+def profile_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        profile.record(sql, duration, params, context["connection"].alias)
+        if duration * 1000 >= SQL_SLOW_QUERY_MS:
+            _get_slow_logger().info(
+                "%.1fms %s alias=%s sql=%s params=%.500r",
+                duration * 1000, profile.label, context["connection"].alias, sql, params,
+            )
+
+
+def install(connection, **kwargs):
+    if profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_query)
+
+
+connection_created.connect(install, dispatch_uid="fastapi_app.sql_profiler")
+
+
+# ================================
+# ASGI MIDDLEWARE
+# ================================
+class SQLProfilerMiddleware:
+
+    def __init__(self, app, enabled: bool = SQL_PROFILER):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (self.enabled or _collectors):
+            return await self.app(scope, receive, send)
+
+        profile = QueryProfile(f"{scope['method']} {scope['path']}")
+        token = _current.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = f"{profile.milliseconds:.2f}"
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(profile.count).encode()),
+                    (b"x-db-time-ms", timing.encode()),
+                    (b"x-db-repeated-queries", str(len(profile.repeated())).encode()),
+                    (b"server-timing", f"db;dur={timing}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            for shape, n in profile.repeated():
+                logger.warning("Possible N+1 on %s: %d x %s", profile.label, n, shape)
+            for collected in _collectors:
+                collected.append(profile)
+
+
+# ================================
+# TEST HELPERS
+# ================================
+@contextmanager
+def profile_requests():
+    """
+    Profile every request (and direct ORM call) inside the block, even with
+    SQL_PROFILER off. Yields the list the QueryProfile objects are added to.
+    """
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+
+    profiles = []
+    direct = QueryProfile("direct")
+    token = _current.set(direct)
+    _collectors.append(profiles)
+    try:
+        yield profiles
+    finally:
+        _collectors.remove(profiles)
+        _current.reset(token)
+        if direct.count:
+            profiles.append(direct)
+
+
+@contextmanager
+def query_budget(max_queries, max_repeats=None):
+    """
+    Fail if any request (or direct ORM call) inside the block runs more than
+    `max_queries` queries, or more than `max_repeats` N+1 shapes.
+
+    Yields the list of collected QueryProfile objects.
+    """
+    with profile_requests() as profiles:
+        yield profiles
+
+    for profile in profiles:
+        assert profile.count <= max_queries, (
+            f"query budget {max_queries} exceeded\n{profile.describe()}"
+        )
+        if max_repeats is not None:
+            repeated = profile.repeated()
+            assert len(repeated) <= max_repeats, (
+                f"{len(repeated)} repeated query shapes (budget {max_repeats})\n{profile.describe()}"
+            )
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.core import signals
+from django.db.backends.signals import connection_created
+from django.test import SimpleTestCase, TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import UserData
+from fastapi_app.async_db import DatabaseLanes, gather_lanes
+from fastapi_app.main import app
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+class DatabaseLaneTests(SimpleTestCase):
+
+    def setUp(self):
+        self.lanes = DatabaseLanes(size=2)
+        self.addCleanup(self.lanes.shutdown)
+
+    def test_a_pinned_request_stays_on_its_lane(self):
+        async def request():
+            index, token = self.lanes.acquire()
+            try:
+                return index, {await sync_to_async(thread_name)() for _ in range(3)}
+            finally:
+                self.lanes.release(index, token)
+
+        index, threads = asyncio.run(request())
+        self.assertEqual(threads, {f"django-db-{index}_0"})
+        self.assertEqual(self.lanes.inflight, [0, 0])
+
+    def test_requests_go_to_the_least_loaded_lane(self):
+        first = self.lanes.acquire()
+        second = self.lanes.acquire()
+        self.assertEqual((first[0], second[0], self.lanes.inflight), (0, 1, [1, 1]))
+        self.lanes.release(*second)
+        self.lanes.release(*first)
+
+    def test_gather_lanes_runs_each_branch_on_its_own_lane(self):
+        async def both():
+            return await gather_lanes(sync_to_async(thread_name)(), sync_to_async(thread_name)(), lanes=self.lanes)
+
+        self.assertEqual(sorted(asyncio.run(both())), ["django-db-0_0", "django-db-1_0"])
+
+
+class LaneMiddlewareTests(TransactionTestCase):
+    """Async routes reach the database from the lane threads, never the event loop's."""
+
+    databases = "__all__"
+
+    def record(self, signal):
+        threads = []
+
+        def receiver(**kwargs):
+            threads.append(thread_name())
+
+        signal.connect(receiver, weak=False)
+        self.addCleanup(signal.disconnect, receiver)
+        return threads
+
+    def test_orm_calls_and_request_signals_run_on_one_lane(self):
+        user = UserData.objects.create(email="me@example.com", role="creator")
+        started, finished = self.record(signals.request_started), self.record(signals.request_finished)
+        connected = self.record(connection_created)
+
+        res = TestClient(app).get(f"/profile/get/{user.id}")
+        self.assertEqual(res.status_code, 200, res.text)
+
+        # Connections close after each request, so the route opened its own.
+        self.assertTrue(connected)
+        self.assertEqual(len(set(started + finished + connected)), 1)
+        self.assertTrue(started[0].startswith("django-db-"))
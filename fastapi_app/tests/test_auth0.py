@@ -0,0 +1,131 @@
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import UserData
+from fastapi_app import http_client, security
+from fastapi_app.auth0_mock import mock_auth0_transport
+from fastapi_app.main import app
+from fastapi_app.routes import auth
+
+DOMAIN = "tenant.example.auth0.com"
+CLIENT_ID = "test-client"
+
+
+class Auth0CallbackTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        self.patch(security, AUTH0_DOMAIN=DOMAIN, AUTH0_CLIENT_ID=CLIENT_ID, AUTH0_JWKS_FILE=None,
+                   auth0_jwks=security.JWKSCache(security._fetch_auth0_jwks))
+        self.patch(auth, AUTH0_DOMAIN=DOMAIN, AUTH0_CLIENT_ID=CLIENT_ID)
+        self.patch(http_client, RETRY_BACKOFF=0)
+
+        self.jwks, self.private_key = security.local_keyset()
+        self.use_transport(mock_auth0_transport(self.jwks, self.private_key, DOMAIN, CLIENT_ID))
+        self.addCleanup(self.reset_client)
+        self.api = TestClient(app)
+
+    def patch(self, module, **attrs):
+        patcher = mock.patch.multiple(module, **attrs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_transport(self, transport):
+        self.transport = transport
+        http_client._client = http_client.create_client(transport)
+        http_client._breakers.clear()
+
+    def reset_client(self):
+        http_client._client = None
+        http_client._breakers.clear()
+
+    def callback(self, code):
+        return self.api.get("/auth/auth0/callback", params={"code": code})
+
+    def test_login_creates_then_reuses_the_user(self):
+        res = self.callback("alice")
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual((body["email"], body["provider"]), ("alice@example.com", "google-oauth2"))
+        self.assertEqual(security.decode_token(body["access_token"])["sub"], str(body["user_id"]))
+
+        again = self.callback("alice").json()
+        self.assertEqual(again["user_id"], body["user_id"])
+        self.assertEqual(UserData.objects.filter(userid="google-oauth2|alice").count(), 1)
+
+    def test_rejected_code(self):
+        res = self.callback("invalid")
+        self.assertEqual((res.status_code, res.json()["detail"]), (400, "Token exchange failed"))
+
+    def test_provider_error_is_a_502(self):
+        self.assertEqual(self.callback("fail").status_code, 502)
+
+    def test_non_json_error_page_is_a_502(self):
+        self.assertEqual(self.callback("html").status_code, 502)
+
+    def test_breaker_opens_after_repeated_failures(self):
+        for _ in range(http_client.BREAKER_FAILURE_THRESHOLD):
+            self.assertEqual(self.callback("fail").status_code, 502)
+        res = self.callback("alice")
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(UserData.objects.count(), 0)
+
+    def test_key_set_fetch_failure_is_a_502(self):
+        mocked = self.transport
+
+        def handler(request):
+            if request.url.path == "/.well-known/jwks.json":
+                return httpx.Response(500)
+            return mocked.handler(request)
+
+        self.use_transport(httpx.MockTransport(handler))
+        self.assertEqual(self.callback("alice").status_code, 502)
+
+    def test_key_set_fetch_with_breaker_open_is_a_503(self):
+        async def breaker_open():
+            raise http_client.CircuitOpenError("Identity provider temporarily unavailable")
+
+        self.patch(security, auth0_jwks=security.JWKSCache(breaker_open))
+        self.assertEqual(self.callback("alice").status_code, 503)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = http_client.CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        with mock.patch.object(http_client.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+            with self.assertRaises(http_client.CircuitOpenError):
+                breaker.before_call()
+
+        with mock.patch.object(http_client.time, "monotonic", return_value=131.0):
+            breaker.before_call()                       # the probe
+            with self.assertRaises(http_client.CircuitOpenError):
+                breaker.before_call()                   # concurrent caller
+            breaker.record_success()
+            breaker.before_call()
+            breaker.before_call()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_failed_probe_reopens(self):
+        breaker = http_client.CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        with mock.patch.object(http_client.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+        with mock.patch.object(http_client.time, "monotonic", return_value=131.0):
+            breaker.before_call()
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+            with self.assertRaises(http_client.CircuitOpenError):
+                breaker.before_call()
+
+    def test_lost_probe_frees_the_slot(self):
+        breaker = http_client.CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        with mock.patch.object(http_client.time, "monotonic", return_value=100.0):
+            breaker.record_failure()
+        with mock.patch.object(http_client.time, "monotonic", return_value=131.0):
+            breaker.before_call()                       # never reports back
+        with mock.patch.object(http_client.time, "monotonic", return_value=162.0):
+            breaker.before_call()
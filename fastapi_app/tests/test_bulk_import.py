@@ -0,0 +1,100 @@
+import csv
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app import jobs
+from creator_app.models import CreatorProfile, Job, StatCounter, UserData
+from fastapi_app.main import app
+from fastapi_app.routes import bulk_import
+
+KEY = "import-key"
+HEADERS = {"X-Import-Key": KEY}
+
+CREATOR = {
+    "creator_name": "Creator", "creator_type": "Influencer", "experience_level": "Mid",
+    "primary_niche": "Fashion", "platforms": "instagram,tiktok", "portfolio_category": "Photo",
+    "collaboration_type": "Paid", "project_type": "Campaign",
+}
+
+
+def upload(rows):
+    columns = ["email", "role", "password", *CREATOR]
+    out = io.StringIO()
+    writer = csv.DictWriter(out, columns)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+class BulkImportTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(report_dir.cleanup)
+        patcher = mock.patch.multiple(
+            bulk_import, BULK_IMPORT_API_KEY=KEY,
+            REPORT_DIR=report_dir.name, UPLOAD_DIR=os.path.join(report_dir.name, "uploads"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = TestClient(app)
+
+    def start(self, body, **form):
+        res = self.api.post("/import/profiles", files={"file": ("profiles.csv", body)}, data=form, headers=HEADERS)
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def status(self, import_id):
+        return self.api.get(f"/import/{import_id}", headers=HEADERS).json()
+
+    def test_import_runs_on_a_worker(self):
+        started = self.start(upload([
+            {"email": "a@example.com", "role": "creator", "password": "Secret#123", **CREATOR},
+            {"email": "b@example.com", "role": "creator", **CREATOR},
+            {"email": "bad@example.com", "role": "admin"},
+        ]))
+        self.assertEqual(started["status"], Job.QUEUED)
+        self.assertEqual(self.status(started["import_id"])["status"], Job.QUEUED)
+
+        jobs.Worker(poll_interval=0).run(burst=True)
+
+        self.assertEqual(self.status(started["import_id"]), {
+            "import_id": started["import_id"], "status": Job.DONE,
+            "total": 3, "created": 2, "updated": 0, "failed": 1,
+        })
+        self.assertEqual(CreatorProfile.objects.count(), 2)
+        self.assertEqual(os.listdir(bulk_import.UPLOAD_DIR), [])
+
+        report = self.api.get(f"/import/{started['import_id']}/errors", headers=HEADERS)
+        rows = list(csv.reader(io.StringIO(report.text)))
+        self.assertEqual(rows[1][1:], ["bad@example.com", "role must be 'creator' or 'collaborator'"])
+
+    def test_imports_update_the_stats_rollups(self):
+        self.start(upload([{"email": "a@example.com", "role": "creator", **CREATOR}]))
+        jobs.Worker(poll_interval=0).run(burst=True)
+        counts = dict(StatCounter.objects.values_list("key", "value").filter(metric="creators_by_niche"))
+        self.assertEqual(counts, {"fashion": 1})
+
+        # Upserting the same profile into another niche moves the count.
+        self.start(upload([{"email": "a@example.com", "role": "creator", **CREATOR, "primary_niche": "Travel"}]), mode="upsert")
+        jobs.Worker(poll_interval=0).run(burst=True)
+        counts = dict(StatCounter.objects.values_list("key", "value").filter(metric="creators_by_niche"))
+        self.assertEqual(counts, {"fashion": 0, "travel": 1})
+        self.assertEqual(StatCounter.objects.get(metric="creators", key="all").value, 1)
+        self.assertEqual(UserData.objects.count(), 1)
+
+    def test_failed_import_reports_the_error(self):
+        started = self.start(b"email,role\n")
+        with mock.patch.object(bulk_import.tasks.bulk_import, "import_profiles", side_effect=OSError("disk full")):
+            jobs.Worker(poll_interval=0).run(burst=True)
+        status = self.status(started["import_id"])
+        self.assertEqual((status["status"], status["error"]), (Job.FAILED, "OSError: disk full"))
+
+    def test_unknown_import(self):
+        self.assertEqual(self.api.get("/import/999", headers=HEADERS).status_code, 404)
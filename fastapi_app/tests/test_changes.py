@@ -0,0 +1,53 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import ChangeLog
+from fastapi_app.main import app
+from fastapi_app.routes import changes
+
+KEY = "changes-key"
+HEADERS = {"X-Changes-Key": KEY}
+
+
+class ChangeFeedTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        patcher = mock.patch.object(changes, "CHANGES_API_KEY", KEY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = TestClient(app)
+        self.entries = [
+            ChangeLog.objects.create(entity=entity, object_id=i) for i, entity in enumerate(("user", "creator", "creator"))
+        ]
+        # Old enough to be past the settle window.
+        ChangeLog.objects.update(created_at=self.entries[0].created_at - timedelta(minutes=1))
+
+    def test_feed_needs_the_service_key(self):
+        for headers, detail in (({}, "Invalid changes key"), ({"X-Changes-Key": "wrong"}, "Invalid changes key")):
+            with self.subTest(headers=headers):
+                res = self.api.get("/changes", headers=headers)
+                self.assertEqual((res.status_code, res.json()["detail"]), (403, detail))
+
+        with mock.patch.object(changes, "CHANGES_API_KEY", None):
+            res = self.api.get("/changes", headers=HEADERS)
+        self.assertEqual((res.status_code, res.json()["detail"]), (403, "Change feed is disabled"))
+
+    def test_pages_follow_next(self):
+        ids = [entry.id for entry in self.entries]
+        first = self.api.get("/changes", params={"limit": 2}, headers=HEADERS).json()
+        self.assertEqual(([c["id"] for c in first["changes"]], first["next"], first["has_more"]), (ids[:2], ids[1], True))
+
+        rest = self.api.get("/changes", params={"after": first["next"]}, headers=HEADERS).json()
+        self.assertEqual(([c["id"] for c in rest["changes"]], rest["next"], rest["has_more"]), (ids[2:], ids[2], False))
+
+        creators = self.api.get("/changes", params={"entity": "creator"}, headers=HEADERS).json()
+        self.assertEqual([c["id"] for c in creators["changes"]], ids[1:])
+
+    def test_fresh_entries_are_held_back(self):
+        ChangeLog.objects.create(entity="user", object_id=99)
+        res = self.api.get("/changes", params={"after": self.entries[-1].id}, headers=HEADERS).json()
+        self.assertEqual((res["changes"], res["next"], res["has_more"]), ([], self.entries[-1].id, False))
@@ -0,0 +1,133 @@
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import ChangeLog, CreatorProfile, UserData
+from fastapi_app import security
+from fastapi_app.conditional import PUBLIC_PROFILE_CACHE
+from fastapi_app.main import app
+from fastapi_app.sql_profiler import query_budget
+
+
+class ConditionalGetTests(TransactionTestCase):
+    """Profile reads carry an ETag; revalidating with it costs a 304 and one narrow query."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.user = UserData.objects.create(email="creator@example.com", role="creator")
+        CreatorProfile.objects.create(
+            user=self.user, creator_name="Creator", creator_type="Influencer", experience_level="Mid",
+            primary_niche="Fashion", portfolio_category="Photo", collaboration_type="Paid", project_type="Campaign",
+        )
+        self.url = f"/creator/get/{self.user.id}"
+
+    def get(self, etag=None):
+        return self.api.get(self.url, headers={"If-None-Match": etag} if etag else {})
+
+    def test_matching_etag_returns_304(self):
+        first = self.get()
+        etag = first.headers["etag"]
+        self.assertEqual((first.status_code, first.headers["cache-control"]), (200, PUBLIC_PROFILE_CACHE))
+
+        with query_budget(1):
+            res = self.get(etag)
+        self.assertEqual((res.status_code, res.content), (304, b""))
+        self.assertEqual((res.headers["etag"], res.headers["cache-control"]), (etag, PUBLIC_PROFILE_CACHE))
+
+        # Weak comparison, lists and "*" all match.
+        for header in (f"W/{etag}", f'"stale", {etag}', "*"):
+            with self.subTest(header=header):
+                self.assertEqual(self.get(header).status_code, 304)
+
+    def test_stale_etag_returns_the_new_version(self):
+        etag = self.get().headers["etag"]
+        self.assertEqual(self.get('"stale"').status_code, 200)
+
+        # The payload includes the user's email, so a user update changes the ETag too.
+        self.user.email = "renamed@example.com"
+        self.user.save()
+        res = self.get(etag)
+        self.assertEqual((res.status_code, res.json()["email"]), (200, "renamed@example.com"))
+        self.assertNotEqual(res.headers["etag"], etag)
+
+    def test_unknown_profile_is_still_404(self):
+        self.url = "/creator/get/999999"
+        self.assertEqual(self.get('"anything"').status_code, 404)
+
+
+class ConditionalUpdateTests(TransactionTestCase):
+    """PATCH writes only the fields sent, guarded by If-Match or updated_at."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.user = UserData.objects.create(email="creator@example.com", role="creator", first_name="Ada", city="Pune")
+        CreatorProfile.objects.create(
+            user=self.user, creator_name="Creator", creator_type="Influencer", experience_level="Mid",
+            primary_niche="Fashion", portfolio_category="Photo", collaboration_type="Paid", project_type="Campaign",
+        )
+        self.url = f"/creator/edit/{self.user.id}"
+        self.headers = {"Authorization": f"Bearer {security.create_access_token(self.user.id, 'creator')}"}
+
+    def patch(self, url=None, headers=(), **fields):
+        return self.api.patch(url or self.url, json=fields, headers={**self.headers, **dict(headers)})
+
+    def profile(self):
+        return CreatorProfile.objects.get(user=self.user)
+
+    def test_partial_update_leaves_other_columns_alone(self):
+        # Written after the client's read; a full-row save would put "Fashion" back.
+        CreatorProfile.objects.filter(user=self.user).update(primary_niche="Travel")
+
+        res = self.patch(location="Chennai", secondary_niche=None)
+        self.assertEqual(res.status_code, 200, res.text)
+        profile = self.profile()
+        self.assertEqual((profile.location, profile.secondary_niche, profile.primary_niche), ("Chennai", None, "Travel"))
+        self.assertEqual(res.json()["updated_at"], profile.updated_at.isoformat().replace("+00:00", "Z"))
+        self.assertEqual(ChangeLog.objects.filter(entity="creator", object_id=self.user.id).count(), 1)
+
+        # The returned ETag is the one the next read carries.
+        self.assertEqual(res.headers["etag"], self.api.get(f"/creator/get/{self.user.id}").headers["etag"])
+
+    def test_stale_if_match_is_rejected(self):
+        etag = self.api.get(f"/creator/get/{self.user.id}").headers["etag"]
+        self.assertEqual(self.patch(headers={"If-Match": etag}, location="Chennai").status_code, 200)
+
+        for header in (etag, f"W/{self.api.get(f'/creator/get/{self.user.id}').headers['etag']}"):
+            with self.subTest(header=header):
+                res = self.patch(headers={"If-Match": header}, location="Kochi")
+                self.assertEqual((res.status_code, res.json()["detail"]), (412, "Resource was modified; reload and retry"))
+        self.assertEqual(self.profile().location, "Chennai")
+        self.assertEqual(ChangeLog.objects.filter(entity="creator").count(), 1)
+
+    def test_stale_updated_at_is_rejected(self):
+        first = self.patch(location="Chennai").json()["updated_at"]
+        self.assertEqual(self.patch(location="Kochi", updated_at=first).status_code, 200)
+        self.assertEqual(self.patch(location="Pune", updated_at=first).status_code, 412)
+        self.assertEqual(self.profile().location, "Kochi")
+
+    def test_null_on_a_required_field_is_rejected(self):
+        res = self.patch(creator_name=None)
+        self.assertEqual((res.status_code, res.json()["detail"]), (422, "creator_name cannot be null"))
+        self.assertEqual(self.profile().creator_name, "Creator")
+
+    def test_empty_patch_and_missing_row(self):
+        self.assertEqual(self.patch().status_code, 400)
+        CreatorProfile.objects.filter(user=self.user).delete()
+        self.assertEqual(self.patch(location="Chennai").status_code, 404)
+
+    def test_user_patch(self):
+        url = f"/profile/edit/{self.user.id}"
+        UserData.objects.filter(id=self.user.id).update(first_name="Grace")
+
+        res = self.patch(url, city="Kochi")
+        self.assertEqual(res.status_code, 200, res.text)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.city, self.user.first_name), ("Kochi", "Grace"))
+
+        self.assertEqual(self.patch(url, headers={"If-Match": '"stale"'}, city="Pune").status_code, 412)
+        self.assertEqual(self.patch(url, email=None, city=None).status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.city, self.user.email), (None, "creator@example.com"))
@@ -0,0 +1,68 @@
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app import messaging
+from creator_app.models import ConversationParticipant, Message, UserData
+from fastapi_app import security
+from fastapi_app.main import app
+
+
+class GroupAuthTests(TransactionTestCase):
+    """Every group route acts for the user named in the request; the token must be that user's."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.owner, self.member, self.outsider = (
+            UserData.objects.create(email=f"{name}@example.com", role="creator") for name in ("owner", "member", "outsider")
+        )
+        self.group = messaging.create_group(self.owner.id, "Team", [self.member.id]).id
+
+    def as_user(self, user):
+        return {"Authorization": f"Bearer {security.create_access_token(user.id, 'creator')}"}
+
+    def requests(self, acting):
+        """(method, url, kwargs) for every group route, acting as `acting`."""
+        g = self.group
+        return [
+            ("POST", "/group/create", {"json": {"owner_id": acting.id, "member_ids": [self.owner.id]}}),
+            ("GET", "/group/list", {"params": {"user_id": acting.id}}),
+            ("GET", f"/group/{g}", {"params": {"user_id": acting.id}}),
+            ("POST", f"/group/{g}/members", {"json": {"user_id": acting.id, "member_ids": [self.outsider.id]}}),
+            ("DELETE", f"/group/{g}/members/{acting.id}", {"params": {"user_id": acting.id}}),
+            ("POST", f"/group/{g}/send", {"data": {"sender_id": acting.id, "content": "hi"}}),
+            ("GET", f"/group/{g}/messages", {"params": {"user_id": acting.id}}),
+            ("POST", f"/group/{g}/receipt", {"json": {"user_id": acting.id, "read_seq": 1}}),
+        ]
+
+    def test_routes_need_a_token(self):
+        for method, url, kwargs in self.requests(self.member):
+            with self.subTest(method=method, url=url):
+                self.assertEqual(self.api.request(method, url, **kwargs).status_code, 401)
+
+    def test_routes_reject_another_users_token(self):
+        # The outsider's token, claiming to act as the member.
+        for method, url, kwargs in self.requests(self.member):
+            with self.subTest(method=method, url=url):
+                res = self.api.request(method, url, headers=self.as_user(self.outsider), **kwargs)
+                self.assertEqual((res.status_code, res.json()["detail"]), (403, "Not allowed to act on this user"))
+        self.assertEqual(Message.objects.count(), 0)
+        self.assertEqual(ConversationParticipant.objects.filter(conversation_id=self.group).count(), 2)
+
+    def test_members_act_with_their_own_token(self):
+        headers = self.as_user(self.member)
+        res = self.api.post(f"/group/{self.group}/send", data={"sender_id": self.member.id, "content": "hi"}, headers=headers)
+        self.assertEqual(res.status_code, 200, res.text)
+        res = self.api.get(f"/group/{self.group}/messages", params={"user_id": self.member.id}, headers=headers)
+        self.assertEqual([m["content"] for m in res.json()["messages"]], ["hi"])
+
+        # A valid token is not membership.
+        res = self.api.get(f"/group/{self.group}", params={"user_id": self.outsider.id}, headers=self.as_user(self.outsider))
+        self.assertEqual(res.status_code, 403)
+
+        res = self.api.post(
+            f"/group/{self.group}/members", json={"user_id": self.owner.id, "member_ids": [self.outsider.id]},
+            headers=self.as_user(self.owner),
+        )
+        self.assertEqual(res.json()["added"], 1)
@@ -0,0 +1,80 @@
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import CollaboratorProfile, Conversation, CreatorProfile, Message, UserData
+from fastapi_app import security
+from fastapi_app.main import app
+from fastapi_app.user_cards import user_cards
+
+
+class HomeTests(TransactionTestCase):
+    """/home fills in the sections that match the user's role and leaves the others empty."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        user_cards.clear()
+        self.addCleanup(user_cards.clear)
+        self.api = TestClient(app)
+        self.creators = [self.creator(f"creator{i}@example.com", followers) for i, followers in enumerate((10, 500, None))]
+        self.collaborators = [self.collaborator(f"collab{i}@example.com") for i in range(2)]
+        self.member = UserData.objects.create(email="member@example.com", first_name="Member")
+
+    def creator(self, email, followers):
+        user = UserData.objects.create(email=email, role="creator")
+        CreatorProfile.objects.create(
+            user=user, creator_name=email, creator_type="Influencer", experience_level="Mid", primary_niche="Fashion",
+            portfolio_category="Photo", collaboration_type="Paid", project_type="Campaign", followers=followers,
+        )
+        return user
+
+    def collaborator(self, email):
+        user = UserData.objects.create(email=email, role="collaborator")
+        CollaboratorProfile.objects.create(
+            user=user, name=email, language="English", skill_category="Editing", experience="Senior",
+        )
+        return user
+
+    def home(self, user):
+        headers = {"Authorization": f"Bearer {security.create_access_token(user.id, user.role or '')}"}
+        res = self.api.get(f"/home/{user.id}", headers=headers)
+        self.assertEqual(res.status_code, 200, res.text)
+        return res.json()
+
+    def test_creators_get_their_profile_and_collaborator_suggestions(self):
+        me = self.creators[0]
+        home = self.home(me)
+        self.assertEqual((home["user"]["id"], home["user"]["role"]), (me.id, "creator"))
+        self.assertEqual(home["creator_profile"]["user_id"], me.id)
+        self.assertIsNone(home["collaborator_profile"])
+        self.assertEqual(home["suggested_creators"], [])
+        # Newest collaborators first.
+        self.assertEqual([c["user_id"] for c in home["suggested_collaborators"]], [c.id for c in self.collaborators[::-1]])
+
+    def test_collaborators_get_their_profile_and_creator_suggestions(self):
+        me = self.collaborators[0]
+        home = self.home(me)
+        self.assertEqual(home["collaborator_profile"]["user_id"], me.id)
+        self.assertIsNone(home["creator_profile"])
+        self.assertEqual(home["suggested_collaborators"], [])
+        # Most followed first; creators without a follower count are left out.
+        self.assertEqual([c["user_id"] for c in home["suggested_creators"]], [self.creators[1].id, self.creators[0].id])
+
+    def test_users_without_a_role_get_no_profile(self):
+        home = self.home(self.member)
+        self.assertEqual((home["creator_profile"], home["collaborator_profile"]), (None, None))
+        self.assertEqual(len(home["suggested_creators"]), 2)
+        self.assertEqual(home["suggested_collaborators"], [])
+
+    def test_inbox_and_access(self):
+        me, other = self.creators[0], self.collaborators[0]
+        convo = Conversation.objects.create(user1=me, user2=other)
+        for content in ("hi", "are you free?"):
+            Message.objects.create(conversation=convo, sender=other, content=content)
+
+        (entry,) = self.home(me)["inbox"]
+        self.assertEqual((entry["conversation_id"], entry["user"]["id"]), (convo.id, other.id))
+        self.assertEqual((entry["last_message"], entry["unread"]), ("are you free?", 2))
+
+        headers = {"Authorization": f"Bearer {security.create_access_token(other.id, 'collaborator')}"}
+        self.assertEqual(self.api.get(f"/home/{me.id}", headers=headers).status_code, 403)
@@ -0,0 +1,102 @@
+import hashlib
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from fastapi_app import imaging
+from fastapi_app.imaging import AVATAR_MAX_SIDE, AVATAR_SIZES, InvalidImage, render_avatar
+from fastapi_app.media import avatar_name, avatar_thumbnail, avatar_urls
+from fastapi_app.routes import my_profile
+
+KEY = "0123456789abcdef0123456789abcdef"
+
+
+class RenderAvatarTests(SimpleTestCase):
+    """render_avatar runs in the pool's worker processes; here it is called directly."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def write(self, image, fmt, **params):
+        path = os.path.join(self.dir, f"upload.{fmt.lower()}")
+        image.save(path, fmt, **params)
+        return path
+
+    def open(self, data):
+        image = Image.open(io.BytesIO(data))
+        self.assertEqual(image.format, "WEBP")
+        return image
+
+    def test_full_rendition_is_capped_and_squares_are_cropped(self):
+        renditions = render_avatar(self.write(Image.new("RGB", (3000, 1500), "red"), "PNG"))
+        self.assertEqual(set(renditions), {"full", *AVATAR_SIZES})
+        self.assertEqual(self.open(renditions["full"]).size, (AVATAR_MAX_SIDE, AVATAR_MAX_SIDE // 2))
+        for size in AVATAR_SIZES:
+            self.assertEqual(self.open(renditions[size]).size, (size, size))
+
+    def test_small_images_are_not_upscaled(self):
+        renditions = render_avatar(self.write(Image.new("RGB", (300, 200), "red"), "JPEG"))
+        self.assertEqual(self.open(renditions["full"]).size, (300, 200))
+
+    def test_exif_orientation_is_applied_and_metadata_dropped(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6    # Orientation: rotate 90 degrees clockwise
+        renditions = render_avatar(self.write(Image.new("RGB", (300, 200), "red"), "JPEG", exif=exif))
+        full = self.open(renditions["full"])
+        self.assertEqual(full.size, (200, 300))
+        self.assertNotIn(0x0112, full.getexif())
+
+    def test_transparency_is_kept(self):
+        renditions = render_avatar(self.write(Image.new("RGBA", (100, 100), (0, 0, 0, 0)), "PNG"))
+        self.assertEqual(self.open(renditions[64]).mode, "RGBA")
+
+    def test_invalid_images_are_rejected(self):
+        junk = os.path.join(self.dir, "junk.png")
+        with open(junk, "wb") as f:
+            f.write(b"not an image")
+        tiff = self.write(Image.new("RGB", (10, 10)), "TIFF")
+        for path in (junk, tiff):
+            with self.subTest(path=path), self.assertRaises(InvalidImage):
+                render_avatar(path)
+
+    def test_oversized_images_are_refused_before_decoding(self):
+        path = self.write(Image.new("RGB", (200, 200)), "PNG")
+        with mock.patch.object(imaging, "AVATAR_MAX_PIXELS", 100 * 100), self.assertRaises(InvalidImage):
+            render_avatar(path)
+
+
+class ContentAddressTests(SimpleTestCase):
+
+    def test_key_is_a_hash_of_the_uploaded_bytes(self):
+        body = os.urandom(my_profile.UPLOAD_CHUNK_SIZE * 2 + 5)
+        path, key = my_profile._spool_upload(io.BytesIO(body), limit=len(body))
+        self.addCleanup(os.unlink, path)
+        self.assertEqual(key, hashlib.sha256(body).hexdigest()[:32])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), body)
+
+    def test_oversized_upload_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as spool:
+            mkstemp = tempfile.mkstemp
+            with mock.patch.object(my_profile.tempfile, "mkstemp", lambda **kw: mkstemp(dir=spool, **kw)):
+                with self.assertRaises(my_profile.UploadTooLarge):
+                    my_profile._spool_upload(io.BytesIO(b"x" * 10), limit=9)
+            self.assertEqual(os.listdir(spool), [])
+
+    def test_rendition_names(self):
+        self.assertEqual(avatar_name(KEY), f"avatars/{KEY}.webp")
+        self.assertEqual(avatar_name(KEY, 64), f"avatars/{KEY}-64.webp")
+
+        urls = avatar_urls(avatar_name(KEY))
+        self.assertEqual(urls, {str(size): f"/media/avatars/{KEY}-{size}.webp" for size in AVATAR_SIZES})
+        self.assertEqual(avatar_thumbnail(avatar_name(KEY)), f"/media/avatars/{KEY}-128.webp")
+
+        # Pictures stored before normalization keep their single original file.
+        self.assertIsNone(avatar_urls("profile_pics/me.png"))
+        self.assertEqual(avatar_thumbnail("profile_pics/me.png"), "/media/profile_pics/me.png")
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+
+from django.test import SimpleTestCase, override_settings
+from fastapi.testclient import TestClient
+
+from fastapi_app.main import app
+from fastapi_app.media import media_url, signed_query
+
+PRIVATE = "message_files/secret.txt"
+
+
+class MediaTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name, body in ((PRIVATE, b"secret"), ("avatars/public.txt", b"public")):
+            os.makedirs(os.path.join(tmp.name, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(tmp.name, name), "wb") as f:
+                f.write(body)
+
+        overrides = override_settings(MEDIA_ROOT=tmp.name, MEDIA_SIGNED_URLS=True, MEDIA_URL_TTL=3600)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.root = tmp.name
+        self.api = TestClient(app)
+
+    def test_public_files_need_no_signature(self):
+        res = self.api.get("/media/avatars/public.txt")
+        self.assertEqual((res.status_code, res.content), (200, b"public"))
+        self.assertEqual(res.headers["cache-control"], "public, no-cache")
+
+    def test_private_files_need_a_valid_signature(self):
+        self.assertEqual(self.api.get(f"/media/{PRIVATE}").status_code, 403)
+
+        res = self.api.get(media_url(PRIVATE))
+        self.assertEqual((res.status_code, res.content), (200, b"secret"))
+        self.assertTrue(res.headers["cache-control"].startswith("private, max-age="))
+
+        expired = signed_query(PRIVATE, now=time.time() - 3 * 3600)
+        self.assertEqual(self.api.get(f"/media/{PRIVATE}?{expired}").status_code, 403)
+
+        other = signed_query("message_files/other.txt")
+        self.assertEqual(self.api.get(f"/media/{PRIVATE}?{other}").status_code, 403)
+
+    def test_dot_segments_are_not_served(self):
+        # Percent-encoded so the client does not normalize them away; the
+        # route sees the same decoded name as for a raw `..` on the wire.
+        for path in (
+            "/media/%2e/message_files/secret.txt",
+            "/media/avatars/%2e%2e/message_files/secret.txt",
+            "/media/message_files//secret.txt",
+            "/media/%2e%2e/etc/passwd",
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.api.get(path).status_code, 404)
+
+    def test_symlink_into_a_private_dir_stays_private(self):
+        os.symlink(os.path.join(self.root, "message_files"), os.path.join(self.root, "avatars", "files"))
+        self.assertEqual(self.api.get("/media/avatars/files/secret.txt").status_code, 403)
@@ -0,0 +1,245 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+from fastapi.testclient import TestClient
+
+from creator_app import jobs, messaging
+from creator_app.models import Conversation, Message, UserData
+from fastapi_app import security
+from fastapi_app.idempotency import IDEMPOTENCY_KEY_MAX_LENGTH, REPLAYED_HEADER, sent_messages
+from fastapi_app.main import app
+from fastapi_app.routes import message
+
+
+def as_user(user):
+    return {"Authorization": f"Bearer {security.create_access_token(user.id, 'creator')}"}
+
+
+class MessageAuthTests(TransactionTestCase):
+    """Every 1:1 route acts for the user named in the request; the token must be that user's."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.me, self.other, self.outsider = (
+            UserData.objects.create(email=f"{name}@example.com", role="creator") for name in ("me", "other", "outsider")
+        )
+        self.convo = Conversation.objects.create(user1=self.me, user2=self.other)
+
+    def requests(self, acting):
+        """(method, url, kwargs) for every route addressed by user id, acting as `acting`."""
+        return [
+            ("GET", "/message/users", {"params": {"current_user_id": acting.id}}),
+            ("POST", "/message/typing", {"json": {"user_id": acting.id, "chat_with": self.other.id, "is_typing": True}}),
+            ("POST", "/message/send", {"data": {"sender_id": acting.id, "receiver_id": self.other.id, "content": "hi"}}),
+            ("GET", f"/message/conversation/{acting.id}/{self.other.id}", {}),
+            ("POST", f"/message/seen/{self.convo.id}/{acting.id}", {}),
+            ("GET", "/message/sync", {"params": {"user_id": acting.id}}),
+        ]
+
+    def test_routes_need_a_token(self):
+        for method, url, kwargs in self.requests(self.me):
+            with self.subTest(method=method, url=url):
+                self.assertEqual(self.api.request(method, url, **kwargs).status_code, 401)
+
+    def test_routes_reject_another_users_token(self):
+        for method, url, kwargs in self.requests(self.me):
+            with self.subTest(method=method, url=url):
+                res = self.api.request(method, url, headers=as_user(self.outsider), **kwargs)
+                self.assertEqual((res.status_code, res.json()["detail"]), (403, "Not allowed to act on this user"))
+        self.assertEqual(Message.objects.count(), 0)
+
+    def test_users_act_with_their_own_token(self):
+        for method, url, kwargs in self.requests(self.me):
+            with self.subTest(method=method, url=url):
+                res = self.api.request(method, url, headers=as_user(self.me), **kwargs)
+                self.assertLess(res.status_code, 300, res.text)
+
+        # Either side of the conversation may read it.
+        res = self.api.get(f"/message/conversation/{self.me.id}/{self.other.id}", headers=as_user(self.other))
+        self.assertEqual([m["content"] for m in res.json()["messages"]], ["hi"])
+
+    def test_a_replay_needs_the_senders_token(self):
+        data = {"sender_id": self.me.id, "receiver_id": self.other.id, "content": "private note", "client_message_id": "k1"}
+        self.assertEqual(self.api.post("/message/send", data=data, headers=as_user(self.me)).status_code, 200)
+        res = self.api.post("/message/send", data=data, headers=as_user(self.outsider))
+        self.assertEqual(res.status_code, 403)
+        self.assertNotIn("private note", res.text)
+
+
+class MarkSeenTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.me = UserData.objects.create(email="me@example.com", role="creator")
+        self.other = UserData.objects.create(email="other@example.com", role="creator")
+        self.convo = Conversation.objects.create(user1=self.me, user2=self.other)
+        for sender in (self.other, self.other, self.me):
+            Message.objects.create(conversation=self.convo, sender=sender, content="hi")
+
+    def test_seen_is_queued_then_applied_by_the_worker(self):
+        res = self.api.post(f"/message/seen/{self.convo.id}/{self.me.id}", headers=as_user(self.me))
+        self.assertEqual((res.status_code, res.json()), (202, {"status": "seen update queued"}))
+        self.assertEqual(Message.objects.filter(is_seen=True).count(), 0)
+
+        jobs.Worker(poll_interval=0).run(burst=True)
+        self.assertEqual(Message.objects.filter(is_seen=True).count(), 2)
+        self.assertFalse(Message.objects.get(sender=self.me).is_seen)
+
+    def test_unknown_conversation(self):
+        self.assertEqual(self.api.post(f"/message/seen/999/{self.me.id}", headers=as_user(self.me)).status_code, 404)
+
+
+class IdempotentSendTests(TransactionTestCase):
+    """Retried sends replay the first response: from the cache, the row, or the unique constraint."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        overrides = override_settings(MEDIA_ROOT=tmp.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.media_root = tmp.name
+
+        sent_messages.clear()
+        self.addCleanup(sent_messages.clear)
+        self.api = TestClient(app)
+        self.me = UserData.objects.create(email="me@example.com", role="creator")
+        self.other = UserData.objects.create(email="other@example.com", role="creator")
+
+    def send(self, key=None, client_message_id=None, **kwargs):
+        data = {"sender_id": self.me.id, "receiver_id": self.other.id, "content": "hi"}
+        if client_message_id is not None:
+            data["client_message_id"] = client_message_id
+        headers = as_user(self.me)
+        if key is not None:
+            headers["Idempotency-Key"] = key
+        return self.api.post("/message/send", data=data, headers=headers, **kwargs)
+
+    def stored_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+    def test_repeated_key_replays_the_original(self):
+        first = self.send(key="k1")
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertNotIn(REPLAYED_HEADER, first.headers)
+
+        again = self.send(key="k1")
+        self.assertEqual((again.status_code, again.json()), (200, first.json()))
+        self.assertEqual(again.headers[REPLAYED_HEADER], "true")
+        self.assertEqual(Message.objects.count(), 1)
+
+        # Keys are per sender: a new key is a new message.
+        self.assertNotEqual(self.send(key="k2").json()["message_id"], first.json()["message_id"])
+
+    def test_header_and_client_message_id_are_one_key(self):
+        first = self.send(client_message_id="k1").json()
+        res = self.send(key="k1")
+        self.assertEqual((res.json(), res.headers[REPLAYED_HEADER]), (first, "true"))
+        self.assertEqual(self.send(key="k1", client_message_id="k1").json(), first)
+
+        res = self.send(key="k1", client_message_id="k2")
+        self.assertEqual((res.status_code, res.json()["detail"]), (400, "Idempotency-Key and client_message_id differ"))
+        self.assertEqual(Message.objects.count(), 1)
+
+    def test_cache_miss_replays_from_the_row(self):
+        first = self.send(key="k1").json()
+        sent_messages.clear()    # evicted, or the retry reached another worker
+        res = self.send(key="k1")
+        self.assertEqual((res.json(), res.headers[REPLAYED_HEADER]), (first, "true"))
+        self.assertEqual(Message.objects.count(), 1)
+
+    def test_concurrent_retry_falls_back_on_the_unique_constraint(self):
+        first = self.send(key="k1", files={"file": ("a.txt", b"first")}).json()
+        sent_messages.clear()
+
+        # The retry's lookup misses as if it ran before the first insert committed.
+        find_sent = message._find_sent
+        lookups = []
+
+        async def first_lookup_misses(sender_id, key):
+            lookups.append(key)
+            return None if len(lookups) == 1 else await find_sent(sender_id, key)
+
+        with mock.patch.object(message, "_find_sent", first_lookup_misses):
+            res = self.send(key="k1", files={"file": ("b.txt", b"retry")})
+        self.assertEqual((res.status_code, res.json()), (200, first))
+        self.assertEqual(res.headers[REPLAYED_HEADER], "true")
+        self.assertEqual(len(lookups), 2)
+        self.assertEqual(Message.objects.count(), 1)
+        # The retry's attachment is removed again.
+        self.assertEqual(self.stored_files(), ["a.txt"])
+
+    def test_overlong_keys_are_rejected(self):
+        key = "k" * (IDEMPOTENCY_KEY_MAX_LENGTH + 1)
+        self.assertEqual(self.send(key=key).status_code, 422)
+        self.assertEqual(self.send(client_message_id=key).status_code, 422)
+        self.assertEqual(self.send(key=key[:-1]).status_code, 200)
+        self.assertEqual(Message.objects.count(), 1)
+
+
+class SyncTests(TransactionTestCase):
+    """/message/sync pages through changes per conversation; `seq` is the next call's cursor."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        patcher = mock.patch.object(message, "SYNC_MAX_MESSAGES", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = TestClient(app)
+        self.me, self.other, self.third = (
+            UserData.objects.create(email=f"{name}@example.com", role="creator") for name in ("me", "other", "third")
+        )
+        self.a = Conversation.objects.create(user1=self.me, user2=self.other)
+        self.b = Conversation.objects.create(user1=self.third, user2=self.me)
+        for i in range(5):
+            messaging.create_message(self.a, sender=self.other, content=f"a{i}")
+        for i in range(2):
+            messaging.create_message(self.b, sender=self.third, content=f"b{i}")
+
+    def sync(self, since=None):
+        res = self.api.get("/message/sync", params={"user_id": self.me.id, "since": since}, headers=as_user(self.me))
+        self.assertEqual(res.status_code, 200, res.text)
+        body = res.json()
+        pages = [(c["conversation_id"], c["seq"], [m["content"] for m in c["messages"]]) for c in body["conversations"]]
+        return pages, body["has_more"]
+
+    def test_pages_follow_the_cursors(self):
+        a, b = self.a.id, self.b.id
+        self.assertEqual(self.sync(), ([(a, 3, ["a0", "a1", "a2"])], True))
+        # Conversations left out of `since` start from 0.
+        self.assertEqual(self.sync(f"{a}:3"), ([(a, 5, ["a3", "a4"]), (b, 1, ["b0"])], True))
+        self.assertEqual(self.sync(f"{a}:5,{b}:1"), ([(b, 2, ["b1"])], False))
+        self.assertEqual(self.sync(f"{a}:5,{b}:2"), ([], False))
+
+    def test_receipts_come_back_as_changes(self):
+        a, b = self.a.id, self.b.id
+        messaging.mark_seen(b, self.me.id)
+        pages, has_more = self.sync(f"{a}:5,{b}:2")
+        self.assertEqual((pages, has_more), ([(b, 3, ["b0", "b1"])], False))
+
+        # One receipt batch bigger than a page is sent whole rather than stalling the cursor.
+        messaging.mark_seen(a, self.me.id)
+        pages, has_more = self.sync(f"{a}:5,{b}:3")
+        self.assertEqual(pages, [(a, 6, ["a0", "a1", "a2", "a3", "a4"])])
+        self.assertEqual(self.sync(f"{a}:6,{b}:3"), ([], False))
+
+    def test_a_page_never_ends_inside_a_receipt_batch(self):
+        a, b = self.a.id, self.b.id
+        messaging.create_message(self.b, sender=self.third, content="b2")
+        messaging.create_message(self.b, sender=self.me, content="mine")
+        messaging.mark_seen(b, self.me.id)    # b0..b2 move to seq 5 together
+
+        self.assertEqual(self.sync(f"{a}:5,{b}:3"), ([(b, 4, ["mine"])], True))
+        self.assertEqual(self.sync(f"{a}:5,{b}:4"), ([(b, 5, ["b0", "b1", "b2"])], False))
+
+    def test_bad_cursor(self):
+        res = self.api.get("/message/sync", params={"user_id": self.me.id, "since": "1:x"}, headers=as_user(self.me))
+        self.assertEqual(res.status_code, 400)
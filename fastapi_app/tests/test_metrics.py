@@ -0,0 +1,76 @@
+import re
+
+from django.test import SimpleTestCase, TransactionTestCase
+from fastapi.testclient import TestClient
+
+from fastapi_app.main import app
+from fastapi_app.metrics import CONTENT_TYPE, LATENCY_BUCKETS, MetricsRegistry
+
+
+def samples(text, name):
+    """{labels: value} for every sample of metric `name` in an exposition."""
+    pattern = re.compile(rf"^{name}(\{{.*\}}) (\S+)$", re.M)
+    return {labels: float(value) for labels, value in pattern.findall(text)}
+
+
+class HistogramTests(SimpleTestCase):
+
+    def test_buckets_are_cumulative_and_inclusive(self):
+        metrics = MetricsRegistry()
+        for duration in (0.004, 0.005, 0.3, 60.0):
+            metrics.observe("GET", "/x", 200, duration)
+
+        buckets = samples(metrics.render(), "http_request_duration_seconds_bucket")
+        counts = [buckets[f'{{method="GET",route="/x",le="{bound}"}}'] for bound in LATENCY_BUCKETS + ("+Inf",)]
+        # 0.005 sits on a bound and counts toward it (le is <=).
+        self.assertEqual(counts[:2], [2, 2])
+        self.assertEqual(counts[LATENCY_BUCKETS.index(0.5)], 3)
+        self.assertEqual(counts[-2:], [3, 4])
+        self.assertEqual(counts, sorted(counts))
+
+        text = metrics.render()
+        self.assertEqual(samples(text, "http_request_duration_seconds_count"), {'{method="GET",route="/x"}': 4})
+        self.assertAlmostEqual(samples(text, "http_request_duration_seconds_sum")['{method="GET",route="/x"}'], 60.309)
+
+    def test_label_values_are_escaped(self):
+        metrics = MetricsRegistry()
+        metrics.observe("GET", 'a"b\\c', 200, 0.1)
+        self.assertIn('route="a\\"b\\\\c"', metrics.render())
+
+
+class MetricsEndpointTests(TransactionTestCase):
+
+    databases = "__all__"
+
+    def total(self, text, method, route, status):
+        return samples(text, "http_requests_total").get(f'{{method="{method}",route="{route}",status="{status}"}}', 0)
+
+    def test_requests_are_labelled_by_route_template(self):
+        api = TestClient(app)
+        before = api.get("/metrics").text
+
+        api.get("/profile/get/424242")
+        api.get("/profile/get/434343")
+        api.get("/no/such/route")
+        api.request("BREW", "/metrics")
+
+        res = api.get("/metrics")
+        self.assertEqual(res.headers["content-type"], CONTENT_TYPE)
+        after = res.text
+        for labels, delta in (
+            (("GET", "/profile/get/{user_id}", 404), 2),
+            (("GET", "unmatched", 404), 1),
+            (("OTHER", "/metrics", 405), 1),
+        ):
+            with self.subTest(labels=labels):
+                self.assertEqual(self.total(after, *labels) - self.total(before, *labels), delta)
+        # Raw ids never become label values.
+        self.assertNotIn("424242", after)
+
+        count = samples(after, "http_request_duration_seconds_count")['{method="GET",route="/profile/get/{user_id}"}']
+        inf = samples(after, "http_request_duration_seconds_bucket")[
+            '{method="GET",route="/profile/get/{user_id}",le="+Inf"}'
+        ]
+        self.assertEqual(count, inf)
+        # The scrape itself is the one request in flight.
+        self.assertEqual(samples(after, "http_requests_in_progress")['{method="GET"}'], 1)
@@ -0,0 +1,93 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from creator_app.models import UserData
+from fastapi_app import imaging, security
+from fastapi_app.main import app
+from fastapi_app.media import AVATAR_NAME
+from fastapi_app.routes import my_profile
+
+
+def png(width=300, height=200):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(out, "PNG")
+    return out.getvalue()
+
+
+class ProfilePictureTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        overrides = override_settings(MEDIA_ROOT=tmp.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.addCleanup(imaging.shutdown)
+        self.media_root = tmp.name
+
+        self.api = TestClient(app)
+        self.user = UserData.objects.create(email="pic@example.com", role="creator")
+        token = security.create_access_token(self.user.id, "creator")
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def upload(self, body, **form):
+        return self.api.put(
+            f"/profile/edit/{self.user.id}", data=form,
+            files={"profile_pic": ("me.png", body, "image/png")}, headers=self.headers,
+        )
+
+    def test_upload_stores_every_rendition(self):
+        res = self.upload(png(), first_name="Pic")
+        self.assertEqual(res.status_code, 200, res.text)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Pic")
+        key = AVATAR_NAME.match(self.user.profile_pic.name).group(1)
+        stored = sorted(os.listdir(os.path.join(self.media_root, "avatars")))
+        expected = [f"{key}.webp"] + [f"{key}-{size}.webp" for size in imaging.AVATAR_SIZES]
+        self.assertEqual(stored, sorted(expected))
+        with Image.open(os.path.join(self.media_root, "avatars", f"{key}-64.webp")) as thumb:
+            self.assertEqual((thumb.format, max(thumb.size)), ("WEBP", 64))
+
+        profile = self.api.get(f"/profile/get/{self.user.id}").json()
+        self.assertEqual(set(profile["avatars"]), {str(size) for size in imaging.AVATAR_SIZES})
+        self.assertTrue(profile["profile_pic"].endswith(f"/media/avatars/{key}.webp"))
+
+        # Same bytes again: same name, nothing rewritten.
+        self.assertEqual(self.upload(png()).status_code, 200)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, "avatars"))), len(expected))
+
+    def test_invalid_image_is_rejected(self):
+        res = self.upload(b"not an image")
+        self.assertEqual((res.status_code, res.json()["detail"]), (400, "Invalid image file"))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_pic)
+
+    def test_identical_uploads_share_one_stored_set(self):
+        self.assertEqual(self.upload(png()).status_code, 200)
+        other = UserData.objects.create(email="twin@example.com", role="creator")
+        headers = {"Authorization": f"Bearer {security.create_access_token(other.id, 'creator')}"}
+
+        # Already stored under the same key: nothing is rendered again.
+        with mock.patch.object(my_profile, "normalize_avatar") as normalize:
+            res = self.api.put(
+                f"/profile/edit/{other.id}", files={"profile_pic": ("other-name.png", png(), "image/png")},
+                headers=headers,
+            )
+        self.assertEqual(res.status_code, 200, res.text)
+        normalize.assert_not_called()
+        self.user.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(other.profile_pic.name, self.user.profile_pic.name)
+
+    def test_oversized_upload_is_rejected(self):
+        with mock.patch.object(my_profile, "PROFILE_PIC_MAX_BYTES", 100):
+            res = self.upload(png())
+        self.assertEqual((res.status_code, res.json()["detail"]), (413, "Profile picture too large"))
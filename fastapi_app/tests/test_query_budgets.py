@@ -0,0 +1,67 @@
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import CollaboratorProfile, Conversation, CreatorProfile, Message, UserData
+from fastapi_app import security
+from fastapi_app.main import app
+from fastapi_app.sql_profiler import query_budget
+
+ROWS = 12
+
+
+class QueryBudgetTests(TransactionTestCase):
+    """Read routes cost the same number of queries however many rows they return."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.me = UserData.objects.create(email="me@example.com", role="creator", first_name="Me")
+        for i in range(ROWS):
+            creator = UserData.objects.create(email=f"creator{i}@example.com", role="creator")
+            CreatorProfile.objects.create(
+                user=creator, creator_name=f"Creator {i}", creator_type="Influencer", experience_level="Mid",
+                primary_niche="Fashion", portfolio_category="Photo", collaboration_type="Paid", project_type="Campaign",
+            )
+            collaborator = UserData.objects.create(email=f"collab{i}@example.com", role="collaborator")
+            CollaboratorProfile.objects.create(
+                user=collaborator, name=f"Collaborator {i}", skill_category="Editing", language="English", experience="Mid",
+            )
+            convo = Conversation.objects.create(user1=self.me, user2=creator)
+            for n in range(3):
+                Message.objects.create(conversation=convo, sender=creator, content=f"hello {n}", seq=n + 1)
+        self.creator = CreatorProfile.objects.first().user_id
+        self.collaborator = CollaboratorProfile.objects.first().user_id
+        self.headers = {"Authorization": f"Bearer {security.create_access_token(self.me.id, 'creator')}"}
+
+    def get(self, url, **params):
+        res = self.api.get(url, params=params, headers=self.headers)
+        self.assertEqual(res.status_code, 200, res.text)
+        return res.json()
+
+    def test_list_endpoints(self):
+        with query_budget(1, max_repeats=0):
+            self.assertEqual(len(self.get("/creator/list")), ROWS)
+        with query_budget(1, max_repeats=0):
+            self.assertEqual(len(self.get("/collaborator/list")), ROWS)
+        with query_budget(1, max_repeats=0):
+            self.assertEqual(len(self.get("/creator/search", niche="fashion")), ROWS)
+
+    def test_inbox_has_no_per_user_queries(self):
+        with query_budget(2, max_repeats=0):
+            users = self.get("/message/users", current_user_id=self.me.id)
+        self.assertEqual(len(users), 2 * ROWS)
+        previews = [u["last_message"] for u in users if u["last_message"]]
+        self.assertEqual(previews, ["hello 2"] * ROWS)
+
+    def test_detail_endpoints(self):
+        with query_budget(1, max_repeats=0):
+            self.get(f"/creator/get/{self.creator}")
+        with query_budget(1, max_repeats=0):
+            self.get(f"/collaborator/get/{self.collaborator}")
+        with query_budget(1, max_repeats=0):
+            self.get(f"/profile/get/{self.me.id}")
+        with query_budget(5, max_repeats=0):
+            self.get(f"/message/conversation/{self.me.id}/{self.creator}")
+        with query_budget(5, max_repeats=0):
+            self.get(f"/home/{self.me.id}")
@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+
+from benchmarks import query_plans, seed_data
+from fastapi_app.main import app
+from fastapi_app.routes import changes
+
+SEED = {"users": 300, "creators": 150, "collaborators": 150, "conversations": 300, "messages": 1500, "groups": 10}
+
+
+class QueryPlanTests(TransactionTestCase):
+    """benchmarks/query_plans.py as a test: a hot query that starts full-scanning fails."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        # The app may have been imported before query_plans set its default key.
+        patcher = mock.patch.object(changes, "CHANGES_API_KEY", "query-plans")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        seed_data.seed(SEED, seed_value=42, batch_size=500)
+        self.cases = query_plans.build_cases(query_plans.sample_ids())
+        self.api = TestClient(app)
+
+    def test_hot_queries_use_indexes(self):
+        for case in self.cases:
+            with self.subTest(case=case.name):
+                status, results = query_plans.run_case(self.api, case)
+                self.assertTrue(results, "no queries captured")
+                if status is not None:
+                    self.assertLess(status, 400)
+                bad = query_plans.unexpected_scans(case, results)
+                self.assertEqual(bad, [], "\n".join(f"{r['sql']}\n  {r['plan']}" for r in bad))
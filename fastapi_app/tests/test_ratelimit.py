@@ -0,0 +1,90 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+from fastapi.testclient import TestClient
+
+from fastapi_app import ratelimit, security
+from fastapi_app.ratelimit import RATE_LIMITS, MemoryBackend, RateLimit, RateLimitMiddleware
+
+
+async def ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def limited(rules):
+    return TestClient(RateLimitMiddleware(ok, rules=rules, backend=MemoryBackend()))
+
+
+class TokenBucketTests(SimpleTestCase):
+
+    def hit(self, backend, now):
+        with mock.patch.object(ratelimit.time, "monotonic", return_value=now):
+            return asyncio.run(backend.hit("k", capacity=3, refill_rate=1.0))
+
+    def test_bursts_up_to_capacity_then_refills_over_time(self):
+        backend = MemoryBackend()
+        self.assertEqual([self.hit(backend, 100.0)[0] for _ in range(4)], [True, True, True, False])
+
+        self.assertEqual(self.hit(backend, 101.5), (True, 0.5))
+        self.assertFalse(self.hit(backend, 101.5)[0])
+        # Refill stops at capacity however long the bucket sat idle.
+        self.assertEqual(self.hit(backend, 1000.0), (True, 2.0))
+
+    def test_least_recently_used_buckets_are_evicted(self):
+        backend = MemoryBackend(max_keys=2)
+        for key in ("a", "b", "a", "c"):
+            asyncio.run(backend.hit(key, capacity=1, refill_rate=1.0))
+        self.assertEqual(list(backend._buckets), ["a", "c"])
+
+
+class RateLimitMiddlewareTests(SimpleTestCase):
+
+    def test_rejects_with_429_and_retry_after(self):
+        api = limited([RateLimit("/search", rate=2, per=60, exact=True)])
+        self.assertEqual([api.get("/search").status_code for _ in range(2)], [200, 200])
+
+        res = api.get("/search")
+        self.assertEqual((res.status_code, res.json()), (429, {"detail": "Too many requests"}))
+        self.assertEqual(res.headers["retry-after"], "30")
+        self.assertEqual((res.headers["x-ratelimit-limit"], res.headers["x-ratelimit-remaining"]), ("2", "0"))
+
+    def test_limits_are_per_route_and_per_user(self):
+        api = limited([
+            RateLimit("/send", rate=1, exact=True, methods=("POST",)),
+            RateLimit("/conversation/", rate=2),
+        ])
+        alice, bob = ({"Authorization": f"Bearer {security.create_access_token(i, 'creator')}"} for i in (1, 2))
+
+        self.assertEqual([api.post("/send", headers=alice).status_code for _ in range(2)], [200, 429])
+        self.assertEqual(api.post("/send", headers=bob).status_code, 200)
+        # Other routes and methods keep their own budgets.
+        self.assertEqual(api.get("/send", headers=alice).status_code, 200)
+        self.assertEqual([api.get(f"/conversation/{i}", headers=alice).status_code for i in range(3)], [200, 200, 429])
+        self.assertEqual(api.get("/unlimited", headers=alice).status_code, 200)
+
+    def test_configured_login_limit(self):
+        api = limited(RATE_LIMITS)
+        codes = [api.post("/auth/login").status_code for _ in range(11)]
+        self.assertEqual(codes, [200] * 10 + [429])
+        # Keyed by IP: a token does not buy a fresh bucket.
+        headers = {"Authorization": f"Bearer {security.create_access_token(1, 'creator')}"}
+        self.assertEqual(api.post("/auth/login", headers=headers).status_code, 429)
+
+
+class ClientIdentityTests(SimpleTestCase):
+
+    def identity(self, forwarded, hops=1):
+        scope = {"headers": [(b"x-forwarded-for", forwarded.encode())], "client": ("10.0.0.1", 1234)}
+        with mock.patch.multiple(ratelimit, RATE_LIMIT_TRUST_FORWARDED=True, RATE_LIMIT_PROXY_HOPS=hops):
+            return ratelimit.client_identity(scope, use_token=False)
+
+    def test_forwarded_for_is_read_from_the_right(self):
+        # The client can prepend anything; the proxy appends what it saw.
+        self.assertEqual(self.identity("1.1.1.1, 203.0.113.7"), "203.0.113.7")
+        self.assertEqual(self.identity("1.1.1.1, 203.0.113.7, 10.0.0.2", hops=2), "203.0.113.7")
+
+    def test_short_forwarded_for_falls_back_to_the_peer(self):
+        self.assertEqual(self.identity("203.0.113.7", hops=2), "10.0.0.1")
+        self.assertEqual(self.identity("203.0.113.7", hops=0), "10.0.0.1")
@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TransactionTestCase
+from fastapi.testclient import TestClient
+
+from creator_app.models import CollaboratorProfile, CreatorProfile, UserData
+from fastapi_app import schemas
+from fastapi_app.main import app
+from fastapi_app.responses import ORJSONResponse
+
+
+class ORJSONResponseTests(SimpleTestCase):
+
+    def test_decimals_render_as_numbers(self):
+        body = ORJSONResponse({"price": Decimal("1250.50"), 1: None}).body
+        self.assertEqual(body, b'{"price":1250.5,"1":null}')
+
+    def test_other_unknown_types_still_fail(self):
+        with self.assertRaises(TypeError):
+            ORJSONResponse({"value": object()})
+
+    def test_routes_document_their_response_models(self):
+        paths = app.openapi()["paths"]
+        ok = paths["/collaborator/get/{user_id}"]["get"]["responses"]["200"]["content"]["application/json"]
+        self.assertEqual(ok["schema"], {"$ref": "#/components/schemas/CollaboratorProfileOut"})
+        listed = paths["/creator/list"]["get"]["responses"]["200"]["content"]["application/json"]
+        self.assertEqual(listed["schema"]["items"], {"$ref": "#/components/schemas/CreatorListItem"})
+
+
+class ResponseShapeTests(TransactionTestCase):
+    """
+    The list and search routes hand values() rows straight to orjson, so
+    nothing else checks that they still match the documented models.
+    """
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        creator = UserData.objects.create(email="creator@example.com", role="creator")
+        CreatorProfile.objects.create(
+            user=creator, creator_name="Creator", creator_type="Influencer", experience_level="Mid",
+            primary_niche="Fashion", portfolio_category="Photo", collaboration_type="Paid", project_type="Campaign",
+        )
+        self.collaborator = UserData.objects.create(email="collab@example.com", role="collaborator")
+        CollaboratorProfile.objects.create(
+            user=self.collaborator, name="Editor", language="English", skill_category="Editing",
+            experience="Senior", pricing_amount=Decimal("1250.50"), pricing_unit="per video",
+        )
+
+    def assertShape(self, url, model):
+        res = self.api.get(url)
+        self.assertEqual(res.status_code, 200, res.text)
+        rows = res.json() if isinstance(res.json(), list) else [res.json()]
+        self.assertTrue(rows)
+        for row in rows:
+            self.assertEqual(set(row), set(model.model_fields))
+            model.model_validate(row)
+        return rows
+
+    def test_payloads_match_their_response_models(self):
+        self.assertShape("/creator/list", schemas.CreatorListItem)
+        self.assertShape("/creator/search", schemas.CreatorSearchItem)
+        self.assertShape("/collaborator/list", schemas.CollaboratorListItem)
+        self.assertShape("/collaborator/search", schemas.CollaboratorSearchItem)
+
+    def test_decimal_pricing(self):
+        (profile,) = self.assertShape(f"/collaborator/get/{self.collaborator.id}", schemas.CollaboratorProfileOut)
+        self.assertEqual(profile["pricing_amount"], 1250.5)
+
+        (row,) = self.api.get("/collaborator/search").json()
+        self.assertEqual(row["pricing"], "1250.50 per video")
+        self.assertEqual(self.api.get("/collaborator/search", params={"min_price": 1250.5}).json(), [row])
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from unittest import mock
+
+import jwt
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, TransactionTestCase
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from creator_app.models import UserData
+from fastapi_app import security
+from fastapi_app.main import app
+
+DOMAIN = "tenant.example.auth0.com"
+CLIENT_ID = "test-client"
+
+
+def sign_id_token(private_key, kid, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": f"https://{DOMAIN}/",
+        "aud": CLIENT_ID,
+        "sub": "google-oauth2|123",
+        "email": "social@example.com",
+        "iat": now,
+        "exp": now + 300,
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class TokenTests(SimpleTestCase):
+
+    def test_access_token_round_trip(self):
+        claims = security.decode_token(security.create_access_token(7, "creator"))
+        self.assertEqual((claims["sub"], claims["role"], claims["type"]), ("7", "creator", "access"))
+
+    def test_refresh_token_is_not_an_access_token(self):
+        with self.assertRaises(HTTPException) as ctx:
+            security.decode_token(security.create_refresh_token(7, "hash"), "access")
+        self.assertEqual(ctx.exception.status_code, 401)
+
+    def test_tampered_token_is_rejected(self):
+        header, payload, sig = security.create_access_token(7).split(".")
+        forged = jwt.encode({"sub": "8", "type": "access", "exp": time.time() + 60}, "wrong-key", algorithm="HS256")
+        for token in (f"{header}.{payload}.{sig[::-1]}", forged):
+            with self.assertRaises(HTTPException) as ctx:
+                security.decode_token(token)
+            self.assertEqual(ctx.exception.detail, "Invalid token")
+
+    def test_cached_claims_are_not_shared(self):
+        token = security.create_access_token(7, "creator")
+        security.decode_token(token)["role"] = "admin"
+        self.assertEqual(security.decode_token(token)["role"], "creator")
+
+    def test_startup_needs_a_jwt_key_outside_debug(self):
+        # A fresh process each time: the key is read once, at import.
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "creator_backend.settings"}
+        env.pop("JWT_SECRET_KEY", None)
+
+        def boot(debug):
+            code = f"import creator_backend.settings as s; s.DEBUG = {debug}; import fastapi_app.security"
+            return subprocess.run(
+                [sys.executable, "-c", code], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+
+        failed = boot(False)
+        self.assertNotEqual(failed.returncode, 0)
+        self.assertIn("JWT_SECRET_KEY must be set", failed.stderr)
+        self.assertEqual(boot(True).returncode, 0)
+
+    def test_expiry_is_checked_even_when_the_signature_is_cached(self):
+        token = security.create_access_token(7)
+        security.decode_token(token)
+        later = time.time() + security.ACCESS_TOKEN_TTL + 1
+        with mock.patch.object(security.time, "time", return_value=later):
+            with self.assertRaises(HTTPException) as ctx:
+                security.decode_token(token)
+        self.assertEqual(ctx.exception.detail, "Token expired")
+
+
+@mock.patch.object(security, "AUTH0_DOMAIN", DOMAIN)
+@mock.patch.object(security, "AUTH0_CLIENT_ID", CLIENT_ID)
+class JWKSTests(SimpleTestCase):
+
+    def setUp(self):
+        self.jwks, self.private_key = security.local_keyset("key-1")
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        return self.jwks
+
+    def verify(self, token, cache):
+        return asyncio.run(security.verify_auth0_id_token(token, cache))
+
+    def test_verifies_against_local_keyset(self):
+        cache = security.JWKSCache(self.fetch)
+        claims = self.verify(sign_id_token(self.private_key, "key-1"), cache)
+        self.assertEqual(claims["email"], "social@example.com")
+        self.verify(sign_id_token(self.private_key, "key-1"), cache)
+        self.assertEqual(self.fetches, 1)
+
+    def test_unknown_kid_triggers_a_refresh(self):
+        cache = security.JWKSCache(self.fetch, min_refresh_interval=0)
+        self.verify(sign_id_token(self.private_key, "key-1"), cache)
+
+        # The provider rotates its signing key.
+        self.jwks, self.private_key = security.local_keyset("key-2")
+        claims = self.verify(sign_id_token(self.private_key, "key-2", sub="auth0|rotated"), cache)
+        self.assertEqual(claims["sub"], "auth0|rotated")
+        self.assertEqual(self.fetches, 2)
+
+    def test_refreshes_on_kid_miss_are_rate_limited(self):
+        cache = security.JWKSCache(self.fetch, min_refresh_interval=60)
+        self.verify(sign_id_token(self.private_key, "key-1"), cache)
+        _, other_key = security.local_keyset("key-x")
+        for _ in range(3):
+            with self.assertRaises(HTTPException) as ctx:
+                self.verify(sign_id_token(other_key, "key-x"), cache)
+            self.assertEqual(ctx.exception.detail, "Unknown signing key")
+        self.assertEqual(self.fetches, 1)
+
+    def test_wrong_audience_is_rejected(self):
+        cache = security.JWKSCache(self.fetch)
+        with self.assertRaises(HTTPException) as ctx:
+            self.verify(sign_id_token(self.private_key, "key-1", aud="someone-else"), cache)
+        self.assertEqual(ctx.exception.status_code, 401)
+
+
+class TokenRouteTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        self.api = TestClient(app)
+        self.user = UserData.objects.create(email="tokens@example.com", role="creator", password=make_password("Secret#123"))
+        self.other = UserData.objects.create(email="other@example.com", role="creator")
+
+    def refresh(self, token):
+        return self.api.post("/auth/refresh", params={"refresh_token": token})
+
+    def test_refresh_rotates_tokens(self):
+        first = security.issue_tokens(self.user)
+        res = self.refresh(first["refresh_token"])
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual(body["user_id"], self.user.id)
+        self.assertNotEqual(body["refresh_token"], first["refresh_token"])
+        self.assertEqual(security.decode_token(body["access_token"])["sub"], str(self.user.id))
+
+    def test_password_change_revokes_refresh_tokens(self):
+        tokens = security.issue_tokens(self.user)
+        self.user.password = make_password("Changed#456")
+        self.user.save(update_fields=["password"])
+        res = self.refresh(tokens["refresh_token"])
+        self.assertEqual((res.status_code, res.json()["detail"]), (401, "Refresh token revoked"))
+
+    def test_access_token_cannot_refresh(self):
+        self.assertEqual(self.refresh(security.create_access_token(self.user.id)).status_code, 401)
+
+    def test_authorize_user_rejects_other_users(self):
+        headers = {"Authorization": f"Bearer {security.create_access_token(self.user.id, 'creator')}"}
+        self.assertEqual(self.api.get(f"/home/{self.other.id}", headers=headers).status_code, 403)
+        self.assertEqual(self.api.get("/message/sync", params={"user_id": self.other.id}, headers=headers).status_code, 403)
+        self.assertEqual(self.api.get(f"/home/{self.user.id}").status_code, 401)
+        self.assertEqual(self.api.get(f"/home/{self.user.id}", headers=headers).status_code, 200)
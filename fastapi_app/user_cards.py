@@ -0,0 +1,110 @@
+"""
+User cards: the name / avatar / role / online bundle chat, search and inbox
+screens show next to a user id.
+
+Rows are cached per process in a bounded LRU. Profile edits in this process
+drop the entry at once; other workers see the change within USER_CARD_TTL,
+which also bounds how stale the online flag can get.
+"""
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from creator_app.models import UserData
+from fastapi_app.media import avatar_thumbnail
+
+USER_CARD_TTL = float(os.getenv("USER_CARD_TTL", 30))
+USER_CARD_CACHE_SIZE = int(os.getenv("USER_CARD_CACHE_SIZE", 10_000))
+# Same window the message routes use for "online".
+ONLINE_WINDOW = timedelta(seconds=60)
+
+CARD_FIELDS = ("id", "first_name", "last_name", "profile_pic", "role", "last_active")
+
+
+class UserCardCache:
+    """
+    Bounded LRU of user card rows with a TTL, like ReadYourWrites.
+
+    `generation` moves on every invalidation; a fill that started before one
+    is dropped, so a read racing an edit never re-caches the old row.
+    """
+
+    def __init__(self, ttl: float = USER_CARD_TTL, max_keys: int = USER_CARD_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.generation = 0
+        self._rows = OrderedDict()
+
+    def get_many(self, ids):
+        now = time.monotonic()
+        found = {}
+        for user_id in ids:
+            entry = self._rows.get(user_id)
+            if entry is None:
+                continue
+            expires, row = entry
+            if expires < now:
+                del self._rows[user_id]
+                continue
+            self._rows.move_to_end(user_id)
+            found[user_id] = row
+        return found
+
+    def set_many(self, rows, generation):
+        if generation != self.generation:
+            return
+        expires = time.monotonic() + self.ttl
+        for row in rows:
+            self._rows[row["id"]] = (expires, row)
+            self._rows.move_to_end(row["id"])
+        while len(self._rows) > self.max_keys:
+            self._rows.popitem(last=False)
+
+    def invalidate(self, user_id):
+        self.generation += 1
+        self._rows.pop(user_id, None)
+
+    def clear(self):
+        self.generation += 1
+        self._rows.clear()
+
+
+user_cards = UserCardCache()
+
+
+def invalidate_user_card(user_id):
+    user_cards.invalidate(user_id)
+
+
+async def fetch_card_rows(ids, cache: UserCardCache = user_cards):
+    """Card rows for `ids` (missing users omitted); one id__in query for cache misses."""
+    rows = cache.get_many(ids)
+    missing = [user_id for user_id in ids if user_id not in rows]
+    if missing:
+        generation = cache.generation
+        fetched = [
+            row async for row in UserData.objects.filter(id__in=missing).values(
+                *CARD_FIELDS,
+                creator_name=F("creatorprofile__creator_name"),
+                collaborator_name=F("collaboratorprofile__name"),
+            )
+        ]
+        cache.set_many(fetched, generation)
+        rows.update((row["id"], row) for row in fetched)
+    return rows
+
+
+def build_card(row, request=None, now=None):
+    now = now or timezone.now()
+    name = " ".join(part for part in (row["first_name"], row["last_name"]) if part)
+    return {
+        "id": row["id"],
+        "name": name or row["creator_name"] or row["collaborator_name"],
+        "avatar": avatar_thumbnail(row["profile_pic"], request),
+        "role": row["role"],
+        "online": row["last_active"] is not None and now - row["last_active"] <= ONLINE_WINDOW,
+    }
@@ -6,6 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    if sys.argv[1:2] == ['test']:
+        # SQLite test databases; the real settings need a MySQL server.
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'creator_backend.settings_test')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'creator_backend.settings')
     try:
         from django.core.management import execute_from_command_line